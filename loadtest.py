@@ -0,0 +1,168 @@
+"""
+End-to-end load harness: fake bookmaker APIs -> scrapers -> broker -> matcher ingest -> matching, every service in a
+process of its own, the way they run in production. Scrapers are pointed at the fake APIs (scrapers/benchmarks/
+fake_bookmakers.py) through settings and scrape all bookmakers every --scrape-interval seconds. Messages go through a
+local RabbitMQ (--broker rabbitmq, RABBIT_* settings of both services) or through an in-memory stand-in of the broker
+(--broker memory, default) relaying published messages to the matcher through a multiprocessing queue. The matcher
+stores into a throwaway SQLite database and matches every --match-interval seconds.
+
+After --duration seconds scraping stops, the matcher drains what is still on its way and a single JSON report is
+printed: fixtures scraped and ingested per second, scrape-to-match latency percentiles, matching round durations and
+requests served by the fake APIs.
+
+    python loadtest.py --fixtures 2000 --duration 120 --scrape-interval 10
+
+Settings of the services (e.g. RABBIT_WIRE_FORMAT, MATCHING_BATCH_STRATEGY) are taken from the environment.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+
+ROOT_DIR = Path(__file__).resolve().parent
+SERVICE_DIRS = {"scrapers": ROOT_DIR / "scrapers", "matcher": ROOT_DIR / "matcher"}
+
+
+def _run_in_service(service: str, module: str, function: str, env: dict[str, str], *args: Any) -> None:
+    """Entry of a child process, imports the function from the service's own src package with its settings."""
+    service_dir = SERVICE_DIRS[service]
+    os.environ.update(env)
+    os.chdir(service_dir)
+    sys.path.insert(0, str(service_dir))
+    getattr(importlib.import_module(module), function)(*args)
+
+
+def _scrapers_env(port: int, scrape_interval: float) -> dict[str, str]:
+    return {
+        "BETCLIC_API_URL": f"http://127.0.0.1:{port}/betclic",
+        "LV_BET_API_URL": f"http://127.0.0.1:{port}/lvbet",
+        # fixed interval of every job, the load stays the same through the run
+        "SCHEDULER_BASE_INTERVAL_SECONDS": str(scrape_interval),
+        "SCHEDULER_MIN_INTERVAL_SECONDS": str(scrape_interval),
+        "SCHEDULER_MAX_INTERVAL_SECONDS": str(scrape_interval),
+        "SCHEDULER_BASE_INTERVALS": "{}",
+        "SCHEDULER_ALIGNMENT_SECONDS": "1",
+    }
+
+
+def _fake_api_requests(port: int) -> dict[str, int]:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as response:
+        return json.load(response)
+
+
+def _receive(receiver, processes: list) -> Any:
+    """Waits for a result of a child process, fails instead of hanging when any of them died."""
+    while not receiver.poll(0.5):
+        for process in processes:
+            if process.exitcode:
+                raise RuntimeError(f"{process.name} exited with code {process.exitcode}")
+    return receiver.recv()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--broker", choices=["memory", "rabbitmq"], default="memory")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--scrape-interval", type=float, default=10.0)
+    parser.add_argument("--match-interval", type=float, default=1.0)
+    parser.add_argument("--fixtures", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--latency-per-fixture", type=float, default=0.00002)
+    parser.add_argument("--odds-change-seconds", type=float, default=60.0)
+    parser.add_argument("--betclic-payload", type=Path)
+    parser.add_argument("--lvbet-payload", type=Path)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    transport = context.Queue() if args.broker == "memory" else None
+    processes = []
+
+    def start(service: str, module: str, env: dict[str, str], *run_args: Any) -> None:
+        process = context.Process(target=_run_in_service, args=(service, module, "run", env, *run_args), daemon=True)
+        process.start()
+        processes.append(process)
+
+    with tempfile.TemporaryDirectory() as database_dir:
+        try:
+            port_receiver, port_sender = context.Pipe(duplex=False)
+            start(
+                "scrapers",
+                "benchmarks.fake_bookmakers",
+                {},
+                {
+                    "fixtures": args.fixtures,
+                    "days": args.days,
+                    "base_latency_seconds": args.base_latency,
+                    "latency_per_fixture_seconds": args.latency_per_fixture,
+                    "odds_change_seconds": args.odds_change_seconds,
+                    # services run in their own directories
+                    "betclic_payload": args.betclic_payload and args.betclic_payload.resolve(),
+                    "lvbet_payload": args.lvbet_payload and args.lvbet_payload.resolve(),
+                },
+                port_sender,
+            )
+            port = _receive(port_receiver, processes)
+
+            matcher_results, matcher_sender = context.Pipe(duplex=False)
+            scrapers_done = context.Event()
+            ready_receiver, ready_sender = context.Pipe(duplex=False)
+            start(
+                "matcher",
+                "benchmarks.load",
+                {"DATABASE_PATH": str(Path(database_dir) / "loadtest.db")},
+                transport,
+                scrapers_done,
+                ready_sender,
+                matcher_sender,
+                args.match_interval,
+            )
+            _receive(ready_receiver, processes)
+
+            scrapers_results, scrapers_sender = context.Pipe(duplex=False)
+            stop_scrapers = context.Event()
+            start(
+                "scrapers",
+                "benchmarks.load",
+                _scrapers_env(port, args.scrape_interval),
+                transport,
+                stop_scrapers,
+                scrapers_sender,
+            )
+
+            time.sleep(args.duration)
+            stop_scrapers.set()
+            scrapers = _receive(scrapers_results, processes)
+            scrapers_done.set()
+            matcher = _receive(matcher_results, processes)
+
+            print(
+                json.dumps(
+                    {
+                        "broker": args.broker,
+                        "fixtures": args.fixtures,
+                        "duration_seconds": args.duration,
+                        "scrape_interval_seconds": args.scrape_interval,
+                        "fake_api_requests": _fake_api_requests(port),
+                        "scrapers": scrapers,
+                        "matcher": matcher,
+                    },
+                    default=str,
+                    indent=2,
+                )
+            )
+        finally:
+            for process in processes:
+                process.terminate()
+
+
+if __name__ == "__main__":
+    main()
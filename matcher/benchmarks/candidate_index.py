@@ -0,0 +1,92 @@
+"""
+Scaling of trigram candidate index vs brute force Levenshtein comparison for single pair of bookmaker batches.
+
+    python -m benchmarks.candidate_index
+"""
+import json
+import time
+
+from benchmarks.synthetic import SyntheticMarket, generate_market
+from src.services.matching.data import Batch
+from src.services.matching.strategy.batch.base import \
+    PairwiseEventMatchingStrategy
+from src.services.matching.strategy.batch.candidates import \
+    CandidateIndexMatchingStrategy
+from src.services.matching.strategy.entity.base import \
+    BaseEntityMatchingStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+
+SIZES = [250, 500, 1000, 2000, 4000, 8000]
+BRUTE_FORCE_MAX_SIZE = 2000
+
+
+class ExhaustiveMatchingStrategy(PairwiseEventMatchingStrategy):
+    """Reference: every pivot event compared with every not yet used event of the other batch."""
+
+    def __init__(self, entity_comparison_strategy: BaseEntityMatchingStrategy) -> None:
+        self._entity_comparison_strategy = entity_comparison_strategy
+
+    def match_batches(self, pivot: Batch, other: Batch) -> dict[int, int]:
+        used: set[int] = set()
+        matched_indexes = {}
+        for pivot_index, match in enumerate(pivot.matches):
+            for other_index, other_match in enumerate(other.matches):
+                if other_index in used:
+                    continue
+                if self._entity_comparison_strategy.match_entities(match, other_match):
+                    used.add(other_index)
+                    matched_indexes[pivot_index] = other_index
+                    break
+        return matched_indexes
+
+
+def _run(
+    strategy: PairwiseEventMatchingStrategy, market: SyntheticMarket
+) -> tuple[float, set[tuple[int, int]]]:
+    pivot, other = list(market.batches.values())[:2]
+    start = time.perf_counter()
+    matched_indexes = strategy.match_batches(pivot, other)
+    elapsed = time.perf_counter() - start
+
+    correct = {
+        (pivot_index, other_index)
+        for pivot_index, other_index in matched_indexes.items()
+        if market.fixture_id(pivot.matches[pivot_index])
+        == market.fixture_id(other.matches[other_index])
+    }
+    return elapsed, correct
+
+
+def main() -> None:
+    entity_strategy = LevenshteinDistanceEntityComparisonStrategy()
+    for size in SIZES:
+        market = generate_market(size, bookmakers=["PIVOT", "OTHER"])
+        pivot, other = market.batches.values()
+        expected = len(
+            {market.fixture_id(match) for match in pivot.matches}
+            & {market.fixture_id(match) for match in other.matches}
+        )
+
+        index_time, index_correct = _run(
+            CandidateIndexMatchingStrategy(entity_strategy), market
+        )
+        result = {
+            "size": size,
+            "candidate_index_seconds": round(index_time, 4),
+            "candidate_index_recall": round(len(index_correct) / expected, 4),
+        }
+
+        if size <= BRUTE_FORCE_MAX_SIZE:
+            brute_time, brute_correct = _run(
+                ExhaustiveMatchingStrategy(entity_strategy), market
+            )
+            result["brute_force_seconds"] = round(brute_time, 4)
+            result["brute_force_recall"] = round(len(brute_correct) / expected, 4)
+            result["missed_brute_force_pairs"] = len(brute_correct - index_correct)
+
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Memory of list and columnar batches and kickoff time/odds filter on both representations.
+List batches are materialized from the columnar ones and share their interned names, so the memory ratio is a lower
+bound of what is saved on batches decoded from messages (every decoded match has its own strings). Matching rounds
+of the Levenshtein strategies are timed on both representations too, the snapshot hands columnar batches to them.
+
+    python -m benchmarks.columnar
+"""
+import json
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.synthetic import generate_market
+from src.services.matching.data import (Batch, ColumnarBatch, NameTable,
+                                        to_epoch_seconds)
+from src.services.matching.strategy.batch.blocking import \
+    BlockingMatchingStrategy
+from src.services.matching.strategy.batch.bruteforce import \
+    BruteForceMatchingStrategy
+from src.services.matching.strategy.batch.candidates import \
+    CandidateIndexMatchingStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+
+SIZES = [2000, 8000]
+FILTER_WINDOW = timedelta(days=3)
+MATCHING_SIZE = 1000
+MATCHING_STRATEGIES = {
+    # default strategy of the matcher
+    "blocking": BlockingMatchingStrategy,
+    "brute_force": BruteForceMatchingStrategy,
+    "candidate_index": CandidateIndexMatchingStrategy,
+}
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def filter_list(batch: Batch, start: int, end: int) -> Batch:
+    matches = [
+        match
+        for match in batch.matches
+        if start <= to_epoch_seconds(match.event_time) < end
+        and all(odds > 1.0 for odds in match.bet_options.values())
+    ]
+    return Batch(count=len(matches), matches=matches)
+
+
+def filter_columnar(batch: ColumnarBatch, start: int, end: int) -> ColumnarBatch:
+    return batch.filter(
+        (batch.event_times >= start)
+        & (batch.event_times < end)
+        & (batch.odds > 1.0).all(axis=1)
+    )
+
+
+def cluster_contents(clusters):
+    return [
+        [(match.source, match.team_a, match.team_b) for match in cluster]
+        for cluster in clusters
+    ]
+
+
+def compare_matching() -> None:
+    market = generate_market(MATCHING_SIZE)
+    columnar = {
+        bookmaker: ColumnarBatch.from_matches(batch.matches)
+        for bookmaker, batch in market.batches.items()
+    }
+    for name, strategy_class in MATCHING_STRATEGIES.items():
+        strategy = strategy_class(LevenshteinDistanceEntityComparisonStrategy())
+        clusters, list_seconds = timed(strategy.match_events, market.batches)
+        columnar_clusters, columnar_seconds = timed(strategy.match_events, columnar)
+        assert cluster_contents(clusters) == cluster_contents(columnar_clusters)
+
+        print(
+            json.dumps(
+                {
+                    "strategy": name,
+                    "matches_per_bookmaker": MATCHING_SIZE,
+                    "clusters": len(clusters),
+                    "list_matching_seconds": round(list_seconds, 4),
+                    "columnar_matching_seconds": round(columnar_seconds, 4),
+                }
+            )
+        )
+
+
+def main() -> None:
+    for size in SIZES:
+        market = generate_market(size)
+        columnar, columnar_bytes = measure(
+            lambda: {
+                bookmaker: ColumnarBatch.from_matches(batch.matches, NameTable())
+                for bookmaker, batch in market.batches.items()
+            }
+        )
+        batches, list_bytes = measure(
+            lambda: {
+                bookmaker: Batch(count=batch.count, matches=list(batch.matches))
+                for bookmaker, batch in columnar.items()
+            }
+        )
+
+        pivot = next(iter(batches.values()))
+        start = int(pivot.event_times.min())
+        end = start + int(FILTER_WINDOW.total_seconds())
+        filtered, list_filter_seconds = timed(
+            lambda: [filter_list(batch, start, end) for batch in batches.values()]
+        )
+        filtered_columnar, columnar_filter_seconds = timed(
+            lambda: [filter_columnar(batch, start, end) for batch in columnar.values()]
+        )
+        assert [batch.count for batch in filtered] == [
+            batch.count for batch in filtered_columnar
+        ]
+
+        print(
+            json.dumps(
+                {
+                    "matches_per_bookmaker": size,
+                    "list_bytes": list_bytes,
+                    "columnar_bytes": columnar_bytes,
+                    "memory_ratio": round(list_bytes / columnar_bytes, 1),
+                    "list_filter_seconds": round(list_filter_seconds, 4),
+                    "columnar_filter_seconds": round(columnar_filter_seconds, 4),
+                }
+            )
+        )
+
+    compare_matching()
+
+
+if __name__ == "__main__":
+    main()
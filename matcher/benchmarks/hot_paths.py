@@ -0,0 +1,213 @@
+"""
+Offline benchmarks of the hot paths of a matching round, on synthetic bookmaker batches with perturbed team names and
+jittered kickoff times:
+
+- brute force matching with exact and Levenshtein entity comparison, with pairwise precision and recall against the
+  fixtures the synthetic matches were generated from (only fixtures listed by enough bookmakers to form a cluster
+  are expected),
+- club name standardization with a cold and a warm cache of unknown names,
+- decoding of match messages (FootballMatch.from_bytes),
+- encoding of match messages by the scrapers JSON encoder, loaded from the scrapers service source tree.
+
+Every case is printed as a JSON line with its parameters, throughput (best of REPEATS runs) and peak traced memory
+(measured in a separate run), so results of two runs can be compared line by line.
+
+    python -m benchmarks.hot_paths
+"""
+import importlib.util
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable
+from uuid import UUID
+
+from benchmarks.synthetic import SyntheticMarket, generate_market
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.strategy.batch.bruteforce import \
+    BruteForceMatchingStrategy
+from src.services.matching.strategy.entity.exact import \
+    ExactEntityComparisonStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+from src.services.name_standardization import \
+    FootballClubNameStandardizationService
+
+SCRAPERS_UTILS_PATH = (
+    Path(__file__).resolve().parents[2] / "scrapers" / "src" / "utils" / "utils.py"
+)
+
+MATCHING_SIZES = [250, 1000]
+SERIALIZATION_SIZE = 10000
+PERTURBATION = 0.3
+KICKOFF_JITTER_MINUTES = 15
+REPEATS = 5
+
+
+def load_scrapers_encoder() -> type[json.JSONEncoder]:
+    # both services have their own top level src package, the encoder module only depends on the standard library
+    # and pydantic, so it is loaded from its file under a name of its own
+    spec = importlib.util.spec_from_file_location("scrapers_utils", SCRAPERS_UTILS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.FootballMatchDTOJSONEncoder
+
+
+def measure(run: Callable[[], Any], items: int) -> dict:
+    # warm up
+    run()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "items": items,
+        "seconds": round(best, 5),
+        "items_per_second": round(items / best),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def report(benchmark: str, **result: Any) -> None:
+    print(json.dumps({"benchmark": benchmark, **result}))
+
+
+def matching_scores(
+    clusters: list[list[FootballMatch]], market: SyntheticMarket
+) -> dict:
+    predicted = correct = 0
+    for cluster in clusters:
+        for first, second in combinations(cluster, 2):
+            predicted += 1
+            correct += market.fixture_id(first) == market.fixture_id(second)
+
+    listings: dict[int, int] = {}
+    for batch in market.batches.values():
+        for match in batch.matches:
+            fixture_id = market.fixture_id(match)
+            listings[fixture_id] = listings.get(fixture_id, 0) + 1
+    expected = sum(
+        count * (count - 1) // 2
+        for count in listings.values()
+        if count >= BruteForceMatchingStrategy.MINIMUM_CLUSTER_LENGTH
+    )
+    return {
+        "clusters": len(clusters),
+        "precision": round(correct / predicted, 4) if predicted else None,
+        "recall": round(correct / expected, 4) if expected else None,
+    }
+
+
+def bench_matching() -> None:
+    entity_strategies = {
+        "exact": ExactEntityComparisonStrategy(),
+        "levenshtein": LevenshteinDistanceEntityComparisonStrategy(),
+    }
+    for size in MATCHING_SIZES:
+        market = generate_market(
+            size,
+            perturbation=PERTURBATION,
+            kickoff_jitter_minutes=KICKOFF_JITTER_MINUTES,
+        )
+        matches = sum(batch.count for batch in market.batches.values())
+        for name, entity_strategy in entity_strategies.items():
+            strategy = BruteForceMatchingStrategy(entity_strategy)
+            result = measure(lambda: strategy.match_events(market.batches), matches)
+            clusters = strategy.match_events(market.batches)
+            report(
+                "brute_force_matching",
+                entity_strategy=name,
+                matches_per_bookmaker=size,
+                **result,
+                **matching_scores(clusters, market),
+            )
+
+
+def bench_standardization(matches: list[FootballMatch]) -> None:
+    service = FootballClubNameStandardizationService()
+    unstandardized = [
+        replace(match, team_a_standardized="", team_b_standardized="")
+        for match in matches
+    ]
+
+    def standardize(clear_cache: bool) -> None:
+        if clear_cache:
+            service._standardize_unknown_name.cache_clear()
+        for match in unstandardized:
+            match.team_a_standardized = match.team_b_standardized = ""
+            service.standardize_club_names(match)
+
+    for cache, clear_cache in (("cold", True), ("warm", False)):
+        report(
+            "name_standardization",
+            cache=cache,
+            unique_names=len(
+                {match.team_a for match in matches}
+                | {match.team_b for match in matches}
+            ),
+            **measure(lambda: standardize(clear_cache), len(matches)),
+        )
+
+
+def scraper_payloads(matches: list[FootballMatch]) -> list[dict]:
+    # the way scrapers hold matches before encoding: UUID scrape ids and datetimes
+    payloads = []
+    for match in matches:
+        payload = asdict(match)
+        for key in (
+            "team_a_standardized",
+            "team_b_standardized",
+            "team_a_id",
+            "team_b_id",
+            "fixture_key",
+        ):
+            del payload[key]
+        payload["scrape_id"] = UUID(payload["scrape_id"])
+        payloads.append(payload)
+    return payloads
+
+
+def bench_serialization(matches: list[FootballMatch]) -> None:
+    encoder = load_scrapers_encoder()
+    payloads = scraper_payloads(matches)
+    bodies = [json.dumps(payload, cls=encoder).encode() for payload in payloads]
+
+    report(
+        "scrapers_json_encoder",
+        bytes_per_match=round(sum(map(len, bodies)) / len(bodies), 1),
+        **measure(
+            lambda: [json.dumps(payload, cls=encoder).encode() for payload in payloads],
+            len(payloads),
+        ),
+    )
+    report(
+        "football_match_from_bytes",
+        **measure(
+            lambda: [FootballMatch.from_bytes(body) for body in bodies], len(bodies)
+        ),
+    )
+
+
+def main() -> None:
+    bench_matching()
+
+    market = generate_market(
+        SERIALIZATION_SIZE,
+        perturbation=PERTURBATION,
+        kickoff_jitter_minutes=KICKOFF_JITTER_MINUTES,
+    )
+    matches = [match for batch in market.batches.values() for match in batch.matches]
+    bench_standardization(matches)
+    bench_serialization(matches)
+
+
+if __name__ == "__main__":
+    main()
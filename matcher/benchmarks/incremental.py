@@ -0,0 +1,93 @@
+"""
+Incremental matching vs full recompute on a sequence of single bookmaker rescrapes. Fails if any run differs.
+
+    python -m benchmarks.incremental
+"""
+import json
+import random
+import time
+from dataclasses import replace
+from uuid import uuid4
+
+from benchmarks.synthetic import generate_market
+from src.services.matching.data import Batch
+from src.services.matching.strategy.batch.blocking import \
+    BlockingMatchingStrategy
+from src.services.matching.strategy.batch.incremental import \
+    IncrementalMatchingStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+
+MATCHES_PER_BOOKMAKER = 2000
+RESCRAPES = 20
+
+
+def rescrape(rng: random.Random, batch: Batch, grow: bool) -> Batch:
+    """New scrape id, some odds changed, some fixtures gone and, optionally, the batch grown with duplicated ones."""
+    scrape_id = str(uuid4())
+    matches = [
+        replace(
+            match,
+            scrape_id=scrape_id,
+            bet_options={
+                outcome: round(odds * rng.uniform(0.95, 1.05), 2)
+                for outcome, odds in match.bet_options.items()
+            },
+        )
+        for match in batch.matches
+        if rng.random() > 0.05
+    ]
+    if grow:
+        matches.extend(
+            replace(match, scrape_id=scrape_id)
+            for match in rng.sample(matches, len(matches) // 2)
+        )
+    return Batch(count=len(matches), matches=matches)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    batches = generate_market(MATCHES_PER_BOOKMAKER).batches
+
+    strategy = BlockingMatchingStrategy(LevenshteinDistanceEntityComparisonStrategy())
+    incremental = IncrementalMatchingStrategy(strategy)
+    incremental.match_events(batches)
+
+    for run in range(RESCRAPES):
+        bookmaker = rng.choice(list(batches))
+        batches = {
+            **batches,
+            bookmaker: rescrape(rng, batches[bookmaker], grow=run % 7 == 6),
+        }
+
+        start = time.perf_counter()
+        incremental_clusters = incremental.match_events(batches)
+        incremental_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full_clusters = strategy.match_events(batches)
+        full_seconds = time.perf_counter() - start
+
+        identical = [list(map(id, cluster)) for cluster in incremental_clusters] == [
+            list(map(id, cluster)) for cluster in full_clusters
+        ]
+        print(
+            json.dumps(
+                {
+                    "run": run,
+                    "rescraped": bookmaker,
+                    "clusters": len(full_clusters),
+                    "incremental_seconds": round(incremental_seconds, 4),
+                    "full_seconds": round(full_seconds, 4),
+                    "identical": identical,
+                }
+            )
+        )
+        if not identical:
+            raise SystemExit(
+                f"Incremental result differs from full recompute in run {run}."
+            )
+
+
+if __name__ == "__main__":
+    main()
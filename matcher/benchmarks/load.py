@@ -0,0 +1,275 @@
+"""
+Matcher side of the end-to-end load harness (loadtest.py in the repository root starts it in its own process). Ingests
+scraped matches the way the service does it, consuming either from RabbitMQ or from an in-memory stand-in of the
+broker fed by the scrapers process through a multiprocessing queue, and runs matching every match_interval seconds.
+
+Reported are sustained ingest throughput (fixtures stored per second between the first and the last stored batch)
+and scrape-to-match latency: time from parsing of a match by the scraper (its scrape_end_timestamp) until it is part
+of a cluster in a matching round for the first time.
+"""
+import asyncio
+import queue
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+from main import start_ingest
+from src.rabbit import RabbitMQClient
+from src.schemas.consumer_match import FootballMatch, ScrapeManifest
+from src.settings.settings import settings
+from starlette.datastructures import State
+
+# (body, headers, content_type, content_encoding) as handed over by the scrapers stand-in exchange
+Fields = tuple[bytes, dict, str | None, str | None]
+
+
+class StandInIncomingMessage:
+    def __init__(
+        self, stand_in_queue: "StandInQueue", delivery_tag: int, fields: Fields
+    ) -> None:
+        self._queue = stand_in_queue
+        self.delivery_tag = delivery_tag
+        self.body, self.headers, self.content_type, self.content_encoding = fields
+
+    async def ack(self, multiple: bool = False) -> None:
+        await self._queue.settle(self.delivery_tag, multiple, requeue=False)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        await self._queue.settle(self.delivery_tag, multiple, requeue)
+
+    async def reject(self, requeue: bool = False) -> None:
+        await self._queue.settle(self.delivery_tag, False, requeue)
+
+
+class StandInQueue:
+    """
+    Delivers messages of the transport queue one by one, at most prefetch_count of them unacknowledged at once.
+    Requeued messages are delivered again before new ones.
+    """
+
+    def __init__(self, name: str, transport: Queue) -> None:
+        self.name = name
+        self.prefetch_count = 0
+        self._transport = transport
+        self._unacked: dict[int, Fields] = {}
+        self._requeued: deque[Fields] = deque()
+        self._capacity = asyncio.Condition()
+        self._delivery_tag = 0
+        self._task: asyncio.Task | None = None
+
+    async def consume(
+        self, callback: Callable[[Any], Awaitable[None]], no_ack: bool = False
+    ) -> str:
+        self._task = asyncio.create_task(self._deliver(callback))
+        return self.name
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def settle(self, delivery_tag: int, multiple: bool, requeue: bool) -> None:
+        tags = (
+            [tag for tag in self._unacked if tag <= delivery_tag]
+            if multiple
+            else [delivery_tag]
+        )
+        async with self._capacity:
+            for tag in tags:
+                fields = self._unacked.pop(tag)
+                if requeue:
+                    self._requeued.append(fields)
+            self._capacity.notify_all()
+
+    async def _deliver(self, callback: Callable[[Any], Awaitable[None]]) -> None:
+        while True:
+            async with self._capacity:
+                await self._capacity.wait_for(
+                    lambda: not self.prefetch_count
+                    or len(self._unacked) < self.prefetch_count
+                )
+
+            if self._requeued:
+                fields = self._requeued.popleft()
+            else:
+                try:
+                    fields = await asyncio.to_thread(self._transport.get, True, 0.2)
+                except queue.Empty:
+                    continue
+
+            self._delivery_tag += 1
+            self._unacked[self._delivery_tag] = fields
+            await callback(StandInIncomingMessage(self, self._delivery_tag, fields))
+
+
+class StandInChannel:
+    def __init__(self, transport: Queue) -> None:
+        self._transport = transport
+        self.is_closed = False
+        self.queues: list[StandInQueue] = []
+
+    async def set_qos(self, prefetch_count: int) -> None:
+        for stand_in_queue in self.queues:
+            stand_in_queue.prefetch_count = prefetch_count
+
+    async def declare_queue(self, name: str) -> StandInQueue:
+        stand_in_queue = StandInQueue(name, self._transport)
+        self.queues.append(stand_in_queue)
+        return stand_in_queue
+
+    async def close(self) -> None:
+        for stand_in_queue in self.queues:
+            stand_in_queue.cancel()
+        self.is_closed = True
+
+
+class StandInConnection:
+    is_closed = False
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+class MeasuredRabbitMQClient(RabbitMQClient):
+    """Remembers when and how many matches were stored."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stored: list[tuple[float, int]] = []
+
+    async def _store_matches(
+        self, matches: list[FootballMatch], manifests: list[ScrapeManifest]
+    ) -> None:
+        await RabbitMQClient._store_matches(matches, manifests)
+        self.stored.append((time.monotonic(), len(matches)))
+
+
+class LatencyRecorder:
+    def __init__(self) -> None:
+        self._matched: set[tuple] = set()
+        self.latencies: list[float] = []
+        self.round_seconds: list[float] = []
+        self.clusters = 0
+
+    async def match(self, state: State) -> None:
+        started = time.monotonic()
+        clusters = await state.matching_service.get_matches_async()
+        self.round_seconds.append(time.monotonic() - started)
+        self.clusters = len(clusters)
+
+        now = datetime.utcnow()
+        for cluster in clusters:
+            for match in cluster:
+                key = (match.source, match.scrape_id, match.team_a, match.team_b)
+                if key in self._matched:
+                    continue
+                self._matched.add(key)
+                self.latencies.append(
+                    (now - match.scrape_end_timestamp).total_seconds()
+                )
+
+
+def _percentiles(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(max(values), 3),
+    }
+
+
+async def connect(transport: Queue | None) -> MeasuredRabbitMQClient:
+    if transport is None:
+        mq = await MeasuredRabbitMQClient.connect(
+            settings.RABBIT_HOST,
+            settings.RABBIT_PORT,
+            settings.RABBIT_LOGIN,
+            settings.RABBIT_PASSWORD,
+        )
+        # leftovers of previous runs would distort measurements
+        stale_queue = await mq.channel.declare_queue(
+            settings.RABBIT_CONSUMING_QUEUE_NAME
+        )
+        await stale_queue.purge()
+        return mq
+
+    return MeasuredRabbitMQClient(StandInConnection(), StandInChannel(transport))
+
+
+async def run_matcher(
+    transport: Queue | None,
+    scrapers_done: Event,
+    ready_sender,
+    match_interval: float,
+    drain_idle_seconds: float,
+    drain_timeout: float,
+) -> dict:
+    state = State()
+    state.mq = await connect(transport)
+    await start_ingest(state)
+    ready_sender.send(True)
+
+    recorder = LatencyRecorder()
+    started = time.monotonic()
+    try:
+        while not scrapers_done.is_set():
+            await asyncio.sleep(match_interval)
+            await recorder.match(state)
+
+        # whatever is still on its way is ingested and promoted, then matched once more
+        drain_started = time.monotonic()
+        while time.monotonic() - drain_started < drain_timeout:
+            await asyncio.sleep(match_interval)
+            last_stored = state.mq.stored[-1][0] if state.mq.stored else started
+            if time.monotonic() - last_stored >= drain_idle_seconds:
+                break
+        state.snapshot.promote_idle(0)
+        await recorder.match(state)
+    finally:
+        await state.mq.disconnect()
+
+    stored = state.mq.stored
+    ingested = sum(count for _, count in stored)
+    ingest_seconds = stored[-1][0] - stored[0][0] if len(stored) > 1 else 0.0
+    return {
+        "ingested_fixtures": ingested,
+        "ingest_batches": len(stored),
+        "ingest_seconds": round(ingest_seconds, 3),
+        "ingest_fixtures_per_second": round(ingested / ingest_seconds, 1)
+        if ingest_seconds
+        else None,
+        "clusters": recorder.clusters,
+        "matched_fixtures": len(recorder.latencies),
+        "scrape_to_match_seconds": _percentiles(recorder.latencies),
+        "matching_rounds": len(recorder.round_seconds),
+        "matching_round_seconds": _percentiles(recorder.round_seconds),
+    }
+
+
+def run(
+    transport: Queue | None,
+    scrapers_done: Event,
+    ready_sender,
+    result_sender,
+    match_interval: float = 1.0,
+    drain_idle_seconds: float = 3.0,
+    drain_timeout: float = 60.0,
+) -> None:
+    result_sender.send(
+        asyncio.run(
+            run_matcher(
+                transport,
+                scrapers_done,
+                ready_sender,
+                match_interval,
+                drain_idle_seconds,
+                drain_timeout,
+            )
+        )
+    )
@@ -0,0 +1,241 @@
+import random
+import string
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.data import Batch
+
+CITIES = [
+    "Manchester",
+    "Liverpool",
+    "Madrid",
+    "Barcelona",
+    "Sevilla",
+    "Milan",
+    "Torino",
+    "Napoli",
+    "Roma",
+    "Lazio",
+    "Porto",
+    "Lisbon",
+    "Braga",
+    "Munich",
+    "Dortmund",
+    "Leipzig",
+    "Bremen",
+    "Hamburg",
+    "Berlin",
+    "Stuttgart",
+    "Warsaw",
+    "Krakow",
+    "Poznan",
+    "Gdansk",
+    "Wroclaw",
+    "Lodz",
+    "Lyon",
+    "Marseille",
+    "Nantes",
+    "Lille",
+    "Bordeaux",
+    "Rennes",
+    "Glasgow",
+    "Edinburgh",
+    "Aberdeen",
+    "Dundee",
+    "Amsterdam",
+    "Rotterdam",
+    "Eindhoven",
+    "Utrecht",
+    "Brugge",
+    "Gent",
+    "Antwerp",
+    "Prague",
+    "Plzen",
+    "Vienna",
+    "Salzburg",
+    "Graz",
+    "Zurich",
+    "Basel",
+    "Bern",
+    "Geneva",
+    "Athens",
+    "Piraeus",
+    "Istanbul",
+    "Ankara",
+    "Kyiv",
+    "Kharkiv",
+    "Zagreb",
+    "Split",
+]
+PREFIXES = [
+    "",
+    "Real",
+    "Sporting",
+    "Dynamo",
+    "Atletico",
+    "Racing",
+    "Olympique",
+    "Inter",
+    "Union",
+    "Royal",
+]
+SUFFIXES = [
+    "",
+    "United",
+    "City",
+    "Rovers",
+    "Athletic",
+    "Wanderers",
+    "Albion",
+    "Town",
+    "County",
+    "Rangers",
+]
+BOOKMAKERS = ["BETCLIC", "LVBET", "FORTUNA"]
+ABBREVIATIONS = {
+    "Manchester": "Man",
+    "Atletico": "Atl.",
+    "Sporting": "Sp.",
+    "Dynamo": "Din.",
+    "Olympique": "Ol.",
+    "Real": "R.",
+    "Inter": "Int.",
+    "United": "Utd",
+    "City": "C.",
+    "Rovers": "Rov.",
+    "Athletic": "Ath.",
+    "Wanderers": "Wand.",
+}
+
+
+@dataclass
+class SyntheticMarket:
+    batches: dict[str, Batch]
+    fixture_ids: dict[int, int]  # id(FootballMatch) -> fixture number
+
+    def fixture_id(self, match: FootballMatch) -> int:
+        return self.fixture_ids[id(match)]
+
+
+def _fixture_teams(rng: random.Random, count: int) -> list[tuple[str, str]]:
+    names = sorted(
+        {
+            " ".join(part for part in (prefix, city, suffix) if part)
+            for city in CITIES
+            for prefix in PREFIXES
+            for suffix in SUFFIXES
+        }
+    )
+
+    pairs: set[tuple[str, str]] = set()
+    while len(pairs) < count:
+        team_a, team_b = rng.sample(names, 2)
+        pairs.add((team_a, team_b))
+    return sorted(pairs)
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    position = rng.randrange(len(name) - 1)
+    match rng.randrange(3):
+        case 0:
+            return name[:position] + name[position + 1 :]
+        case 1:
+            return (
+                name[:position]
+                + name[position + 1]
+                + name[position]
+                + name[position + 2 :]
+            )
+        case _:
+            return (
+                name[:position]
+                + rng.choice(string.ascii_lowercase)
+                + name[position + 1 :]
+            )
+
+
+def _abbreviate(rng: random.Random, name: str) -> str | None:
+    words = name.split()
+    positions = [
+        position for position, word in enumerate(words) if word in ABBREVIATIONS
+    ]
+    if not positions:
+        return None
+
+    position = rng.choice(positions)
+    words[position] = ABBREVIATIONS[words[position]]
+    return " ".join(words)
+
+
+def _perturb(rng: random.Random, name: str, probability: float) -> str:
+    if rng.random() >= probability:
+        return name
+
+    match rng.randrange(4):
+        case 0:
+            return f"{name} F.C." if rng.random() < 0.5 else f"FC {name}"
+        case 1:
+            return _abbreviate(rng, name) or _typo(rng, name)
+        case 2:
+            return _typo(rng, name)
+        case _:
+            return name.upper()
+
+
+def generate_market(
+    matches_per_bookmaker: int,
+    bookmakers: list[str] = BOOKMAKERS,
+    overlap: float = 0.8,
+    perturbation: float = 0.3,
+    seed: int = 0,
+    kickoff_jitter_minutes: int = 0,
+) -> SyntheticMarket:
+    """
+    Every bookmaker lists "overlap" share of the same fixtures pool, team names are perturbed with given probability
+    (F.C. suffix or FC prefix, abbreviated word, typo, casing) to emulate differences between bookmaker sites. Kickoff
+    listed by a bookmaker may differ from the fixture's one by up to kickoff_jitter_minutes either way.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 12)
+    fixtures = [
+        (team_a, team_b, start + timedelta(minutes=15 * rng.randrange(4 * 24 * 10)))
+        for team_a, team_b in _fixture_teams(rng, matches_per_bookmaker)
+    ]
+
+    batches: dict[str, Batch] = {}
+    fixture_ids: dict[int, int] = {}
+    for position, bookmaker in enumerate(bookmakers):
+        listed = int(matches_per_bookmaker * (1 if position == 0 else overlap))
+        scrape_id = str(uuid4())
+        matches = []
+        for number in sorted(rng.sample(range(matches_per_bookmaker), listed)):
+            team_a, team_b, event_time = fixtures[number]
+            team_a = _perturb(rng, team_a, perturbation)
+            team_b = _perturb(rng, team_b, perturbation)
+            if kickoff_jitter_minutes:
+                event_time += timedelta(
+                    minutes=rng.randint(-kickoff_jitter_minutes, kickoff_jitter_minutes)
+                )
+            match = FootballMatch(
+                event_time=event_time,
+                team_a=team_a,
+                team_b=team_b,
+                bet_options={
+                    "TEAM_A_WINS": round(rng.uniform(1.1, 6), 2),
+                    "DRAW": round(rng.uniform(2.5, 5), 2),
+                    "TEAM_B_WINS": round(rng.uniform(1.1, 6), 2),
+                },
+                scrape_id=scrape_id,
+                source=bookmaker,
+                scrape_start_timestamp=start,
+                scrape_end_timestamp=start,
+                team_a_standardized=team_a.strip().title(),
+                team_b_standardized=team_b.strip().title(),
+            )
+            fixture_ids[id(match)] = number
+            matches.append(match)
+        batches[bookmaker] = Batch(count=len(matches), matches=matches)
+
+    return SyntheticMarket(batches=batches, fixture_ids=fixture_ids)
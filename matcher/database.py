@@ -2,16 +2,34 @@ from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, String, create_engine
+from sqlalchemy import (Column, DateTime, String, create_engine, event,
+                        inspect, text)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import as_declarative, sessionmaker
+from src.settings.settings import settings
 
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "sqlite.db"
+DB_PATH = BASE_DIR / settings.DATABASE_PATH
 
 
 engine = create_engine(f"sqlite:///{DB_PATH}")
 SessionFactory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}")
+AsyncSessionFactory = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets matching reads run while consumer writes a batch
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 
 @as_declarative()
 class Base:
@@ -25,3 +43,24 @@ def init_db(rebuild=False) -> None:
         Base.metadata.drop_all(engine)
 
     Base.metadata.create_all(engine)
+
+    # create_all does not add new (nullable) columns to existing tables either
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(engine.dialect)
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                        )
+                    )
+
+    # create_all skips existing tables together with their indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
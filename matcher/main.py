@@ -3,20 +3,26 @@ import asyncio
 import uvicorn
 from aio_pika import ExchangeType
 from database import init_db
-from fastapi import Depends, FastAPI
-from sqlalchemy.orm import Session
-from src.data_access.base import SyncSQLAlchemyDataAccess
-from src.deps import get_database
+from fastapi import FastAPI, Request
+from src.deps import assign_team_ids, load_newest_batches, load_team_registry
 from src.models.football_match import FootballMatchModel
+from src.models.scrape import ScrapeModel
+from src.models.team import TeamModel
+from src.publisher import ResultsPublisher
 from src.rabbit import RabbitMQClient
+from src.schemas.arbitrage import MatchingResult
 from src.schemas.consumer_match import FootballMatch
+from src.services.arbitrage import ArbitrageService
 from src.services.matching.matching import FootballEventMatchingService
-from src.services.matching.strategy.entity.levenshtein import \
-    LevenshteinDistanceEntityComparisonStrategy
+from src.services.name_standardization import \
+    FootballClubNameStandardizationService
+from src.services.snapshot import LatestBatchSnapshot
 from src.settings.settings import settings
+from starlette.datastructures import State
 
 EXCHANGE_NAME = settings.RABBIT_PUBLISHING_EXCHANGE_NAME
 QUEUE_NAME = settings.RABBIT_PUBLISHING_QUEUE_NAME
+CONSUMING_QUEUE_NAME = settings.RABBIT_CONSUMING_QUEUE_NAME
 
 init_db()
 app = FastAPI()
@@ -24,7 +30,6 @@ app = FastAPI()
 
 @app.on_event("startup")
 async def startup_event() -> None:
-    pass
     app.state.mq = await RabbitMQClient.connect(
         settings.RABBIT_HOST,
         settings.RABBIT_PORT,
@@ -33,48 +38,80 @@ async def startup_event() -> None:
     )
 
     # Sub
-    sub_queue = await app.state.mq.channel.declare_queue(QUEUE_NAME)
-    loop = asyncio.get_running_loop()
-    app.state.sub_queue = sub_queue
-    task = loop.create_task(app.state.mq.consume(sub_queue))
-    await task
+    await start_ingest(app.state)
+
+    if settings.STANDARDIZATION_RELOAD_INTERVAL > 0:
+        loop = asyncio.get_running_loop()
+        app.state.synonyms_watcher = loop.create_task(
+            app.state.standardization_service.watch(
+                settings.STANDARDIZATION_RELOAD_INTERVAL
+            )
+        )
 
     # Pub
-    exchange = await app.state.mq.channel.declare_exchange(
+    exchange = await app.state.mq.publishing_channel.declare_exchange(
         EXCHANGE_NAME, ExchangeType.FANOUT
     )
-    pub_que = await app.state.mq.channel.declare_queue(QUEUE_NAME)
+    pub_que = await app.state.mq.publishing_channel.declare_queue(QUEUE_NAME)
     await pub_que.bind(exchange=exchange)
 
     app.state.exchange = exchange
     app.state.pub_queue = pub_que
+    app.state.publisher = ResultsPublisher(exchange)
+
+
+async def start_ingest(state: State) -> None:
+    """
+    Loads the newest batches into the snapshot used for matching and starts consuming scraped matches with the
+    connected broker client (state.mq).
+    """
+    standardization_service = FootballClubNameStandardizationService()
+    state.standardization_service = standardization_service
+
+    team_registry = await load_team_registry()
+    state.team_registry = team_registry
+    newest_batches = await load_newest_batches()
+    # rows stored before the registry existed have no team ids
+    for matches in newest_batches.values():
+        await assign_team_ids(team_registry, matches)
+
+    snapshot = LatestBatchSnapshot()
+    snapshot.load(newest_batches)
+    state.snapshot = snapshot
+    # app scoped, incremental matching keeps state between requests
+    state.matching_service = FootballEventMatchingService.from_settings(snapshot)
+
+    sub_queue = await state.mq.channel.declare_queue(CONSUMING_QUEUE_NAME)
+    state.sub_queue = sub_queue
+    await state.mq.consume(sub_queue, standardization_service, snapshot, team_registry)
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
+    if watcher := getattr(app.state, "synonyms_watcher", None):
+        watcher.cancel()
+    if publisher := getattr(app.state, "publisher", None):
+        await publisher.wait_for_confirms()
     await app.state.mq.disconnect()
 
 
-@app.get("/")
-async def create_matches_groups(
-    session: Session = Depends(get_database),
-) -> dict[str, str]:
-    # service = FootballEventMatchingService.from_session(session)
-    service = FootballEventMatchingService.from_session(
-        session, entity_matching_strategy=LevenshteinDistanceEntityComparisonStrategy()
+@app.get("/", response_model=MatchingResult)
+async def create_matches_groups(request: Request, limit: int = 100) -> MatchingResult:
+    service: FootballEventMatchingService = request.app.state.matching_service
+    matches_groups = await service.get_matches_async()
+    opportunities = ArbitrageService().find_opportunities(matches_groups, limit)
+
+    # waits only if too many earlier results are not confirmed by the broker yet
+    await request.app.state.publisher.publish_results(matches_groups, opportunities)
+    return MatchingResult(
+        clusters_count=len(matches_groups), opportunities=opportunities
     )
-    matches_groups = service.get_matches()
-    print("________")
-    print(len(matches_groups))
-
-    for matches_cluster in matches_groups:
-        print("******")
-        for bookmaker_data in matches_cluster:
-            print(bookmaker_data)
-            print()
-
-    # send data to queue
-    return {"detail": "OK"}
+
+
+@app.post("/synonyms/reload")
+async def reload_club_names_synonyms(request: Request) -> dict[str, str]:
+    variants_count = request.app.state.standardization_service.reload()
+    return {"detail": f"Loaded {variants_count} club name variants."}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+from typing import Any, Callable
+
+import msgpack
+import orjson
+import zstandard
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ZSTD_CONTENT_ENCODING = "zstd"
+
+# must match the extension type used by scrapers for naive datetimes, aware ones use msgpack Timestamp (-1)
+NAIVE_DATETIME_EXT_TYPE = 1
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == NAIVE_DATETIME_EXT_TYPE:
+        return msgpack.Timestamp.from_bytes(data).to_datetime().replace(tzinfo=None)
+    return msgpack.ExtType(code, data)
+
+
+def _unpack_msgpack(body: bytes) -> Any:
+    return msgpack.unpackb(body, timestamp=3, ext_hook=_msgpack_ext_hook)
+
+
+DECODERS: dict[str, Callable[[bytes], Any]] = {
+    JSON_CONTENT_TYPE: orjson.loads,
+    MSGPACK_CONTENT_TYPE: _unpack_msgpack,
+}
+
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def encode_json(payload: Any) -> bytes:
+    """Encodes payload the way scrapers do, datetimes and enums (dictionary keys as well) natively."""
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_body(
+    body: bytes, content_type: str | None = None, content_encoding: str | None = None
+) -> Any:
+    """
+    Decodes message body according to its AMQP content type and encoding. Messages without content type are plain
+    JSON published by older scrapers. Unsupported formats and corrupted bodies raise ValueError.
+    """
+    decoder = DECODERS.get(content_type or JSON_CONTENT_TYPE)
+    if decoder is None:
+        raise ValueError(f"Unsupported content type: {content_type}")
+
+    if content_encoding == ZSTD_CONTENT_ENCODING:
+        try:
+            body = _decompressor.decompress(body)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Could not decompress body: {e}") from e
+    elif content_encoding:
+        raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+    return decoder(body)
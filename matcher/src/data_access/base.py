@@ -1,32 +1,283 @@
+from dataclasses import asdict, replace
+from typing import Iterable
+
+from sqlalchemy import Insert, Select, and_, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.enums import ScrapeKind
 from src.models.football_match import FootballMatchModel
-from src.schemas.consumer_match import FootballMatch
+from src.models.scrape import ScrapeModel
+from src.models.team import TeamModel
+from src.schemas.consumer_match import FootballMatch, ScrapeManifest
+
+YIELD_PER = 1000
+
+
+def newest_batches_query() -> Select:
+    """All matches from the newest scrape of every bookmaker in a single query."""
+    ranked_scrapes = select(
+        FootballMatchModel.scrape_id,
+        func.row_number()
+        .over(
+            partition_by=FootballMatchModel.source,
+            order_by=FootballMatchModel.insertion_timestamp.desc(),
+        )
+        .label("position"),
+    ).subquery()
+    newest_scrape_ids = select(ranked_scrapes.c.scrape_id).where(
+        ranked_scrapes.c.position == 1
+    )
+
+    return (
+        select(FootballMatchModel)
+        .where(FootballMatchModel.scrape_id.in_(newest_scrape_ids))
+        .execution_options(yield_per=YIELD_PER)
+    )
+
+
+def scrape_chains_query() -> Select:
+    """Manifests of the newest full scrape of every bookmaker and of all scrapes stored after it, oldest first."""
+    newest_full_scrapes = (
+        select(
+            ScrapeModel.source,
+            func.max(ScrapeModel.insertion_timestamp).label("since"),
+        )
+        .where(ScrapeModel.kind == ScrapeKind.FULL.value)
+        .group_by(ScrapeModel.source)
+        .subquery()
+    )
+
+    return (
+        select(ScrapeModel)
+        .join(
+            newest_full_scrapes,
+            and_(
+                ScrapeModel.source == newest_full_scrapes.c.source,
+                ScrapeModel.insertion_timestamp >= newest_full_scrapes.c.since,
+            ),
+        )
+        .order_by(ScrapeModel.insertion_timestamp)
+    )
+
+
+def scrapes_matches_query(scrape_ids: list[str]) -> Select:
+    return (
+        select(FootballMatchModel)
+        .where(FootballMatchModel.scrape_id.in_(scrape_ids))
+        .execution_options(yield_per=YIELD_PER)
+    )
+
+
+def add_scrapes_statement() -> Insert:
+    # manifest of redelivered last chunk is already stored
+    return sqlite_insert(ScrapeModel).on_conflict_do_nothing(
+        index_elements=[ScrapeModel.scrape_id]
+    )
+
+
+def register_teams_statement() -> Insert:
+    # names registered concurrently by another session are skipped
+    return sqlite_insert(TeamModel).on_conflict_do_nothing(
+        index_elements=[TeamModel.name]
+    )
+
+
+def team_ids_query(names: list[str]) -> Select:
+    return select(TeamModel.name, TeamModel.id).where(TeamModel.name.in_(names))
+
+
+def group_by_bookmaker(
+    batches: dict[str, list[FootballMatch]], model: FootballMatchModel
+) -> None:
+    batches.setdefault(model.source, []).append(
+        FootballMatch.from_sqlalchemy_model(model)
+    )
+
+
+def apply_delta(
+    batch: list[FootballMatch],
+    manifest: ScrapeManifest,
+    upserts: list[FootballMatch],
+) -> list[FootballMatch]:
+    """Batch of the delta scrape: fixtures of the base batch not replaced by upserts nor removed, then the upserts."""
+    replaced = {match.fixture_key for match in upserts} | set(manifest.removed)
+    timestamps = {
+        key: value
+        for key, value in (
+            ("scrape_start_timestamp", manifest.scrape_start_timestamp),
+            ("scrape_end_timestamp", manifest.scrape_end_timestamp),
+        )
+        if value is not None
+    }
+    carried = [
+        replace(match, scrape_id=manifest.scrape_id, **timestamps)
+        for match in batch
+        if match.fixture_key not in replaced
+    ]
+    return carried + upserts
+
+
+def rebuild_batches(
+    batches: dict[str, list[FootballMatch]],
+    manifests: list[ScrapeManifest],
+    matches: Iterable[FootballMatch],
+) -> None:
+    """
+    Replaces newest batches of bookmakers publishing deltas with ones rebuilt from their newest full scrape and deltas
+    stored after it. Manifests have to be ordered oldest first. Batch stored later in a format without manifest wins,
+    unless it is a streamed delta format scrape which failed before its last chunk (and manifest) was published.
+    """
+    matches_by_scrape: dict[str, list[FootballMatch]] = {}
+    for match in matches:
+        matches_by_scrape.setdefault(match.scrape_id, []).append(match)
+
+    rebuilt: dict[str, list[FootballMatch]] = {}
+    chain_scrape_ids: dict[str, set[str]] = {}
+    for manifest in manifests:
+        upserts = matches_by_scrape.get(manifest.scrape_id, [])
+        if manifest.kind == ScrapeKind.FULL:
+            rebuilt[manifest.source] = upserts
+        else:
+            rebuilt[manifest.source] = apply_delta(
+                rebuilt.get(manifest.source, []), manifest, upserts
+            )
+        chain_scrape_ids.setdefault(manifest.source, set()).add(manifest.scrape_id)
+
+    for source, batch in rebuilt.items():
+        newest = batches.get(source)
+        if (
+            not newest
+            or newest[0].scrape_id in chain_scrape_ids[source]
+            or newest[0].fixture_key is not None
+        ):
+            batches[source] = batch
 
 
 class SyncSQLAlchemyDataAccess:
     def __init__(self, session: Session) -> None:
         self._session = session
 
-    def get_distinct_bookmakers(self) -> list[str]:
-        query = self._session.query(FootballMatchModel.source).distinct().all()
-        return [bookmaker[0] for bookmaker in query]  # todo add enum from literal
+    def get_newest_batches(self) -> dict[str, list[FootballMatch]]:
+        batches: dict[str, list[FootballMatch]] = {}
+        for model in self._session.scalars(newest_batches_query()):
+            group_by_bookmaker(batches, model)
 
-    def get_bookmaker_newest_batch(self, bookmaker: str) -> list[FootballMatch]:
-        latest_scrape = (
-            self._session.query(FootballMatchModel)
-            .filter(FootballMatchModel.source == bookmaker)
-            .order_by(FootballMatchModel.insertion_timestamp.desc())
-            .first()
-        )
+        manifests = [
+            ScrapeManifest.from_sqlalchemy_model(model)
+            for model in self._session.scalars(scrape_chains_query())
+        ]
+        if manifests:
+            models = self._session.scalars(
+                scrapes_matches_query([manifest.scrape_id for manifest in manifests])
+            )
+            rebuild_batches(
+                batches,
+                manifests,
+                (FootballMatch.from_sqlalchemy_model(model) for model in models),
+            )
+        return batches
+
+    def add_matches(
+        self,
+        matches: list[FootballMatch],
+        manifests: list[ScrapeManifest] | None = None,
+    ) -> None:
+        """Single bulk insert in one transaction, nothing is stored if any row fails."""
+        try:
+            if matches:
+                self._session.execute(
+                    insert(FootballMatchModel), [asdict(match) for match in matches]
+                )
+            if manifests:
+                self._session.execute(
+                    add_scrapes_statement(),
+                    [asdict(manifest) for manifest in manifests],
+                )
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
 
-        if latest_scrape:
-            latest_matches = (
-                self._session.query(FootballMatchModel)
-                .filter(FootballMatchModel.scrape_id == latest_scrape.scrape_id)
-                .all()
+    def get_teams(self) -> dict[str, int]:
+        return dict(self._session.execute(select(TeamModel.name, TeamModel.id)).all())
+
+    def register_teams(self, names: Iterable[str]) -> dict[str, int]:
+        """Registers names seen for the first time, returns ids of all given names."""
+        names = list(names)
+        try:
+            self._session.execute(
+                register_teams_statement(), [{"name": name} for name in names]
             )
-            return [
-                FootballMatch.from_sqlalchemy_model(model) for model in latest_matches
-            ]
-        return []
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+
+        return dict(self._session.execute(team_ids_query(names)).all())
+
+
+class AsyncSQLAlchemyDataAccess:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_newest_batches(self) -> dict[str, list[FootballMatch]]:
+        batches: dict[str, list[FootballMatch]] = {}
+        async for model in await self._session.stream_scalars(newest_batches_query()):
+            group_by_bookmaker(batches, model)
+
+        manifests = [
+            ScrapeManifest.from_sqlalchemy_model(model)
+            for model in await self._session.scalars(scrape_chains_query())
+        ]
+        if manifests:
+            models = await self._session.stream_scalars(
+                scrapes_matches_query([manifest.scrape_id for manifest in manifests])
+            )
+            rebuild_batches(
+                batches,
+                manifests,
+                [FootballMatch.from_sqlalchemy_model(model) async for model in models],
+            )
+        return batches
+
+    async def add_matches(
+        self,
+        matches: list[FootballMatch],
+        manifests: list[ScrapeManifest] | None = None,
+    ) -> None:
+        """Single bulk insert in one transaction, nothing is stored if any row fails."""
+        try:
+            if matches:
+                await self._session.execute(
+                    insert(FootballMatchModel), [asdict(match) for match in matches]
+                )
+            if manifests:
+                await self._session.execute(
+                    add_scrapes_statement(),
+                    [asdict(manifest) for manifest in manifests],
+                )
+            await self._session.commit()
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def get_teams(self) -> dict[str, int]:
+        result = await self._session.execute(select(TeamModel.name, TeamModel.id))
+        return dict(result.all())
+
+    async def register_teams(self, names: Iterable[str]) -> dict[str, int]:
+        """Registers names seen for the first time, returns ids of all given names."""
+        names = list(names)
+        try:
+            await self._session.execute(
+                register_teams_statement(), [{"name": name} for name in names]
+            )
+            await self._session.commit()
+        except Exception:
+            await self._session.rollback()
+            raise
+
+        result = await self._session.execute(team_ids_query(names))
+        return dict(result.all())
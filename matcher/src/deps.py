@@ -1,6 +1,54 @@
-from database import SessionFactory
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+from database import AsyncSessionFactory, SessionFactory
+from src.data_access.base import (AsyncSQLAlchemyDataAccess,
+                                  SyncSQLAlchemyDataAccess)
+from src.schemas.consumer_match import FootballMatch
+from src.services.team_registry import TeamRegistry
+from src.settings.settings import settings
 
-def get_database():
-    with SessionFactory() as session:
-        return session
+DataAccess = SyncSQLAlchemyDataAccess | AsyncSQLAlchemyDataAccess
+
+
+@asynccontextmanager
+async def data_access_scope() -> AsyncIterator[DataAccess]:
+    """Session per unit of work, async or sync depending on DATABASE_ASYNC setting."""
+    if settings.DATABASE_ASYNC:
+        async with AsyncSessionFactory() as session:
+            yield AsyncSQLAlchemyDataAccess(session)
+    else:
+        with SessionFactory() as session:
+            yield SyncSQLAlchemyDataAccess(session)
+
+
+async def load_newest_batches() -> dict[str, list[FootballMatch]]:
+    async with data_access_scope() as data_access:
+        if isinstance(data_access, SyncSQLAlchemyDataAccess):
+            return await asyncio.to_thread(data_access.get_newest_batches)
+        return await data_access.get_newest_batches()
+
+
+async def load_team_registry() -> TeamRegistry:
+    async with data_access_scope() as data_access:
+        if isinstance(data_access, SyncSQLAlchemyDataAccess):
+            return TeamRegistry(await asyncio.to_thread(data_access.get_teams))
+        return TeamRegistry(await data_access.get_teams())
+
+
+async def assign_team_ids(
+    team_registry: TeamRegistry, matches: list[FootballMatch]
+) -> None:
+    """Registers standardized names seen for the first time and sets team ids of all matches."""
+    if missing_names := team_registry.missing_names(matches):
+        async with data_access_scope() as data_access:
+            if isinstance(data_access, SyncSQLAlchemyDataAccess):
+                teams = await asyncio.to_thread(
+                    data_access.register_teams, missing_names
+                )
+            else:
+                teams = await data_access.register_teams(missing_names)
+        team_registry.update(teams)
+
+    team_registry.assign(matches)
@@ -5,3 +5,26 @@ class Bookmaker(str, Enum):
     BETCLIC = "BETCLIC"
     LVBET = "LVBET"
     FORTUNA = "FORTUNA"
+
+
+class BatchMatchingStrategyType(str, Enum):
+    BRUTEFORCE = "BRUTEFORCE"
+    BLOCKING = "BLOCKING"
+    ASSIGNMENT = "ASSIGNMENT"
+    CANDIDATE_INDEX = "CANDIDATE_INDEX"
+
+
+class EntityMatchingStrategyType(str, Enum):
+    EXACT = "EXACT"
+    LEVENSHTEIN = "LEVENSHTEIN"
+
+
+class FootballOutcome(str, Enum):
+    TEAM_A_WINS = "TEAM_A_WINS"
+    DRAW = "DRAW"
+    TEAM_B_WINS = "TEAM_B_WINS"
+
+
+class ScrapeKind(str, Enum):
+    FULL = "full"
+    DELTA = "delta"
@@ -1,16 +1,23 @@
-from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
 
 from database import Base
 
 
 class FootballMatchModel(Base):
     __tablename__ = "football_matches"
+    __table_args__ = (
+        Index("ix_football_matches_source_insertion", "source", "insertion_timestamp"),
+        Index("ix_football_matches_scrape_id", "scrape_id"),
+    )
 
     event_time = Column(DateTime())
     team_a = Column(String())
     team_b = Column(String())
     team_a_standardized = Column(String(), default="")
     team_b_standardized = Column(String(), default="")
+    team_a_id = Column(Integer(), nullable=True)
+    team_b_id = Column(Integer(), nullable=True)
+    fixture_key = Column(Integer(), nullable=True)
     bet_options = Column(JSON())
     scrape_id = Column(String())
     source = Column(String())
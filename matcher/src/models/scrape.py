@@ -0,0 +1,23 @@
+from sqlalchemy import JSON, Column, DateTime, Index, String
+
+from database import Base
+
+
+class ScrapeModel(Base):
+    """
+    Manifest of a scrape published in the delta format. Matches of a delta scrape are only those whose odds changed,
+    the full batch is rebuilt from the newest full scrape of the bookmaker and manifests of deltas stored after it.
+    """
+
+    __tablename__ = "scrapes"
+    __table_args__ = (
+        Index("ix_scrapes_source_insertion", "source", "insertion_timestamp"),
+    )
+
+    scrape_id = Column(String(), unique=True, nullable=False)
+    source = Column(String())
+    kind = Column(String())
+    base_scrape_id = Column(String(), nullable=True)
+    removed = Column(JSON())
+    scrape_start_timestamp = Column(DateTime(), nullable=True)
+    scrape_end_timestamp = Column(DateTime(), nullable=True)
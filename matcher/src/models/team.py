@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from database import Base
+
+
+class TeamModel(Base):
+    """Registry of canonical club names, integer id is assigned once and never changes."""
+
+    __tablename__ = "teams"
+
+    id = Column(Integer(), primary_key=True, autoincrement=True)
+    name = Column(String(), unique=True, nullable=False)
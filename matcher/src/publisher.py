@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import Any
+from uuid import uuid4
+
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractExchange
+from src.codecs import JSON_CONTENT_TYPE, encode_json
+from src.schemas.arbitrage import ArbitrageOpportunity
+from src.schemas.consumer_match import FootballMatch
+from src.settings.settings import settings
+
+logging.basicConfig(
+    format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
+    level=logging.INFO,
+)
+
+
+class ResultsPublisher:
+    """
+    Publishes matching results in messages of up to batch_size items. Publishes are pipelined on a channel with
+    publisher confirms: up to max_in_flight messages wait for confirmation at once and publish() waits only when
+    the window is full, which is the backpressure exposed to the caller when the broker is slow.
+    """
+
+    def __init__(
+        self,
+        exchange: AbstractExchange,
+        batch_size: int = settings.RABBIT_PUBLISHER_BATCH_SIZE,
+        max_in_flight: int = settings.RABBIT_PUBLISHER_MAX_IN_FLIGHT,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self._exchange = exchange
+        self._batch_size = batch_size
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._in_flight: set[asyncio.Task] = set()
+        self.failed_count = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def _publish_message(self, message: Message) -> None:
+        try:
+            await self._exchange.publish(message, routing_key="")
+        except Exception:
+            self.failed_count += 1
+            self._logger.exception(
+                f"Publishing {message.headers['x-result-type']} chunk failed."
+            )
+        finally:
+            self._window.release()
+
+    async def publish(self, result_type: str, items: list[dict[str, Any]]) -> None:
+        run_id = str(uuid4())
+        chunks = [
+            items[start : start + self._batch_size]
+            for start in range(0, len(items), self._batch_size)
+        ]
+
+        for chunk_index, chunk in enumerate(chunks):
+            message = Message(
+                body=encode_json(
+                    {
+                        "run_id": run_id,
+                        "chunk_index": chunk_index,
+                        "total_chunks": len(chunks),
+                        "items": chunk,
+                    }
+                ),
+                content_type=JSON_CONTENT_TYPE,
+                delivery_mode=DeliveryMode.PERSISTENT,
+                headers={"x-result-type": result_type, "x-run-id": run_id},
+            )
+
+            if self._window.locked():
+                self._logger.warning(
+                    f"{self.in_flight} messages waiting for broker confirmation."
+                )
+            await self._window.acquire()
+
+            task = asyncio.create_task(self._publish_message(message))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def publish_results(
+        self,
+        clusters: list[list[FootballMatch]],
+        opportunities: list[ArbitrageOpportunity],
+    ) -> None:
+        await self.publish(
+            "clusters", [[asdict(match) for match in cluster] for cluster in clusters]
+        )
+        await self.publish(
+            "opportunities", [opportunity.dict() for opportunity in opportunities]
+        )
+
+    async def wait_for_confirms(self) -> None:
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
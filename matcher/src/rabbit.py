@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from functools import partial
+import time
 
-from aio_pika import Message, RobustQueue, connect_robust
-from aio_pika.abc import AbstractChannel, AbstractRobustConnection
-from sqlalchemy.orm import Session
-from src.deps import get_database
-from src.schemas.consumer_match import FootballMatch
+from aio_pika import RobustQueue, connect_robust
+from aio_pika.abc import (AbstractChannel, AbstractIncomingMessage,
+                          AbstractRobustConnection)
+from src.data_access.base import SyncSQLAlchemyDataAccess
+from src.deps import assign_team_ids, data_access_scope
+from src.schemas.consumer_match import (FootballMatch, ScrapeChunk,
+                                        ScrapeManifest)
 from src.services.name_standardization import \
     FootballClubNameStandardizationService
+from src.services.snapshot import LatestBatchSnapshot
+from src.services.team_registry import TeamRegistry
+from src.settings.settings import settings
 
 logging.basicConfig(
     format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
@@ -31,49 +37,220 @@ class RabbitMQClient:
         )
 
         channel = await connection.channel(publisher_confirms=False)
-        return cls(connection, channel)
+        publishing_channel = await connection.channel(publisher_confirms=True)
+        return cls(connection, channel, publishing_channel)
 
     def __init__(
         self,
         connection: AbstractRobustConnection,
         channel: AbstractChannel,
+        publishing_channel: AbstractChannel | None = None,
     ) -> None:
         self.connection: AbstractRobustConnection = connection
         self.channel: AbstractChannel = channel
+        self.publishing_channel: AbstractChannel | None = publishing_channel
         self._logger = logging.getLogger(self.__class__.__qualname__)
 
+        self._pending_messages: list[AbstractIncomingMessage] = []
+        self._pending_since: float = 0.0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
     async def disconnect(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+        if self.publishing_channel and not self.publishing_channel.is_closed:
+            await self.publishing_channel.close()
         if not self.channel.is_closed:
             await self.channel.close()
         if not self.connection.is_closed:
             await self.connection.close()
 
-    async def _process_rabbitmq_message(
+    def _decode_message(
         self,
-        message: Message,
+        message: AbstractIncomingMessage,
         standardization_service: FootballClubNameStandardizationService,
-        db_session: Session,
+    ) -> ScrapeChunk:
+        is_chunk = (message.headers or {}).get("x-message-format") == "chunk"
+        chunk = ScrapeChunk.from_bytes(
+            message.body, is_chunk, message.content_type, message.content_encoding
+        )
+        chunk.matches = [
+            standardization_service.standardize_club_names(match)
+            for match in chunk.matches
+        ]
+        return chunk
+
+    async def _process_rabbitmq_messages(
+        self,
+        messages: list[AbstractIncomingMessage],
+        standardization_service: FootballClubNameStandardizationService,
+        snapshot: LatestBatchSnapshot,
+        team_registry: TeamRegistry,
     ) -> None:
-        async with message.process():
-            self._logger.info(f"Processing: {message.body}")
+        self._logger.info(f"Processing batch of {len(messages)} messages.")
+
+        chunks: list[ScrapeChunk] = []
+        matches: list[FootballMatch] = []
+        manifests: list[ScrapeManifest] = []
+        decoded_messages: list[AbstractIncomingMessage] = []
+        for message in messages:
+            try:
+                chunk = self._decode_message(message, standardization_service)
+                chunks.append(chunk)
+                matches.extend(chunk.matches)
+                # only the last chunk carries removed fixtures and final timestamps
+                if chunk.manifest is not None and chunk.is_last:
+                    manifests.append(chunk.manifest)
+                decoded_messages.append(message)
+            except (ValueError, TypeError, KeyError):
+                # malformed message would fail again after requeue
+                self._logger.exception(f"Rejecting: {message.body}")
+                await message.reject(requeue=False)
+
+        if not decoded_messages:
+            return
 
-            queue_match = FootballMatch.from_bytes(message.body)
+        try:
+            await assign_team_ids(team_registry, matches)
+            await self._store_matches(matches, manifests)
+            stored = list(zip(decoded_messages, chunks))
+        except Exception:
+            self._logger.exception(
+                "Could not store batch, storing messages one by one."
+            )
+            stored = await self._store_one_by_one(
+                decoded_messages, chunks, team_registry
+            )
+
+        # stored messages are acked whatever happens to the snapshot, redelivery would store them again
+        for _, chunk in stored:
+            try:
+                self._update_snapshot(snapshot, chunk)
+            except Exception:
+                self._logger.exception(
+                    f"Could not add {chunk.source} chunk {chunk.chunk_index} of scrape {chunk.scrape_id} to snapshot."
+                )
+        if len(stored) == len(decoded_messages):
+            await decoded_messages[-1].ack(multiple=True)
+        else:
+            for message, _ in stored:
+                await message.ack()
+
+    async def _store_one_by_one(
+        self,
+        messages: list[AbstractIncomingMessage],
+        chunks: list[ScrapeChunk],
+        team_registry: TeamRegistry,
+    ) -> list[tuple[AbstractIncomingMessage, ScrapeChunk]]:
+        """
+        Fallback of a failed batch, so that a message which cannot be stored does not hold back the others. Failing
+        message is requeued once and rejected (dead-lettered if the queue has a dead letter exchange) when it fails
+        again after redelivery. Returns stored messages with their chunks.
+        """
+        stored = []
+        for message, chunk in zip(messages, chunks):
+            manifests = (
+                [chunk.manifest] if chunk.manifest is not None and chunk.is_last else []
+            )
+            try:
+                await assign_team_ids(team_registry, chunk.matches)
+                await self._store_matches(chunk.matches, manifests)
+            except Exception:
+                description = f"{chunk.source} chunk {chunk.chunk_index} of scrape {chunk.scrape_id}"
+                if message.redelivered:
+                    self._logger.exception(
+                        f"Could not store redelivered {description}, rejecting."
+                    )
+                    await message.reject(requeue=False)
+                else:
+                    self._logger.exception(
+                        f"Could not store {description}, requeueing."
+                    )
+                    await message.nack(requeue=True)
+                continue
+            stored.append((message, chunk))
+        return stored
 
-            standardized_match = standardization_service.standardize_club_names(
-                queue_match
+    @staticmethod
+    def _update_snapshot(snapshot: LatestBatchSnapshot, chunk: ScrapeChunk) -> None:
+        if chunk.manifest is not None:
+            snapshot.register_manifest(chunk.manifest)
+        snapshot.add_matches(chunk.matches, chunk.chunk_index)
+        if chunk.chunk_index is not None:
+            snapshot.register_chunk(
+                chunk.source, chunk.scrape_id, chunk.chunk_index, chunk.total_chunks
             )
 
-            db_model = standardized_match.to_sqlalchemy_model()
-            db_session.add(db_model)
-            db_session.commit()
-
-    async def consume(self, queue: RobustQueue):
-        db_session = get_database()
-        service = FootballClubNameStandardizationService()
-        callback = partial(
-            self._process_rabbitmq_message,
-            standardization_service=service,
-            db_session=db_session,
+    @staticmethod
+    async def _store_matches(
+        matches: list[FootballMatch], manifests: list[ScrapeManifest]
+    ) -> None:
+        async with data_access_scope() as data_access:
+            if isinstance(data_access, SyncSQLAlchemyDataAccess):
+                await asyncio.to_thread(data_access.add_matches, matches, manifests)
+            else:
+                await data_access.add_matches(matches, manifests)
+
+    async def _flush(self, **kwargs) -> None:
+        async with self._flush_lock:
+            messages, self._pending_messages = self._pending_messages, []
+            if messages:
+                await self._process_rabbitmq_messages(messages, **kwargs)
+
+    async def _flush_periodically(
+        self, flush_interval: float, snapshot: LatestBatchSnapshot, **kwargs
+    ) -> None:
+        while True:
+            await asyncio.sleep(flush_interval)
+            if (
+                self._pending_messages
+                and time.monotonic() - self._pending_since >= flush_interval
+            ):
+                await self._flush(snapshot=snapshot, **kwargs)
+            snapshot.promote_idle(settings.SNAPSHOT_PROMOTION_IDLE_SECONDS)
+
+    async def _on_message(
+        self, message: AbstractIncomingMessage, batch_size: int, **kwargs
+    ) -> None:
+        if not self._pending_messages:
+            self._pending_since = time.monotonic()
+        self._pending_messages.append(message)
+
+        if len(self._pending_messages) >= batch_size:
+            await self._flush(**kwargs)
+
+    async def consume(
+        self,
+        queue: RobustQueue,
+        standardization_service: FootballClubNameStandardizationService,
+        snapshot: LatestBatchSnapshot,
+        team_registry: TeamRegistry,
+        batch_size: int = settings.INGEST_BATCH_SIZE,
+        flush_interval: float = settings.INGEST_FLUSH_INTERVAL,
+        prefetch_count: int = settings.RABBIT_PREFETCH_COUNT,
+    ):
+        """
+        Messages are buffered and stored with single bulk insert per batch, whole batch is acked (multiple=True) only
+        after commit. If storing fails, messages of the batch are stored one by one and acked separately, message that
+        fails again after redelivery is rejected. Prefetch count should not be lower than batch size. Stored matches
+        are added to the in-memory snapshot used for matching. Both chunked messages (many matches of one scrape) and
+        legacy single match messages are accepted, a scrape is promoted as soon as all of its chunks are stored. Team ids
+        are assigned (new names registered) before storing. Manifests of delta scrapes are stored with their matches,
+        snapshot applies deltas on top of the current batch of the bookmaker.
+        """
+        await self.channel.set_qos(prefetch_count=prefetch_count)
+
+        processing_kwargs = dict(
+            standardization_service=standardization_service,
+            snapshot=snapshot,
+            team_registry=team_registry,
         )
 
+        async def callback(message: AbstractIncomingMessage) -> None:
+            await self._on_message(message, batch_size, **processing_kwargs)
+
+        self._flush_task = asyncio.create_task(
+            self._flush_periodically(flush_interval, **processing_kwargs)
+        )
         await queue.consume(callback, no_ack=False)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+from src.enums import FootballOutcome
+
+
+class OutcomeBet(BaseModel):
+    outcome: FootballOutcome
+    bookmaker: str
+    odds: float
+    stake: float
+
+
+class ArbitrageOpportunity(BaseModel):
+    event_time: datetime
+    team_a: str
+    team_b: str
+    margin: float
+    profit_percentage: float
+    bets: list[OutcomeBet]
+
+
+class MatchingResult(BaseModel):
+    clusters_count: int
+    opportunities: list[ArbitrageOpportunity]
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
-from src.enums import Bookmaker
+from src.codecs import decode_body
+from src.enums import Bookmaker, ScrapeKind
 from src.models.football_match import FootballMatchModel
+from src.models.scrape import ScrapeModel
 
 
 @dataclass(slots=True)
@@ -21,19 +22,27 @@ class FootballMatch:
 
     team_a_standardized: str = field(default="")
     team_b_standardized: str = field(default="")
+    # ids of standardized names in the team registry, assigned at ingest
+    team_a_id: int | None = field(default=None)
+    team_b_id: int | None = field(default=None)
+    # hash of teams and kickoff time set by the scraper, identifies the fixture across delta scrapes
+    fixture_key: int | None = field(default=None)
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> FootballMatch:
-        decoded_data = data.decode("utf-8")
-        match_data = json.loads(decoded_data)
+    def from_bytes(
+        cls,
+        data: bytes,
+        content_type: str | None = None,
+        content_encoding: str | None = None,
+    ) -> FootballMatch:
+        return cls.from_dict(decode_body(data, content_type, content_encoding))
 
-        match_data["event_time"] = datetime.fromisoformat(match_data["event_time"])
-        match_data["scrape_start_timestamp"] = datetime.fromisoformat(
-            match_data["scrape_start_timestamp"]
-        )
-        match_data["scrape_end_timestamp"] = datetime.fromisoformat(
-            match_data["scrape_end_timestamp"]
-        )
+    @classmethod
+    def from_dict(cls, match_data: dict) -> FootballMatch:
+        # JSON carries datetimes as ISO strings, msgpack decodes them natively
+        for key in ("event_time", "scrape_start_timestamp", "scrape_end_timestamp"):
+            if isinstance(match_data[key], str):
+                match_data[key] = datetime.fromisoformat(match_data[key])
 
         return cls(**match_data)
 
@@ -45,6 +54,9 @@ class FootballMatch:
             team_b=model.team_b,
             team_a_standardized=model.team_a_standardized,
             team_b_standardized=model.team_b_standardized,
+            team_a_id=model.team_a_id,
+            team_b_id=model.team_b_id,
+            fixture_key=model.fixture_key,
             bet_options=model.bet_options,
             scrape_id=model.scrape_id,
             source=model.source,
@@ -55,3 +67,103 @@ class FootballMatch:
     def to_sqlalchemy_model(self) -> FootballMatchModel:
         match_dict = asdict(self)
         return FootballMatchModel(**match_dict)
+
+
+@dataclass(slots=True)
+class ScrapeManifest:
+    """
+    Describes a scrape published in the delta format. Matches of a full scrape are the whole batch, matches of a delta
+    scrape replace fixtures with the same key in the batch of base scrape and removed fixtures are dropped from it.
+    """
+
+    scrape_id: str
+    source: Bookmaker
+    kind: ScrapeKind
+    base_scrape_id: str | None
+    removed: list[int]
+    scrape_start_timestamp: datetime | None
+    scrape_end_timestamp: datetime | None
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> ScrapeManifest:
+        timestamps = {}
+        for key in ("scrape_start_timestamp", "scrape_end_timestamp"):
+            value = payload.get(key)
+            timestamps[key] = (
+                datetime.fromisoformat(value) if isinstance(value, str) else value
+            )
+
+        return cls(
+            scrape_id=payload["scrape_id"],
+            source=payload["source"],
+            kind=ScrapeKind(payload["kind"]),
+            base_scrape_id=payload.get("base_scrape_id"),
+            removed=[int(key) for key in payload.get("removed", [])],
+            **timestamps,
+        )
+
+    @classmethod
+    def from_sqlalchemy_model(cls, model: ScrapeModel) -> ScrapeManifest:
+        return cls(
+            scrape_id=model.scrape_id,
+            source=model.source,
+            kind=ScrapeKind(model.kind),
+            base_scrape_id=model.base_scrape_id,
+            removed=model.removed,
+            scrape_start_timestamp=model.scrape_start_timestamp,
+            scrape_end_timestamp=model.scrape_end_timestamp,
+        )
+
+
+@dataclass(slots=True)
+class ScrapeChunk:
+    """
+    Part of a single scrape published as one message. Messages in the legacy single match format are decoded as
+    chunks without position, scrape completion then can only be inferred from the next scrape or inactivity. Chunks of
+    a streamed scrape do not know the total number of chunks, only the last one (end of scrape marker) carries it.
+    Chunks of a scrape published in the delta format carry its manifest, removed fixtures and final timestamps are
+    complete only in the manifest of the last chunk.
+    """
+
+    scrape_id: str
+    source: Bookmaker
+    matches: list[FootballMatch]
+    chunk_index: int | None = None
+    total_chunks: int | None = None
+    manifest: ScrapeManifest | None = None
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        is_chunk: bool,
+        content_type: str | None = None,
+        content_encoding: str | None = None,
+    ) -> ScrapeChunk:
+        payload = decode_body(data, content_type, content_encoding)
+        if not is_chunk:
+            match = FootballMatch.from_dict(payload)
+            return cls(scrape_id=match.scrape_id, source=match.source, matches=[match])
+
+        chunk = cls(
+            scrape_id=payload["scrape_id"],
+            source=payload["source"],
+            matches=[FootballMatch.from_dict(match) for match in payload["matches"]],
+            chunk_index=int(payload["chunk_index"]),
+            total_chunks=(
+                None
+                if payload["total_chunks"] is None
+                else int(payload["total_chunks"])
+            ),
+        )
+        if "kind" in payload:
+            for match, key in zip(chunk.matches, payload["fixture_keys"], strict=True):
+                match.fixture_key = int(key)
+            chunk.manifest = ScrapeManifest.from_dict(payload)
+        return chunk
+
+    @property
+    def is_last(self) -> bool:
+        return (
+            self.total_chunks is not None and self.chunk_index == self.total_chunks - 1
+        )
@@ -0,0 +1,109 @@
+import numpy as np
+from src.schemas.arbitrage import ArbitrageOpportunity, OutcomeBet
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.data import OUTCOMES
+from src.settings.settings import settings
+
+
+class ArbitrageService:
+    """
+    Odds of all clusters are packed into cluster x bookmaker x outcome array, best price per outcome, margin
+    (sum of implied probabilities), profit and stakes are then computed for all clusters at once.
+    """
+
+    def __init__(self, total_stake: float = settings.ARBITRAGE_TOTAL_STAKE) -> None:
+        self._total_stake = total_stake
+
+    @staticmethod
+    def pack_odds(clusters: list[list[FootballMatch]]) -> np.ndarray:
+        """Missing bookmakers and outcomes are NaN."""
+        sizes = np.fromiter(map(len, clusters), dtype=np.intp, count=len(clusters))
+        total = int(sizes.sum())
+
+        values = np.fromiter(
+            (
+                match.bet_options.get(outcome, np.nan)
+                for cluster in clusters
+                for match in cluster
+                for outcome in OUTCOMES
+            ),
+            dtype=np.float64,
+            count=total * len(OUTCOMES),
+        ).reshape(total, len(OUTCOMES))
+
+        cluster_indexes = np.repeat(np.arange(len(clusters)), sizes)
+        positions = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+        odds = np.full((len(clusters), int(sizes.max()), len(OUTCOMES)), np.nan)
+        odds[cluster_indexes, positions] = values
+        return odds
+
+    def find_opportunities(
+        self,
+        clusters: list[list[FootballMatch]],
+        limit: int | None = None,
+    ) -> list[ArbitrageOpportunity]:
+        """Clusters with margin below 1, most profitable first."""
+        if not clusters:
+            return []
+
+        odds = self.pack_odds(clusters)
+        # odds of 1.0 or less never pay out, missing ones can't be bet on
+        odds = np.where(odds > 1.0, odds, 0.0)
+
+        best_bookmakers = odds.argmax(axis=1)
+        best_odds = np.take_along_axis(odds, best_bookmakers[:, None, :], axis=1)[
+            :, 0, :
+        ]
+        priced = (best_odds > 0).all(axis=1)
+
+        implied_probabilities = np.divide(
+            1.0, best_odds, out=np.full_like(best_odds, np.inf), where=best_odds > 0
+        )
+        margins = implied_probabilities.sum(axis=1)
+        profits = (1.0 / margins - 1.0) * 100
+        stakes = self._total_stake * implied_probabilities / margins[:, None]
+
+        (opportunities,) = np.nonzero(priced & (margins < 1.0))
+        ranked = opportunities[np.argsort(-profits[opportunities], kind="stable")][
+            :limit
+        ]
+
+        return [
+            self._to_opportunity(
+                clusters[index],
+                margins[index],
+                profits[index],
+                best_bookmakers[index],
+                best_odds[index],
+                stakes[index],
+            )
+            for index in ranked
+        ]
+
+    @staticmethod
+    def _to_opportunity(
+        cluster: list[FootballMatch],
+        margin: float,
+        profit: float,
+        best_bookmakers: np.ndarray,
+        best_odds: np.ndarray,
+        stakes: np.ndarray,
+    ) -> ArbitrageOpportunity:
+        pivot = cluster[0]
+        return ArbitrageOpportunity(
+            event_time=pivot.event_time,
+            team_a=pivot.team_a_standardized,
+            team_b=pivot.team_b_standardized,
+            margin=round(float(margin), 6),
+            profit_percentage=round(float(profit), 4),
+            bets=[
+                OutcomeBet(
+                    outcome=outcome,
+                    bookmaker=cluster[best_bookmakers[position]].source,
+                    odds=float(best_odds[position]),
+                    stake=round(float(stakes[position]), 2),
+                )
+                for position, outcome in enumerate(OUTCOMES)
+            ],
+        )
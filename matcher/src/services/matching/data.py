@@ -1,9 +1,359 @@
+from __future__ import annotations
+
+from calendar import timegm
+from copy import copy
 from dataclasses import dataclass
+from datetime import datetime
+from math import isnan
+from threading import Lock
+from typing import Iterable, Sequence, overload
 
+import numpy as np
+from src.enums import FootballOutcome
 from src.schemas.consumer_match import FootballMatch
 
+OUTCOMES = [outcome.value for outcome in FootballOutcome]
+MISSING_TEAM_ID = -1
+MISSING_FIXTURE_KEY = -1
+
 
 @dataclass
 class Batch:
     count: int
     matches: list[FootballMatch]
+
+    @property
+    def event_times(self) -> np.ndarray:
+        return np.fromiter(
+            (to_epoch_seconds(match.event_time) for match in self.matches),
+            dtype=np.int64,
+            count=len(self.matches),
+        )
+
+    @property
+    def team_a_standardized(self) -> list[str]:
+        return [match.team_a_standardized for match in self.matches]
+
+    @property
+    def team_b_standardized(self) -> list[str]:
+        return [match.team_b_standardized for match in self.matches]
+
+    def take(self, indexes: np.ndarray) -> Batch:
+        matches = [self.matches[index] for index in indexes.tolist()]
+        return Batch(count=len(matches), matches=matches)
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    # bookmakers send both naive (UTC) and offset aware datetimes
+    return timegm(value.utctimetuple())
+
+
+class NameTable:
+    """
+    Append only string intern table, every distinct string is stored once and referenced by its int32 id. Ids are
+    stable for the lifetime of the table, so ids of batches interned in the same table can be compared directly.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, name_id: int) -> str:
+        return self._names[name_id]
+
+    def intern(self, names: Iterable[str]) -> np.ndarray:
+        with self._lock:
+            ids = self._ids
+            result = []
+            for name in names:
+                name_id = ids.get(name)
+                if name_id is None:
+                    name_id = ids[name] = len(self._names)
+                    self._names.append(name)
+                result.append(name_id)
+        return np.array(result, dtype=np.int32)
+
+    def lookup(self, name_ids: np.ndarray) -> list[str]:
+        names = self._names
+        return [names[name_id] for name_id in name_ids.tolist()]
+
+
+# shared by default so ids of batches coming from the snapshot and from the database are comparable
+team_names = NameTable()
+
+
+def _team_ids(team_ids: Iterable[int | None]) -> np.ndarray:
+    # team registry ids, MISSING_TEAM_ID for matches ingested before the registry existed
+    return np.fromiter(
+        (MISSING_TEAM_ID if team_id is None else team_id for team_id in team_ids),
+        dtype=np.int64,
+    )
+
+
+def _team_id(team_id: np.int64) -> int | None:
+    return None if team_id == MISSING_TEAM_ID else int(team_id)
+
+
+def _fixture_key(fixture_key: np.int64) -> int | None:
+    return None if fixture_key == MISSING_FIXTURE_KEY else int(fixture_key)
+
+
+def _fixture_keys(fixture_keys: Iterable[int | None]) -> np.ndarray:
+    # MISSING_FIXTURE_KEY for matches not published in the delta format, scrapers keep keys non-negative
+    return np.fromiter(
+        (MISSING_FIXTURE_KEY if key is None else key for key in fixture_keys),
+        dtype=np.int64,
+    )
+
+
+class MatchesView(Sequence[FootballMatch]):
+    """Read only sequence of FootballMatch objects materialized from columnar batch rows on access."""
+
+    def __init__(self, batch: ColumnarBatch) -> None:
+        self._batch = batch
+
+    def __len__(self) -> int:
+        return self._batch.count
+
+    @overload
+    def __getitem__(self, index: int) -> FootballMatch:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[FootballMatch]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._batch.match(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._batch.match(index)
+
+
+class ColumnarBatch:
+    """
+    Batch of a single bookmaker stored as arrays: kickoff times as int64 epoch seconds, odds as n x 3 float64 array
+    (columns in FootballOutcome order, NaN when not offered), team names as ids into a shared NameTable and team
+    registry ids (MISSING_TEAM_ID when unknown), fixture keys of delta publishing (MISSING_FIXTURE_KEY when unknown).
+    Scrape metadata is stored once per scrape. Exposes the same count and matches as Batch, so strategies written for
+    lists keep working, matches are materialized lazily with naive UTC datetimes.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        event_times: np.ndarray,
+        odds: np.ndarray,
+        team_a_name_ids: np.ndarray,
+        team_b_name_ids: np.ndarray,
+        team_a_standardized_name_ids: np.ndarray,
+        team_b_standardized_name_ids: np.ndarray,
+        team_a_ids: np.ndarray,
+        team_b_ids: np.ndarray,
+        fixture_keys: np.ndarray,
+        scrape_indexes: np.ndarray,
+        scrapes: list[tuple[str, datetime, datetime]],
+        names: NameTable = team_names,
+    ) -> None:
+        self.source = source
+        self.event_times = event_times
+        self.odds = odds
+        self.team_a_name_ids = team_a_name_ids
+        self.team_b_name_ids = team_b_name_ids
+        self.team_a_standardized_name_ids = team_a_standardized_name_ids
+        self.team_b_standardized_name_ids = team_b_standardized_name_ids
+        self.team_a_ids = team_a_ids
+        self.team_b_ids = team_b_ids
+        self.fixture_keys = fixture_keys
+        self.scrape_indexes = scrape_indexes
+        self.scrapes = scrapes
+        self.names = names
+
+    @classmethod
+    def from_matches(
+        cls, matches: Sequence[FootballMatch], names: NameTable = team_names
+    ) -> ColumnarBatch:
+        if isinstance(matches, MatchesView):
+            return matches._batch
+
+        scrape_positions: dict[str, int] = {}
+        scrapes: list[tuple[str, datetime, datetime]] = []
+        scrape_indexes = np.empty(len(matches), dtype=np.int32)
+        for row, match in enumerate(matches):
+            position = scrape_positions.get(match.scrape_id)
+            if position is None:
+                position = scrape_positions[match.scrape_id] = len(scrapes)
+                scrapes.append(
+                    (
+                        match.scrape_id,
+                        match.scrape_start_timestamp,
+                        match.scrape_end_timestamp,
+                    )
+                )
+            scrape_indexes[row] = position
+
+        return cls(
+            source=matches[0].source if matches else "",
+            event_times=np.fromiter(
+                (to_epoch_seconds(match.event_time) for match in matches),
+                dtype=np.int64,
+                count=len(matches),
+            ),
+            odds=np.fromiter(
+                (
+                    match.bet_options.get(outcome, np.nan)
+                    for match in matches
+                    for outcome in OUTCOMES
+                ),
+                dtype=np.float64,
+                count=len(matches) * len(OUTCOMES),
+            ).reshape(len(matches), len(OUTCOMES)),
+            team_a_name_ids=names.intern(match.team_a for match in matches),
+            team_b_name_ids=names.intern(match.team_b for match in matches),
+            team_a_standardized_name_ids=names.intern(
+                match.team_a_standardized for match in matches
+            ),
+            team_b_standardized_name_ids=names.intern(
+                match.team_b_standardized for match in matches
+            ),
+            team_a_ids=_team_ids(match.team_a_id for match in matches),
+            team_b_ids=_team_ids(match.team_b_id for match in matches),
+            fixture_keys=_fixture_keys(match.fixture_key for match in matches),
+            scrape_indexes=scrape_indexes,
+            scrapes=scrapes,
+            names=names,
+        )
+
+    @classmethod
+    def concat(cls, batches: list[ColumnarBatch]) -> ColumnarBatch:
+        """Batches have to share the name table."""
+        scrapes: list[tuple[str, datetime, datetime]] = []
+        scrape_indexes = []
+        for batch in batches:
+            scrape_indexes.append(batch.scrape_indexes + len(scrapes))
+            scrapes.extend(batch.scrapes)
+
+        return cls(
+            source=next((batch.source for batch in batches if batch.source), ""),
+            event_times=np.concatenate([batch.event_times for batch in batches]),
+            odds=np.concatenate([batch.odds for batch in batches]),
+            team_a_name_ids=np.concatenate(
+                [batch.team_a_name_ids for batch in batches]
+            ),
+            team_b_name_ids=np.concatenate(
+                [batch.team_b_name_ids for batch in batches]
+            ),
+            team_a_standardized_name_ids=np.concatenate(
+                [batch.team_a_standardized_name_ids for batch in batches]
+            ),
+            team_b_standardized_name_ids=np.concatenate(
+                [batch.team_b_standardized_name_ids for batch in batches]
+            ),
+            team_a_ids=np.concatenate([batch.team_a_ids for batch in batches]),
+            team_b_ids=np.concatenate([batch.team_b_ids for batch in batches]),
+            fixture_keys=np.concatenate([batch.fixture_keys for batch in batches]),
+            scrape_indexes=np.concatenate(scrape_indexes),
+            scrapes=scrapes,
+            names=batches[0].names,
+        )
+
+    @property
+    def count(self) -> int:
+        return len(self.event_times)
+
+    @property
+    def matches(self) -> MatchesView:
+        return MatchesView(self)
+
+    @property
+    def scrape_id(self) -> str | None:
+        if self.count:
+            return self.scrapes[self.scrape_indexes[0]][0]
+        # batch of a scrape which has no (remaining) matches
+        return self.scrapes[0][0] if self.scrapes else None
+
+    @property
+    def team_a_standardized(self) -> list[str]:
+        return self.names.lookup(self.team_a_standardized_name_ids)
+
+    @property
+    def team_b_standardized(self) -> list[str]:
+        return self.names.lookup(self.team_b_standardized_name_ids)
+
+    def take(self, indexes: np.ndarray) -> ColumnarBatch:
+        return ColumnarBatch(
+            source=self.source,
+            event_times=self.event_times[indexes],
+            odds=self.odds[indexes],
+            team_a_name_ids=self.team_a_name_ids[indexes],
+            team_b_name_ids=self.team_b_name_ids[indexes],
+            team_a_standardized_name_ids=self.team_a_standardized_name_ids[indexes],
+            team_b_standardized_name_ids=self.team_b_standardized_name_ids[indexes],
+            team_a_ids=self.team_a_ids[indexes],
+            team_b_ids=self.team_b_ids[indexes],
+            fixture_keys=self.fixture_keys[indexes],
+            scrape_indexes=self.scrape_indexes[indexes],
+            scrapes=self.scrapes,
+            names=self.names,
+        )
+
+    def relabel(
+        self,
+        scrape_id: str,
+        scrape_start_timestamp: datetime | None = None,
+        scrape_end_timestamp: datetime | None = None,
+    ) -> ColumnarBatch:
+        """Same rows attributed to a single scrape, timestamps of the first scrape are kept when not given."""
+        _, first_start_timestamp, first_end_timestamp = (
+            self.scrapes[0] if self.scrapes else ("", None, None)
+        )
+        # columns are never modified in place, shallow copy shares them
+        batch = copy(self)
+        batch.scrape_indexes = np.zeros(self.count, dtype=np.int32)
+        batch.scrapes = [
+            (
+                scrape_id,
+                scrape_start_timestamp or first_start_timestamp,
+                scrape_end_timestamp or first_end_timestamp,
+            )
+        ]
+        return batch
+
+    def filter(self, mask: np.ndarray) -> ColumnarBatch:
+        """Rows selected by boolean mask, e.g. batch.filter(batch.event_times >= now) or on batch.odds."""
+        return self.take(np.flatnonzero(mask))
+
+    def match(self, row: int) -> FootballMatch:
+        scrape_id, scrape_start_timestamp, scrape_end_timestamp = self.scrapes[
+            self.scrape_indexes[row]
+        ]
+        names = self.names
+        return FootballMatch(
+            event_time=datetime.utcfromtimestamp(int(self.event_times[row])),
+            team_a=names[self.team_a_name_ids[row]],
+            team_b=names[self.team_b_name_ids[row]],
+            bet_options={
+                outcome: float(odds)
+                for outcome, odds in zip(OUTCOMES, self.odds[row].tolist())
+                if not isnan(odds)
+            },
+            scrape_id=scrape_id,
+            source=self.source,
+            scrape_start_timestamp=scrape_start_timestamp,
+            scrape_end_timestamp=scrape_end_timestamp,
+            team_a_standardized=names[self.team_a_standardized_name_ids[row]],
+            team_b_standardized=names[self.team_b_standardized_name_ids[row]],
+            team_a_id=_team_id(self.team_a_ids[row]),
+            team_b_id=_team_id(self.team_b_ids[row]),
+            fixture_key=_fixture_key(self.fixture_keys[row]),
+        )
+
+
+AnyBatch = Batch | ColumnarBatch
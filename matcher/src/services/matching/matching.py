@@ -1,22 +1,72 @@
+import asyncio
 import logging
+from datetime import timedelta
 
-from sqlalchemy.orm import Session
-from src.data_access.base import SyncSQLAlchemyDataAccess
+from src.data_access.base import (AsyncSQLAlchemyDataAccess,
+                                  SyncSQLAlchemyDataAccess)
+from src.enums import BatchMatchingStrategyType, EntityMatchingStrategyType
 from src.schemas.consumer_match import FootballMatch
-from src.services.matching.data import Batch
-from src.services.matching.strategy.batch.base import BaseEventMatchingStrategy
+from src.services.matching.data import AnyBatch, Batch, ColumnarBatch
+from src.services.matching.strategy.batch.assignment import \
+    AssignmentMatchingStrategy
+from src.services.matching.strategy.batch.base import (
+    BaseEventMatchingStrategy, PairwiseEventMatchingStrategy)
+from src.services.matching.strategy.batch.blocking import \
+    BlockingMatchingStrategy
 from src.services.matching.strategy.batch.bruteforce import \
     BruteForceMatchingStrategy
+from src.services.matching.strategy.batch.candidates import \
+    CandidateIndexMatchingStrategy
+from src.services.matching.strategy.batch.incremental import \
+    IncrementalMatchingStrategy
 from src.services.matching.strategy.entity.base import \
     BaseEntityMatchingStrategy
 from src.services.matching.strategy.entity.exact import \
     ExactEntityComparisonStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+from src.services.snapshot import LatestBatchSnapshot
+from src.settings.settings import settings
+
+ENTITY_MATCHING_STRATEGIES: dict[
+    EntityMatchingStrategyType, type[BaseEntityMatchingStrategy]
+] = {
+    EntityMatchingStrategyType.EXACT: ExactEntityComparisonStrategy,
+    EntityMatchingStrategyType.LEVENSHTEIN: LevenshteinDistanceEntityComparisonStrategy,
+}
+
+
+def build_batch_matching_strategy(
+    strategy_type: BatchMatchingStrategyType,
+    entity_matching_strategy: BaseEntityMatchingStrategy,
+) -> BaseEventMatchingStrategy:
+    match strategy_type:
+        case BatchMatchingStrategyType.BRUTEFORCE:
+            return BruteForceMatchingStrategy(entity_matching_strategy)
+        case BatchMatchingStrategyType.BLOCKING:
+            return BlockingMatchingStrategy(
+                entity_matching_strategy,
+                event_time_window=timedelta(
+                    minutes=settings.MATCHING_EVENT_TIME_WINDOW_MINUTES
+                )
+                if settings.MATCHING_EVENT_TIME_WINDOW_MINUTES
+                else None,
+            )
+        case BatchMatchingStrategyType.ASSIGNMENT:
+            return AssignmentMatchingStrategy()
+        case BatchMatchingStrategyType.CANDIDATE_INDEX:
+            return CandidateIndexMatchingStrategy(
+                entity_matching_strategy, top_k=settings.MATCHING_CANDIDATES_TOP_K
+            )
+    raise ValueError(f"Unknown batch matching strategy: {strategy_type}")
 
 
 class FootballEventMatchingService:
     def __init__(
         self,
-        data_access: SyncSQLAlchemyDataAccess,
+        data_access: SyncSQLAlchemyDataAccess
+        | AsyncSQLAlchemyDataAccess
+        | LatestBatchSnapshot,
         batch_matching_strategy: BaseEventMatchingStrategy = None,
         entity_matching_strategy: BaseEntityMatchingStrategy = None,
     ) -> None:
@@ -38,19 +88,61 @@ class FootballEventMatchingService:
         )
 
     @classmethod
-    def from_session(cls, session: Session, **kwargs) -> "FootballEventMatchingService":
-        return cls(data_access=SyncSQLAlchemyDataAccess(session), **kwargs)
+    def from_settings(
+        cls,
+        data_access: SyncSQLAlchemyDataAccess
+        | AsyncSQLAlchemyDataAccess
+        | LatestBatchSnapshot,
+    ) -> "FootballEventMatchingService":
+        entity_matching_strategy = ENTITY_MATCHING_STRATEGIES[
+            settings.MATCHING_ENTITY_STRATEGY
+        ]()
+        batch_matching_strategy = build_batch_matching_strategy(
+            settings.MATCHING_BATCH_STRATEGY, entity_matching_strategy
+        )
+        if settings.MATCHING_INCREMENTAL and isinstance(
+            batch_matching_strategy, PairwiseEventMatchingStrategy
+        ):
+            batch_matching_strategy = IncrementalMatchingStrategy(
+                batch_matching_strategy
+            )
+
+        return cls(
+            data_access=data_access,
+            batch_matching_strategy=batch_matching_strategy,
+            entity_matching_strategy=entity_matching_strategy,
+        )
+
+    @staticmethod
+    def _to_batches(
+        newest_batches: dict[str, list[FootballMatch] | ColumnarBatch]
+    ) -> dict[str, AnyBatch]:
+        # snapshot already keeps columnar batches, database returns lists
+        return {
+            bookmaker: matches
+            if isinstance(matches, ColumnarBatch)
+            else Batch(count=len(matches), matches=matches)
+            for bookmaker, matches in newest_batches.items()
+        }
+
+    def _get_data(self) -> dict[str, AnyBatch]:
+        return self._to_batches(self._data_access.get_newest_batches())
 
-    def _get_data(self) -> dict[str, dict[str, list[FootballMatch] | int]]:
-        all_bookmakers: list[str] = self._data_access.get_distinct_bookmakers()
+    async def _get_data_async(self) -> dict[str, AnyBatch]:
+        if isinstance(self._data_access, SyncSQLAlchemyDataAccess):
+            return await asyncio.to_thread(self._get_data)
 
-        data = {}
-        for bookmaker in all_bookmakers:
-            matches = self._data_access.get_bookmaker_newest_batch(bookmaker)
-            data[bookmaker] = Batch(count=len(matches), matches=matches)
-        return data
+        if isinstance(self._data_access, AsyncSQLAlchemyDataAccess):
+            return self._to_batches(await self._data_access.get_newest_batches())
+
+        return self._get_data()
 
     def get_matches(self) -> list[list[FootballMatch]]:
         data = self._get_data()
         # TODO data validation (scrape timestamps deltas)
         return self._batch_matching_strategy.match_events(data)
+
+    async def get_matches_async(self) -> list[list[FootballMatch]]:
+        """Database access and matching itself do not block the event loop (shared with the consumer)."""
+        data = await self._get_data_async()
+        return await asyncio.to_thread(self._batch_matching_strategy.match_events, data)
@@ -0,0 +1,183 @@
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from src.schemas.consumer_match import FootballMatch
+
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str, size: int = NGRAM_SIZE) -> list[str]:
+    padded = f" {text.casefold()} "
+    return [padded[i : i + size] for i in range(max(len(padded) - size + 1, 1))]
+
+
+def _distinct(names: list[str]) -> tuple[list[str], np.ndarray]:
+    """Distinct names in order of appearance and position of every name among them."""
+    positions: dict[str, int] = {}
+    name_ids = np.fromiter(
+        (positions.setdefault(name, len(positions)) for name in names),
+        dtype=np.intp,
+        count=len(names),
+    )
+    return list(positions), name_ids
+
+
+class _NgramVectorizer:
+    """
+    TF-IDF weighted, L2 normalized n-gram vectors of names, vocabulary and IDF come from the names it was built on.
+    A team plays many fixtures, so every distinct name is vectorized once.
+    """
+
+    def __init__(self, names: list[str]) -> None:
+        distinct_names, name_ids = _distinct(names)
+        documents = [Counter(_ngrams(name)) for name in distinct_names]
+        self.vocabulary: dict[str, int] = {}
+        for document in documents:
+            for ngram in document:
+                self.vocabulary.setdefault(ngram, len(self.vocabulary))
+
+        # frequency among all names, not only the distinct ones
+        name_counts = np.bincount(name_ids, minlength=len(distinct_names)).tolist()
+        document_frequency = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for document, name_count in zip(documents, name_counts):
+            for ngram in document:
+                document_frequency[self.vocabulary[ngram]] += name_count
+        self._idf = (np.log((1 + len(names)) / (1 + document_frequency)) + 1).astype(
+            np.float32
+        )
+
+        self.vectors = self._vectorize_documents(documents)[name_ids]
+
+    def _vectorize_documents(self, documents: list[Counter]) -> csr_matrix:
+        indptr = [0]
+        indices: list[int] = []
+        data: list[float] = []
+        for document in documents:
+            for ngram, count in document.items():
+                column = self.vocabulary.get(ngram)
+                if column is not None:
+                    indices.append(column)
+                    data.append(count)
+            indptr.append(len(indices))
+
+        vectors = csr_matrix(
+            (np.array(data, dtype=np.float32), indices, indptr),
+            shape=(len(documents), len(self.vocabulary)),
+            dtype=np.float32,
+        )
+        vectors = vectors.multiply(self._idf).tocsr()
+
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        vectors.data /= np.repeat(norms, np.diff(vectors.indptr))
+        return vectors
+
+    def vectorize(self, names: list[str]) -> csr_matrix:
+        distinct_names, name_ids = _distinct(names)
+        documents = [Counter(_ngrams(name)) for name in distinct_names]
+        return self._vectorize_documents(documents)[name_ids]
+
+
+def _pair_features(
+    team_a_vectors: csr_matrix, team_b_vectors: csr_matrix
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rows, keys and weights of every (team a n-gram, team b n-gram) pair of every row, the outer product of its team
+    a and team b vectors. Keys are team a column * team b vocabulary size + team b column.
+    """
+    team_a_counts = np.diff(team_a_vectors.indptr)
+    team_b_counts = np.diff(team_b_vectors.indptr)
+    pair_counts = team_a_counts * team_b_counts
+
+    rows = np.repeat(np.arange(len(pair_counts)), pair_counts)
+    offsets = np.arange(len(rows)) - np.repeat(
+        np.cumsum(pair_counts) - pair_counts, pair_counts
+    )
+    row_team_b_counts = team_b_counts[rows]
+    team_a_positions = team_a_vectors.indptr[rows] + offsets // row_team_b_counts
+    team_b_positions = team_b_vectors.indptr[rows] + offsets % row_team_b_counts
+
+    keys = (
+        team_a_vectors.indices[team_a_positions].astype(np.int64)
+        * team_b_vectors.shape[1]
+        + team_b_vectors.indices[team_b_positions]
+    )
+    weights = (
+        team_a_vectors.data[team_a_positions] * team_b_vectors.data[team_b_positions]
+    )
+    return rows, keys, weights
+
+
+class TrigramCandidateIndex:
+    """
+    TF-IDF weighted character trigram vectors of standardized team names. Matches are indexed by pairs of team a and
+    team b trigrams weighted by the product of their weights, so the similarity of two matches is the product of
+    cosine similarities of their team a and team b names and candidates for a query are the indexed matches with the
+    highest one, computed as a sparse matrix product. Pairs shared by more than MAX_PAIR_FREQUENCY indexed matches
+    (e.g. trigrams of "United" against trigrams of "City") are left out: they tell matches apart poorly and would make
+    every query score a share of the whole batch. Without them a query scores a bounded number of matches, which
+    still share other pairs with the same fixture, and the cost grows linearly with the number of matches.
+    """
+
+    QUERY_CHUNK_SIZE = 1024
+    MAX_PAIR_FREQUENCY = 20
+
+    def __init__(self, matches: list[FootballMatch]) -> None:
+        self._team_a_vectorizer = _NgramVectorizer(
+            [match.team_a_standardized for match in matches]
+        )
+        self._team_b_vectorizer = _NgramVectorizer(
+            [match.team_b_standardized for match in matches]
+        )
+
+        rows, keys, weights = _pair_features(
+            self._team_a_vectorizer.vectors, self._team_b_vectorizer.vectors
+        )
+        self._keys, columns = np.unique(keys, return_inverse=True)
+        postings = csr_matrix(
+            (weights, (columns.ravel(), rows)),
+            shape=(len(self._keys), len(matches)),
+            dtype=np.float32,
+        )
+
+        frequent = np.diff(postings.indptr) > self.MAX_PAIR_FREQUENCY
+        self._keys = self._keys[~frequent]
+        self._postings = postings[~frequent]
+
+    def _vectorize(self, matches: list[FootballMatch]) -> csr_matrix:
+        rows, keys, weights = _pair_features(
+            self._team_a_vectorizer.vectorize(
+                [match.team_a_standardized for match in matches]
+            ),
+            self._team_b_vectorizer.vectorize(
+                [match.team_b_standardized for match in matches]
+            ),
+        )
+        columns = np.searchsorted(self._keys, keys)
+        indexed = columns < len(self._keys)
+        indexed[indexed] = self._keys[columns[indexed]] == keys[indexed]
+        return csr_matrix(
+            (weights[indexed], (rows[indexed], columns[indexed])),
+            shape=(len(matches), len(self._keys)),
+            dtype=np.float32,
+        )
+
+    def query(self, matches: list[FootballMatch], top_k: int) -> list[list[int]]:
+        """Indexes of at most top_k most similar indexed matches for every query match, best first."""
+        candidates: list[list[int]] = []
+        for start in range(0, len(matches), self.QUERY_CHUNK_SIZE):
+            chunk = matches[start : start + self.QUERY_CHUNK_SIZE]
+            scores = (self._vectorize(chunk) @ self._postings).tocsr()
+
+            for row in range(scores.shape[0]):
+                row_start, row_end = scores.indptr[row], scores.indptr[row + 1]
+                row_scores = scores.data[row_start:row_end]
+                row_indices = scores.indices[row_start:row_end]
+                if len(row_scores) > top_k:
+                    best = np.argpartition(-row_scores, top_k)[:top_k]
+                    row_scores, row_indices = row_scores[best], row_indices[best]
+                order = np.argsort(-row_scores, kind="stable")
+                candidates.append(row_indices[order].tolist())
+
+        return candidates
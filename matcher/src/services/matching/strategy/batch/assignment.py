@@ -0,0 +1,58 @@
+import numpy as np
+from rapidfuzz.distance import Indel
+from rapidfuzz.process import cdist
+from scipy.optimize import linear_sum_assignment
+from src.services.matching.data import AnyBatch
+from src.services.matching.strategy.batch.base import \
+    PairwiseEventMatchingStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+
+
+class AssignmentMatchingStrategy(PairwiseEventMatchingStrategy):
+    """
+    Scores every pivot x bookmaker pair at once with the same similarity as Levenshtein entity strategy (normalized
+    Indel similarity == Levenshtein.ratio) and picks one to one pairs maximizing total similarity instead of taking
+    the first candidate above the threshold.
+    """
+
+    def __init__(
+        self, threshold: float = LevenshteinDistanceEntityComparisonStrategy.THRESHOLD
+    ) -> None:
+        self._threshold = threshold
+
+    @staticmethod
+    def _similarity_matrix(
+        pivot_names: list[str], other_names: list[str]
+    ) -> np.ndarray:
+        return cdist(
+            pivot_names,
+            other_names,
+            scorer=Indel.normalized_similarity,
+            dtype=np.float32,
+            workers=-1,
+        )
+
+    def match_batches(self, pivot: AnyBatch, other: AnyBatch) -> dict[int, int]:
+        if not pivot.count or not other.count:
+            return {}
+
+        team_a_similarity = self._similarity_matrix(
+            pivot.team_a_standardized, other.team_a_standardized
+        )
+        team_b_similarity = self._similarity_matrix(
+            pivot.team_b_standardized, other.team_b_standardized
+        )
+
+        # both teams have to pass the threshold, same as in the entity strategy
+        acceptable = (team_a_similarity >= self._threshold) & (
+            team_b_similarity >= self._threshold
+        )
+        score = np.where(acceptable, team_a_similarity + team_b_similarity, 0.0)
+
+        pivot_indexes, other_indexes = linear_sum_assignment(score, maximize=True)
+        return {
+            int(pivot_index): int(other_index)
+            for pivot_index, other_index in zip(pivot_indexes, other_indexes)
+            if acceptable[pivot_index, other_index]
+        }
@@ -1,12 +1,78 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 from src.schemas.consumer_match import FootballMatch
-from src.services.matching.data import Batch
+from src.services.matching.data import AnyBatch
 
 
 class BaseEventMatchingStrategy(ABC):
     @abstractmethod
     def match_events(
-        self, bookmaker_batches: dict[str, Batch]
+        self, bookmaker_batches: dict[str, AnyBatch]
     ) -> list[list[FootballMatch]]:
         pass
+
+
+class PairwiseEventMatchingStrategy(BaseEventMatchingStrategy):
+    MINIMUM_CLUSTER_LENGTH = 3
+
+    @abstractmethod
+    def match_batches(self, pivot: AnyBatch, other: AnyBatch) -> dict[int, int]:
+        """
+        Match football events of a single bookmaker against the pivot batch. Returns mapping of pivot match index to
+        the index of the same football event in "other" batch, every "other" match is used at most once.
+        """
+        pass
+
+    @staticmethod
+    def select_pivot(bookmaker_batches: dict[str, AnyBatch]) -> str:
+        return max(bookmaker_batches, key=lambda x: bookmaker_batches[x].count)
+
+    def _cluster_rows(
+        self, pivot: AnyBatch, pairs: list[tuple[AnyBatch, dict[int, int]]]
+    ) -> np.ndarray:
+        """
+        Clusters as rows of match indexes, column 0 is the pivot batch and column i the i-th paired batch, -1 where
+        the bookmaker has no counterpart. Only clusters of at least MINIMUM_CLUSTER_LENGTH matches are returned.
+        """
+        rows = np.full((pivot.count, 1 + len(pairs)), -1, dtype=np.int64)
+        rows[:, 0] = np.arange(pivot.count)
+        for column, (_, matched_indexes) in enumerate(pairs, start=1):
+            if matched_indexes:
+                rows[list(matched_indexes), column] = list(matched_indexes.values())
+
+        cluster_sizes = (rows >= 0).sum(axis=1)
+        return rows[cluster_sizes >= self.MINIMUM_CLUSTER_LENGTH]
+
+    def build_clusters(
+        self, pivot: AnyBatch, pairs: list[tuple[AnyBatch, dict[int, int]]]
+    ) -> list[list[FootballMatch]]:
+        batches = [pivot, *(batch for batch, _ in pairs)]
+        return [
+            [
+                batches[column].matches[index]
+                for column, index in enumerate(cluster)
+                if index >= 0
+            ]
+            for cluster in self._cluster_rows(pivot, pairs).tolist()
+        ]
+
+    def match_events(
+        self, bookmaker_batches: dict[str, AnyBatch]
+    ) -> list[list[FootballMatch]]:
+        """
+        Same flow as brute force: the largest batch is the pivot and every other bookmaker batch is matched against
+        it independently, then per bookmaker matches are grouped into clusters around pivot events.
+        """
+        if not bookmaker_batches:
+            return []
+
+        pivot_bookmaker = self.select_pivot(bookmaker_batches)
+        pivot = bookmaker_batches[pivot_bookmaker]
+
+        pairs = [
+            (batch, self.match_batches(pivot, batch))
+            for bookmaker, batch in bookmaker_batches.items()
+            if bookmaker != pivot_bookmaker
+        ]
+        return self.build_clusters(pivot, pairs)
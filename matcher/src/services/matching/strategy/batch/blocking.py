@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Hashable, Sequence
+
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.data import AnyBatch
+from src.services.matching.strategy.batch.base import \
+    PairwiseEventMatchingStrategy
+from src.services.matching.strategy.entity.base import \
+    BaseEntityMatchingStrategy
+
+BlockIndex = dict[Hashable, list[int]]
+
+
+class BlockingMatchingStrategy(PairwiseEventMatchingStrategy):
+    """
+    Indexes every bookmaker batch by blocking key of the entity strategy, if it exposes one (standardized team names
+    for exact comparison), pivot events are compared only with candidates that share the key and fuzzy strategies scan
+    the whole batch. Like brute force, kickoff times are ignored by default, so with exact comparison the clusters are
+    the same. With event_time_window the index is split into kickoff time windows as well and only candidates from
+    the same or neighbouring window kicking off at most event_time_window apart are compared.
+    """
+
+    def __init__(
+        self,
+        entity_comparison_strategy: BaseEntityMatchingStrategy,
+        event_time_window: timedelta | None = None,
+    ) -> None:
+        self._entity_comparison_strategy = entity_comparison_strategy
+        self._window_seconds = (
+            int(event_time_window.total_seconds()) if event_time_window else None
+        )
+
+    def _bucket(self, event_time: int) -> int:
+        return 0 if self._window_seconds is None else event_time // self._window_seconds
+
+    def _block(self, match: FootballMatch, bucket: int) -> Hashable:
+        key = self._entity_comparison_strategy.blocking_key(match)
+        return bucket if key is None else (key, bucket)
+
+    def _build_index(
+        self, matches: list[FootballMatch], event_times: list[int]
+    ) -> BlockIndex:
+        index: BlockIndex = defaultdict(list)
+        for match_index, match in enumerate(matches):
+            bucket = self._bucket(event_times[match_index])
+            index[self._block(match, bucket)].append(match_index)
+        return index
+
+    def _find_candidate(
+        self,
+        match: FootballMatch,
+        event_time: int,
+        index: BlockIndex,
+        candidates: Sequence[FootballMatch],
+        event_times: list[int],
+        used: set[int],
+    ) -> int | None:
+        bucket = self._bucket(event_time)
+        if self._window_seconds is None:
+            block_indexes = index.get(self._block(match, bucket), [])
+        else:
+            # events close to window edge may have their counterpart in the neighbouring bucket
+            block_indexes = []
+            for neighbour in (bucket - 1, bucket, bucket + 1):
+                block_indexes.extend(index.get(self._block(match, neighbour), ()))
+
+        for candidate_index in sorted(block_indexes):
+            if candidate_index in used:
+                continue
+
+            if (
+                self._window_seconds is not None
+                and abs(event_times[candidate_index] - event_time)
+                > self._window_seconds
+            ):
+                continue
+
+            candidate = candidates[candidate_index]
+            if self._entity_comparison_strategy.match_entities(match, candidate):
+                return candidate_index
+        return None
+
+    def match_batches(self, pivot: AnyBatch, other: AnyBatch) -> dict[int, int]:
+        pivot_event_times = pivot.event_times.tolist()
+        event_times = other.event_times.tolist()
+        # columnar batches build a match object on every access, candidates are read many times
+        candidates = list(other.matches)
+        index = self._build_index(candidates, event_times)
+
+        used: set[int] = set()
+        matched_indexes: dict[int, int] = {}
+        for pivot_index, match in enumerate(pivot.matches):
+            candidate_index = self._find_candidate(
+                match,
+                pivot_event_times[pivot_index],
+                index,
+                candidates,
+                event_times,
+                used,
+            )
+            if candidate_index is not None:
+                used.add(candidate_index)
+                matched_indexes[pivot_index] = candidate_index
+
+        return matched_indexes
@@ -2,7 +2,7 @@ from itertools import combinations, product
 from typing import Generator
 
 from src.schemas.consumer_match import FootballMatch
-from src.services.matching.data import Batch
+from src.services.matching.data import AnyBatch
 from src.services.matching.strategy.batch.base import BaseEventMatchingStrategy
 
 
@@ -13,7 +13,7 @@ class BruteForceMatchingStrategy(BaseEventMatchingStrategy):
         self._entity_comparison_strategy = entity_comparison_strategy
 
     def match_events(
-        self, bookmaker_batches: dict[str, Batch]
+        self, bookmaker_batches: dict[str, AnyBatch]
     ) -> list[list[FootballMatch]]:
         """
         1. Pick the largest batch.
@@ -25,16 +25,22 @@ class BruteForceMatchingStrategy(BaseEventMatchingStrategy):
             football event outcomes) entries add it to final results.
         """
 
-        data = bookmaker_batches.copy()
+        # matched entries are removed, batches themselves may be shared read only arrays
+        data = {
+            bookmaker: list(batch.matches)
+            for bookmaker, batch in bookmaker_batches.items()
+        }
 
-        bookmaker_name_with_most_listings: str = max(data, key=lambda x: data[x].count)
-        longest_data: Batch = data.pop(bookmaker_name_with_most_listings)
+        bookmaker_name_with_most_listings: str = max(
+            bookmaker_batches, key=lambda x: bookmaker_batches[x].count
+        )
+        longest_data: list[FootballMatch] = data.pop(bookmaker_name_with_most_listings)
 
         matched_football_events_across_bookmakers: list[list[FootballMatch]] = []
-        for match in longest_data.matches:
+        for match in longest_data:
             club_cluster: list[FootballMatch] = [match]
             for bookmaker in data.keys():
-                _matches = data[bookmaker].matches
+                _matches = data[bookmaker]
                 for _match in _matches:
                     if self._entity_comparison_strategy.match_entities(match, _match):
                         club_cluster.append(_match)
@@ -0,0 +1,48 @@
+from src.services.matching.data import AnyBatch
+from src.services.matching.ngram_index import TrigramCandidateIndex
+from src.services.matching.strategy.batch.base import \
+    PairwiseEventMatchingStrategy
+from src.services.matching.strategy.entity.base import \
+    BaseEntityMatchingStrategy
+
+
+class CandidateIndexMatchingStrategy(PairwiseEventMatchingStrategy):
+    """
+    Narrows down candidates with trigram index so entity strategy (usually Levenshtein) verifies only top_k most
+    similar football events of the other bookmaker instead of the whole batch.
+    """
+
+    TOP_K = 5
+
+    def __init__(
+        self,
+        entity_comparison_strategy: BaseEntityMatchingStrategy,
+        top_k: int = TOP_K,
+    ) -> None:
+        self._entity_comparison_strategy = entity_comparison_strategy
+        self._top_k = top_k
+
+    def match_batches(self, pivot: AnyBatch, other: AnyBatch) -> dict[int, int]:
+        if not pivot.count or not other.count:
+            return {}
+
+        # columnar batches build a match object on every access, both batches are read more than once
+        pivot_matches, other_matches = list(pivot.matches), list(other.matches)
+        index = TrigramCandidateIndex(other_matches)
+        candidates = index.query(pivot_matches, self._top_k)
+
+        used: set[int] = set()
+        matched_indexes: dict[int, int] = {}
+        for pivot_index, match in enumerate(pivot_matches):
+            for candidate_index in candidates[pivot_index]:
+                if candidate_index in used:
+                    continue
+
+                if self._entity_comparison_strategy.match_entities(
+                    match, other_matches[candidate_index]
+                ):
+                    used.add(candidate_index)
+                    matched_indexes[pivot_index] = candidate_index
+                    break
+
+        return matched_indexes
@@ -0,0 +1,192 @@
+import logging
+from collections import defaultdict
+from threading import Lock
+
+import numpy as np
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.data import AnyBatch
+from src.services.matching.strategy.batch.base import (
+    BaseEventMatchingStrategy, PairwiseEventMatchingStrategy)
+
+RowKey = tuple[str, str, int]
+
+
+def _row_keys(batch: AnyBatch) -> list[RowKey]:
+    # everything matching strategies compare, rows with equal keys are matched the same way
+    return list(
+        zip(
+            batch.team_a_standardized,
+            batch.team_b_standardized,
+            batch.event_times.tolist(),
+        )
+    )
+
+
+def _map_rows(old_keys: list[RowKey], new_keys: list[RowKey]) -> dict[int, int]:
+    """Old row index -> index of the new row with the same key, repeated keys are paired in order of rows."""
+    new_rows: dict[RowKey, list[int]] = defaultdict(list)
+    for row, key in enumerate(new_keys):
+        new_rows[key].append(row)
+    for rows in new_rows.values():
+        rows.reverse()
+
+    mapping: dict[int, int] = {}
+    for row, key in enumerate(old_keys):
+        rows = new_rows.get(key)
+        if rows:
+            mapping[row] = rows.pop()
+    return mapping
+
+
+class IncrementalMatchingStrategy(BaseEventMatchingStrategy):
+    """
+    Keeps pairings of every bookmaker with the pivot batch between runs. Rows of a new batch (pivot included) are
+    mapped to the rows of the previous one with the same standardized team names and kickoff time, pairs of mapped
+    rows are kept. Only fresh rows, added ones and ones whose counterpart disappeared, are matched: fresh pivot rows
+    against every unpaired row of the other bookmaker, then fresh rows of the other bookmaker against the rest of
+    unpaired pivot rows. Unpaired rows present in both runs are not compared again, so the work is proportional to
+    the change. Pivot bookmaker change results in full recompute.
+
+    Pairs differ from full recompute only where an event has more than one possible counterpart, e.g. the same
+    fixture listed twice by a bookmaker or fuzzy names close to two fixtures: full recompute pairs them in pivot
+    order, incremental matching keeps the earlier pair.
+    """
+
+    def __init__(self, strategy: PairwiseEventMatchingStrategy) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self._strategy = strategy
+        self._lock = Lock()
+
+        self._pivot_bookmaker: str | None = None
+        self._batches: dict[str, AnyBatch] = {}
+        self._row_keys: dict[str, list[RowKey]] = {}
+        self._pairs: dict[str, dict[int, int]] = {}
+
+    def _map_batch(self, bookmaker: str, batch: AnyBatch) -> dict[int, int] | None:
+        """Previous rows of the bookmaker -> rows of its new batch, None if the batch did not change."""
+        if self._batches.get(bookmaker) is batch:
+            return None
+
+        keys = _row_keys(batch)
+        mapping = _map_rows(self._row_keys.get(bookmaker, []), keys)
+        self._row_keys[bookmaker] = keys
+        return mapping
+
+    def _match_rows(
+        self,
+        pivot: AnyBatch,
+        pivot_rows: list[int],
+        other: AnyBatch,
+        other_rows: list[int],
+    ) -> dict[int, int]:
+        if not pivot_rows or not other_rows:
+            return {}
+
+        matched_indexes = self._strategy.match_batches(
+            pivot.take(np.array(pivot_rows, dtype=np.intp)),
+            other.take(np.array(other_rows, dtype=np.intp)),
+        )
+        return {
+            pivot_rows[pivot_index]: other_rows[other_index]
+            for pivot_index, other_index in matched_indexes.items()
+        }
+
+    def _update_pairs(
+        self,
+        pivot: AnyBatch,
+        pivot_mapping: dict[int, int] | None,
+        other: AnyBatch,
+        other_mapping: dict[int, int] | None,
+        previous_pairs: dict[int, int],
+    ) -> dict[int, int]:
+        if pivot_mapping is None and other_mapping is None:
+            return previous_pairs
+
+        pairs: dict[int, int] = {}
+        fresh_pivot_rows = set(range(pivot.count))
+        fresh_other_rows = set(range(other.count))
+        stale_pivot_rows: set[int] = set()
+        stale_other_rows: set[int] = set()
+        if pivot_mapping is None:
+            pivot_mapping = {row: row for row in range(pivot.count)}
+        if other_mapping is None:
+            other_mapping = {row: row for row in range(other.count)}
+
+        # rows present in the previous run are fresh only when their previous counterpart disappeared
+        stale_pivot_rows.update(pivot_mapping.values())
+        stale_other_rows.update(other_mapping.values())
+        for previous_pivot_row, previous_other_row in previous_pairs.items():
+            pivot_row = pivot_mapping.get(previous_pivot_row)
+            other_row = other_mapping.get(previous_other_row)
+            if pivot_row is not None and other_row is not None:
+                pairs[pivot_row] = other_row
+            elif pivot_row is not None:
+                stale_pivot_rows.discard(pivot_row)
+            elif other_row is not None:
+                stale_other_rows.discard(other_row)
+
+        paired_other_rows = set(pairs.values())
+        fresh_pivot_rows -= stale_pivot_rows
+        fresh_other_rows -= stale_other_rows
+        stale_pivot_rows.difference_update(pairs)
+        stale_other_rows -= paired_other_rows
+
+        pairs.update(
+            self._match_rows(
+                pivot,
+                sorted(fresh_pivot_rows),
+                other,
+                sorted(fresh_other_rows | stale_other_rows),
+            )
+        )
+        paired_other_rows = set(pairs.values())
+        pairs.update(
+            self._match_rows(
+                pivot,
+                sorted(stale_pivot_rows),
+                other,
+                sorted(fresh_other_rows - paired_other_rows),
+            )
+        )
+        return pairs
+
+    def match_events(
+        self, bookmaker_batches: dict[str, AnyBatch]
+    ) -> list[list[FootballMatch]]:
+        if not bookmaker_batches:
+            return []
+
+        with self._lock:
+            pivot_bookmaker = self._strategy.select_pivot(bookmaker_batches)
+            pivot = bookmaker_batches[pivot_bookmaker]
+            if pivot_bookmaker != self._pivot_bookmaker:
+                self._batches, self._row_keys, self._pairs = {}, {}, {}
+
+            pivot_mapping = self._map_batch(pivot_bookmaker, pivot)
+            pairs: dict[str, dict[int, int]] = {}
+            for bookmaker, batch in bookmaker_batches.items():
+                if bookmaker == pivot_bookmaker:
+                    continue
+
+                pairs[bookmaker] = self._update_pairs(
+                    pivot,
+                    pivot_mapping,
+                    batch,
+                    self._map_batch(bookmaker, batch),
+                    self._pairs.get(bookmaker, {}),
+                )
+
+            self._pivot_bookmaker = pivot_bookmaker
+            self._batches = dict(bookmaker_batches)
+            self._row_keys = {
+                bookmaker: self._row_keys[bookmaker] for bookmaker in bookmaker_batches
+            }
+            self._pairs = pairs
+
+            return self._strategy.build_clusters(
+                pivot,
+                [
+                    (bookmaker_batches[bookmaker], pairs[bookmaker])
+                    for bookmaker in pairs
+                ],
+            )
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Hashable
 
 from src.schemas.consumer_match import FootballMatch
 
@@ -9,3 +10,10 @@ class BaseEntityMatchingStrategy(ABC):
         self, first_entity: FootballMatch, second_entity: FootballMatch
     ) -> bool:
         pass
+
+    def blocking_key(self, entity: FootballMatch) -> Hashable | None:
+        """
+        Key shared by every pair of entities this strategy could match. Strategies that can only tell entities apart
+        by comparing them (e.g. fuzzy ones) return None, meaning any entity may match any other.
+        """
+        return None
@@ -1,13 +1,29 @@
+from typing import Hashable
+
 from src.schemas.consumer_match import FootballMatch
 from src.services.matching.strategy.entity.base import \
     BaseEntityMatchingStrategy
 
 
 class ExactEntityComparisonStrategy(BaseEntityMatchingStrategy):
+    """
+    Registry ids identify standardized names one to one, so they are compared instead of the names whenever both
+    matches have them. Matches ingested before the team registry existed are compared by names.
+    """
+
     @staticmethod
+    def _has_team_ids(entity: FootballMatch) -> bool:
+        return entity.team_a_id is not None and entity.team_b_id is not None
+
     def match_entities(
-        first_entity: FootballMatch, second_entity: FootballMatch
+        self, first_entity: FootballMatch, second_entity: FootballMatch
     ) -> bool:
+        if self._has_team_ids(first_entity) and self._has_team_ids(second_entity):
+            return (
+                first_entity.team_a_id == second_entity.team_a_id
+                and first_entity.team_b_id == second_entity.team_b_id
+            )
+
         if first_entity.team_a_standardized != second_entity.team_a_standardized:
             return False
 
@@ -15,3 +31,7 @@ class ExactEntityComparisonStrategy(BaseEntityMatchingStrategy):
             return False
 
         return True
+
+    def blocking_key(self, entity: FootballMatch) -> Hashable:
+        # names for every match, equal ids imply equal names, so matches with and without ids share blocks
+        return entity.team_a_standardized, entity.team_b_standardized
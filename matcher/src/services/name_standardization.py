@@ -1,59 +1,94 @@
+import asyncio
 import json
 import logging
+from functools import lru_cache
+from pathlib import Path
 
 from database import BASE_DIR
 from src.schemas.consumer_match import FootballMatch
+from src.settings.settings import settings
 
 logging.basicConfig(
     format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
     level=logging.INFO,
 )
 
+SYNONYMS_PATH = BASE_DIR / "src" / "services" / "resources" / "club_names_synonyms.json"
+
 
 class FootballClubNameStandardizationService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        synonyms_path: Path = SYNONYMS_PATH,
+        cache_size: int = settings.STANDARDIZATION_CACHE_SIZE,
+    ) -> None:
         self._logger = logging.getLogger(self.__class__.__qualname__)
-        self._mapping = self._load_synonyms_with_casefold()
+        self._synonyms_path = synonyms_path
+        self._synonyms_mtime = self._get_synonyms_mtime()
+        self._index = self._load_synonyms_index(synonyms_path)
+        self._standardize_unknown_name = lru_cache(maxsize=cache_size)(
+            self._standardize_string
+        )
+
+    def _get_synonyms_mtime(self) -> int:
+        return self._synonyms_path.stat().st_mtime_ns
 
     @staticmethod
-    def _load_synonyms_with_casefold() -> dict[str, list[str]]:
-        path = BASE_DIR / "src" / "services" / "resources" / "club_names_synonyms.json"
+    def _load_synonyms_index(path: Path) -> dict[str, str]:
+        """Reverse index: casefolded variant -> standardized club name, first club listing the variant wins."""
         with open(path) as f:
-            synonyms = json.load(f)
+            synonyms: dict[str, list[str]] = json.load(f)
 
+        index: dict[str, str] = {}
         for standardized_club_name, variants in synonyms.items():
-            synonyms[standardized_club_name] = [
-                variant.casefold() for variant in variants
-            ]
+            for variant in variants:
+                index.setdefault(variant.casefold(), standardized_club_name)
+
+        return index
+
+    def reload(self) -> int:
+        mtime = self._get_synonyms_mtime()
+        index = self._load_synonyms_index(self._synonyms_path)
+
+        # single reference swap, messages processed concurrently see either old or new index
+        self._index = index
+        self._synonyms_mtime = mtime
+        self._standardize_unknown_name.cache_clear()
 
-        return synonyms
+        self._logger.info(f"Loaded {len(index)} club name variants.")
+        return len(index)
+
+    def reload_if_changed(self) -> bool:
+        if self._get_synonyms_mtime() == self._synonyms_mtime:
+            return False
+
+        self.reload()
+        return True
+
+    async def watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reload_if_changed()
+            except (OSError, ValueError):
+                self._logger.exception("Could not reload club names synonyms.")
 
     @staticmethod
     def _standardize_string(text: str) -> str:
         return text.strip().title()
 
-    def standardize_club_names(self, football_event: FootballMatch) -> FootballMatch:
-        standardized_club_name: str
-        variants: list[str]
-        for standardized_club_name, variants in self._mapping.items():
-            if (
-                not football_event.team_a_standardized
-                and football_event.team_a.strip().casefold() in variants
-            ):
-                football_event.team_a_standardized = standardized_club_name
-            if (
-                not football_event.team_b_standardized
-                and football_event.team_b.strip().casefold() in variants
-            ):
-                football_event.team_b_standardized = standardized_club_name
+    def _standardize_club_name(self, club_name: str) -> str:
+        standardized_club_name = self._index.get(club_name.strip().casefold())
+        return standardized_club_name or self._standardize_unknown_name(club_name)
 
+    def standardize_club_names(self, football_event: FootballMatch) -> FootballMatch:
         football_event.team_a_standardized = (
             football_event.team_a_standardized
-            or self._standardize_string(football_event.team_a)
+            or self._standardize_club_name(football_event.team_a)
         )
         football_event.team_b_standardized = (
             football_event.team_b_standardized
-            or self._standardize_string(football_event.team_b)
+            or self._standardize_club_name(football_event.team_b)
         )
 
         return football_event
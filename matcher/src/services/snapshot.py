@@ -0,0 +1,239 @@
+import logging
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from src.enums import ScrapeKind
+from src.schemas.consumer_match import FootballMatch, ScrapeManifest
+from src.services.matching.data import MISSING_FIXTURE_KEY, ColumnarBatch
+
+logging.basicConfig(
+    format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
+    level=logging.INFO,
+)
+
+
+@dataclass
+class _PendingScrape:
+    scrape_id: str
+    matches: list[FootballMatch] = field(default_factory=list)
+    manifest: ScrapeManifest | None = None
+    # removed keys travel in the last chunk only
+    removed: set[int] = field(default_factory=set)
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+def _without_fixtures(batch: ColumnarBatch, fixture_keys: np.ndarray) -> ColumnarBatch:
+    fixture_keys = fixture_keys[fixture_keys != MISSING_FIXTURE_KEY]
+    if not len(fixture_keys):
+        return batch
+    return batch.filter(~np.isin(batch.fixture_keys, fixture_keys))
+
+
+class LatestBatchSnapshot:
+    """
+    Newest complete batch of every bookmaker kept in memory by the consumer. Matches of a scrape are collected aside
+    and promoted in one reference swap once the scrape is complete, readers never see half of a scrape. A scrape is
+    complete when all of its chunks arrived or it is explicitly marked as such, when the next scrape of the same
+    bookmaker starts or when no new matches arrived for a while. Streamed scrape is complete only once its last chunk
+    arrived, it is dropped when the next scrape starts without it (scrape failed on the scraper side). Delta scrapes
+    are applied on top of the current batch of the bookmaker, which should be their base scrape.
+    """
+
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self._batches: dict[str, ColumnarBatch] = {}
+        self._pending: dict[str, _PendingScrape] = {}
+        self._received_chunks: dict[str, tuple[str, set[int], int | None]] = {}
+        self._added_chunks: dict[str, tuple[str, set[int]]] = {}
+
+    def load(self, newest_batches: dict[str, list[FootballMatch]]) -> None:
+        self._batches = {
+            bookmaker: ColumnarBatch.from_matches(matches)
+            for bookmaker, matches in newest_batches.items()
+            if matches
+        }
+        self._logger.info(f"Loaded batches of {len(self._batches)} bookmakers.")
+
+    def _promote(self, bookmaker: str, batch: ColumnarBatch) -> None:
+        self._batches = {**self._batches, bookmaker: batch}
+        self._logger.info(
+            f"Promoted {bookmaker} batch {batch.scrape_id} ({batch.count} matches)."
+        )
+
+    def _apply_delta(self, bookmaker: str, pending: _PendingScrape) -> ColumnarBatch:
+        manifest = pending.manifest
+        upserts = ColumnarBatch.from_matches(pending.matches)
+        current = self._batches.get(bookmaker)
+        current_scrape_id = current.scrape_id if current else None
+        if current_scrape_id != manifest.base_scrape_id:
+            self._logger.warning(
+                f"{bookmaker} delta {manifest.scrape_id} is based on {manifest.base_scrape_id}, snapshot has "
+                f"{current_scrape_id}. Batch is approximate until the next full scrape."
+            )
+
+        parts = [upserts]
+        if current is not None:
+            replaced = np.concatenate(
+                [upserts.fixture_keys, np.fromiter(pending.removed, dtype=np.int64)]
+            )
+            parts.insert(0, _without_fixtures(current, replaced))
+
+        return ColumnarBatch.concat(parts).relabel(
+            manifest.scrape_id,
+            manifest.scrape_start_timestamp,
+            manifest.scrape_end_timestamp,
+        )
+
+    def _promote_pending(self, bookmaker: str) -> None:
+        pending = self._pending.pop(bookmaker, None)
+        if pending is None:
+            return
+
+        if self._awaits_end_of_scrape(bookmaker, pending.scrape_id):
+            del self._received_chunks[bookmaker]
+            self._logger.warning(
+                f"Dropping streamed {bookmaker} scrape {pending.scrape_id}, its end of scrape chunk never arrived."
+            )
+            return
+
+        manifest = pending.manifest
+        if manifest is None:
+            if pending.matches:
+                self._promote(bookmaker, ColumnarBatch.from_matches(pending.matches))
+        elif manifest.kind == ScrapeKind.FULL:
+            self._promote(
+                bookmaker,
+                ColumnarBatch.from_matches(pending.matches).relabel(
+                    manifest.scrape_id,
+                    manifest.scrape_start_timestamp,
+                    manifest.scrape_end_timestamp,
+                ),
+            )
+        else:
+            self._promote(bookmaker, self._apply_delta(bookmaker, pending))
+
+    def _awaits_end_of_scrape(self, bookmaker: str, scrape_id: str) -> bool:
+        tracked_scrape_id, _, known_total = self._received_chunks.get(
+            bookmaker, ("", set(), 0)
+        )
+        return tracked_scrape_id == scrape_id and known_total is None
+
+    def _pending_scrape(self, bookmaker: str, scrape_id: str) -> _PendingScrape:
+        pending = self._pending.get(bookmaker)
+        if pending and pending.scrape_id != scrape_id:
+            self._promote_pending(bookmaker)
+            pending = None
+
+        if pending is None:
+            pending = self._pending[bookmaker] = _PendingScrape(scrape_id)
+        pending.updated_at = time.monotonic()
+        return pending
+
+    def register_manifest(self, manifest: ScrapeManifest) -> None:
+        """Has to be called before adding matches of the chunk which carried the manifest."""
+        bookmaker = manifest.source
+        current = self._batches.get(bookmaker)
+        if current and current.scrape_id == manifest.scrape_id:
+            # last chunk of already promoted scrape arrived late
+            removed = np.array(manifest.removed, dtype=np.int64)
+            if len(removed):
+                self._promote(bookmaker, _without_fixtures(current, removed))
+            return
+
+        pending = self._pending_scrape(bookmaker, manifest.scrape_id)
+        # manifest of the last chunk has final timestamps of a streamed scrape
+        if pending.manifest is None or manifest.scrape_end_timestamp is not None:
+            pending.manifest = manifest
+        pending.removed.update(manifest.removed)
+
+    def _is_added(self, bookmaker: str, scrape_id: str, chunk_index: int) -> bool:
+        # only the newest scrape of a bookmaker is tracked, like in register_chunk
+        tracked_scrape_id, added = self._added_chunks.get(bookmaker, ("", set()))
+        if tracked_scrape_id != scrape_id:
+            added = set()
+            self._added_chunks[bookmaker] = (scrape_id, added)
+        if chunk_index in added:
+            return True
+        added.add(chunk_index)
+        return False
+
+    def add_matches(
+        self, matches: list[FootballMatch], chunk_index: int | None = None
+    ) -> None:
+        """
+        Matches of a chunk (all of one scrape) are added once, whether the scrape is still pending or already promoted,
+        redelivered chunks are ignored. Matches of legacy single match messages come without chunk index.
+        """
+        if (
+            chunk_index is not None
+            and matches
+            and self._is_added(matches[0].source, matches[0].scrape_id, chunk_index)
+        ):
+            self._logger.info(
+                f"Ignoring redelivered {matches[0].source} chunk {chunk_index} of scrape {matches[0].scrape_id}."
+            )
+            return
+
+        late_matches: dict[str, list[FootballMatch]] = {}
+        for match in matches:
+            bookmaker = match.source
+            current = self._batches.get(bookmaker)
+            if current and current.scrape_id == match.scrape_id:
+                # late message of already promoted scrape
+                late_matches.setdefault(bookmaker, []).append(match)
+                continue
+
+            self._pending_scrape(bookmaker, match.scrape_id).matches.append(match)
+
+        for bookmaker, matches in late_matches.items():
+            late = ColumnarBatch.from_matches(matches)
+            current = _without_fixtures(self._batches[bookmaker], late.fixture_keys)
+            self._promote(bookmaker, ColumnarBatch.concat([current, late]))
+
+    def complete(self, bookmaker: str, scrape_id: str) -> None:
+        pending = self._pending.get(bookmaker)
+        if pending and pending.scrape_id == scrape_id:
+            self._promote_pending(bookmaker)
+
+    def register_chunk(
+        self,
+        bookmaker: str,
+        scrape_id: str,
+        chunk_index: int,
+        total_chunks: int | None,
+    ) -> bool:
+        """
+        Records that chunk of a scrape was stored, completes the scrape once every chunk arrived. Chunks of a streamed
+        scrape come without total_chunks, it is known once the last chunk arrived. Only the newest scrape of
+        a bookmaker is tracked, redelivered chunks are counted once. Returns whether the scrape is complete.
+        """
+        tracked_scrape_id, received, known_total = self._received_chunks.get(
+            bookmaker, ("", set(), None)
+        )
+        if tracked_scrape_id != scrape_id:
+            received, known_total = set(), None
+
+        received.add(chunk_index)
+        known_total = total_chunks if total_chunks is not None else known_total
+        self._received_chunks[bookmaker] = (scrape_id, received, known_total)
+        if known_total is None or len(received) < known_total:
+            return False
+
+        del self._received_chunks[bookmaker]
+        self.complete(bookmaker, scrape_id)
+        return True
+
+    def promote_idle(self, idle_seconds: float) -> None:
+        now = time.monotonic()
+        for bookmaker, pending in list(self._pending.items()):
+            # streamed scrape may pause between pages, it is dropped when the next scrape starts without its end
+            if (
+                now - pending.updated_at >= idle_seconds
+                and not self._awaits_end_of_scrape(bookmaker, pending.scrape_id)
+            ):
+                self._promote_pending(bookmaker)
+
+    def get_newest_batches(self) -> dict[str, ColumnarBatch]:
+        # promoted batches are never modified, only replaced
+        return dict(self._batches)
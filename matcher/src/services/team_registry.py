@@ -0,0 +1,47 @@
+import logging
+from typing import Iterable
+
+from src.schemas.consumer_match import FootballMatch
+
+logging.basicConfig(
+    format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
+    level=logging.INFO,
+)
+
+
+class TeamRegistry:
+    """
+    In-process copy of the teams table: standardized club name -> integer id. Ids are assigned by the database the
+    first time a name is seen and never change, so they are cached for the lifetime of the process and matches can be
+    compared and hashed by fixed-size integer keys instead of strings.
+    """
+
+    def __init__(self, teams: dict[str, int] | None = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self._ids: dict[str, int] = dict(teams or {})
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, name: str) -> int | None:
+        return self._ids.get(name)
+
+    def update(self, teams: dict[str, int]) -> None:
+        # single reference swap, readers see either old or new map
+        self._ids = {**self._ids, **teams}
+        self._logger.info(f"Registered {len(teams)} teams, {len(self._ids)} in total.")
+
+    def missing_names(self, matches: Iterable[FootballMatch]) -> set[str]:
+        ids = self._ids
+        return {
+            name
+            for match in matches
+            for name in (match.team_a_standardized, match.team_b_standardized)
+            if name not in ids
+        }
+
+    def assign(self, matches: Iterable[FootballMatch]) -> None:
+        ids = self._ids
+        for match in matches:
+            match.team_a_id = ids.get(match.team_a_standardized)
+            match.team_b_id = ids.get(match.team_b_standardized)
@@ -0,0 +1,5 @@
+from pydantic import BaseSettings
+
+
+class ArbitrageSettings(BaseSettings):
+    ARBITRAGE_TOTAL_STAKE: float = 100.0
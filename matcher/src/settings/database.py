@@ -0,0 +1,8 @@
+from pydantic import BaseSettings
+
+
+class DatabaseSettings(BaseSettings):
+    # aiosqlite backed sessions instead of synchronous ones offloaded to worker threads
+    DATABASE_ASYNC: bool = False
+    # relative to the service directory, e.g. a throwaway database of the load harness
+    DATABASE_PATH: str = "sqlite.db"
@@ -0,0 +1,16 @@
+from pydantic import BaseSettings
+from src.enums import BatchMatchingStrategyType, EntityMatchingStrategyType
+
+
+class MatchingSettings(BaseSettings):
+    MATCHING_BATCH_STRATEGY: BatchMatchingStrategyType = (
+        BatchMatchingStrategyType.BLOCKING
+    )
+    MATCHING_ENTITY_STRATEGY: EntityMatchingStrategyType = (
+        EntityMatchingStrategyType.LEVENSHTEIN
+    )
+    MATCHING_CANDIDATES_TOP_K: int = 5
+    # blocking strategy compares only events kicking off at most this far apart, no kickoff constraint by default
+    MATCHING_EVENT_TIME_WINDOW_MINUTES: int | None = None
+    # keep pairings between runs and rematch only bookmakers with new scrapes
+    MATCHING_INCREMENTAL: bool = True
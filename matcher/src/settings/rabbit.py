@@ -9,3 +9,16 @@ class RabbitMQSettings(BaseSettings):
 
     RABBIT_PUBLISHING_EXCHANGE_NAME: str = "matcher-pub"
     RABBIT_PUBLISHING_QUEUE_NAME: str = "matcher_queue"
+    # queue scrapers publish to
+    RABBIT_CONSUMING_QUEUE_NAME: str = "scraper_queue"
+
+    RABBIT_PREFETCH_COUNT: int = 1000
+    # messages are stored and acked in batches of up to INGEST_BATCH_SIZE or every INGEST_FLUSH_INTERVAL seconds
+    INGEST_BATCH_SIZE: int = 500
+    INGEST_FLUSH_INTERVAL: float = 1.0
+    # scrape without new messages for that long is considered complete
+    SNAPSHOT_PROMOTION_IDLE_SECONDS: float = 5.0
+
+    # results published per message and unconfirmed messages allowed before publishing waits for the broker
+    RABBIT_PUBLISHER_BATCH_SIZE: int = 100
+    RABBIT_PUBLISHER_MAX_IN_FLIGHT: int = 64
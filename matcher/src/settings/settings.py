@@ -1,8 +1,19 @@
+from src.settings.arbitrage import ArbitrageSettings
+from src.settings.database import DatabaseSettings
+from src.settings.matching import MatchingSettings
 from src.settings.rabbit import RabbitMQSettings
 from src.settings.scrapers import ScrapersSettings
+from src.settings.standardization import StandardizationSettings
 
 
-class Settings(RabbitMQSettings, ScrapersSettings):
+class Settings(
+    RabbitMQSettings,
+    ScrapersSettings,
+    MatchingSettings,
+    StandardizationSettings,
+    DatabaseSettings,
+    ArbitrageSettings,
+):
     pass
 
 
@@ -0,0 +1,7 @@
+from pydantic import BaseSettings
+
+
+class StandardizationSettings(BaseSettings):
+    STANDARDIZATION_CACHE_SIZE: int = 4096
+    # 0 disables watching club names synonyms file for changes
+    STANDARDIZATION_RELOAD_INTERVAL: float = 30.0
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from hashlib import sha1
+from uuid import uuid4
+
+from src.enums import Bookmaker, FootballOutcome
+from src.schemas.consumer_match import FootballMatch
+from src.services.matching.data import Batch
+
+KICKOFF = datetime(2024, 1, 6, 18, 0)
+
+
+def _team_name(number: int) -> str:
+    # random looking names, fuzzy comparison does not mistake teams of different fixtures for each other
+    return f"{sha1(str(number).encode()).hexdigest()[:10]} FC"
+
+
+def make_match(
+    source: Bookmaker,
+    fixture: int,
+    scrape_id: str | None = None,
+    kickoff_shift: timedelta = timedelta(),
+    odds: float = 2.0,
+) -> FootballMatch:
+    """Match of the fixture-th synthetic fixture, standardized names are the same across bookmakers."""
+    team_a, team_b = _team_name(2 * fixture), _team_name(2 * fixture + 1)
+    return FootballMatch(
+        event_time=KICKOFF + timedelta(hours=fixture) + kickoff_shift,
+        team_a=team_a,
+        team_b=team_b,
+        bet_options={
+            FootballOutcome.TEAM_A_WINS: odds,
+            FootballOutcome.DRAW: 3.0,
+            FootballOutcome.TEAM_B_WINS: odds,
+        },
+        scrape_id=scrape_id or str(uuid4()),
+        source=source,
+        scrape_start_timestamp=KICKOFF - timedelta(days=1),
+        scrape_end_timestamp=KICKOFF - timedelta(days=1),
+        team_a_standardized=team_a.lower(),
+        team_b_standardized=team_b.lower(),
+        fixture_key=fixture,
+    )
+
+
+def make_batch(matches: list[FootballMatch]) -> Batch:
+    return Batch(count=len(matches), matches=matches)
+
+
+def cluster_keys(clusters: list[list[FootballMatch]]) -> list[list[tuple]]:
+    # columnar batches build match objects on access, so clusters are compared by content
+    return [
+        [
+            (match.source, match.team_a, match.team_b, match.event_time)
+            for match in cluster
+        ]
+        for cluster in clusters
+    ]
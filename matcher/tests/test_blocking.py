@@ -0,0 +1,92 @@
+import random
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+from src.enums import Bookmaker
+from src.services.matching.strategy.batch.blocking import \
+    BlockingMatchingStrategy
+from src.services.matching.strategy.batch.bruteforce import \
+    BruteForceMatchingStrategy
+from src.services.matching.strategy.entity.exact import \
+    ExactEntityComparisonStrategy
+from tests.factories import cluster_keys, make_batch, make_match
+
+
+@pytest.fixture
+def batches():
+    """Bookmakers list most of 50 fixtures in their own order, kickoffs differ by up to 3 hours between them."""
+    rng = random.Random(0)
+    batches = {}
+    for source in Bookmaker:
+        scrape_id = f"{source.value}-scrape"
+        matches = [
+            make_match(
+                source,
+                fixture,
+                scrape_id,
+                kickoff_shift=timedelta(minutes=rng.randint(-180, 180)),
+            )
+            for fixture in range(50)
+            if rng.random() > 0.2
+        ]
+        rng.shuffle(matches)
+        batches[source.value] = make_batch(matches)
+    return batches
+
+
+def test_exact_clusters_equal_brute_force(batches):
+    blocking = BlockingMatchingStrategy(ExactEntityComparisonStrategy())
+    brute_force = BruteForceMatchingStrategy(ExactEntityComparisonStrategy())
+
+    clusters = blocking.match_events(batches)
+
+    assert clusters
+    assert cluster_keys(clusters) == cluster_keys(brute_force.match_events(batches))
+
+
+def test_matches_with_and_without_team_ids_share_blocks(batches):
+    # only some bookmakers' matches went through the team registry
+    for bookmaker in (Bookmaker.BETCLIC.value, Bookmaker.FORTUNA.value):
+        batch = batches[bookmaker]
+        batches[bookmaker] = make_batch(
+            [
+                replace(
+                    match,
+                    team_a_id=2 * match.fixture_key,
+                    team_b_id=2 * match.fixture_key + 1,
+                )
+                for match in batch.matches
+            ]
+        )
+    blocking = BlockingMatchingStrategy(ExactEntityComparisonStrategy())
+    brute_force = BruteForceMatchingStrategy(ExactEntityComparisonStrategy())
+
+    clusters = blocking.match_events(batches)
+
+    assert any(len(cluster) == len(Bookmaker) for cluster in clusters)
+    assert cluster_keys(clusters) == cluster_keys(brute_force.match_events(batches))
+
+
+def test_event_time_window_is_opt_in():
+    late_kickoff = timedelta(hours=3)
+    batches = {
+        source.value: make_batch(
+            [
+                make_match(
+                    source,
+                    0,
+                    kickoff_shift=late_kickoff
+                    if source == Bookmaker.FORTUNA
+                    else timedelta(),
+                )
+            ]
+        )
+        for source in Bookmaker
+    }
+    entity_strategy = ExactEntityComparisonStrategy()
+
+    assert len(BlockingMatchingStrategy(entity_strategy).match_events(batches)) == 1
+    assert not BlockingMatchingStrategy(
+        entity_strategy, event_time_window=timedelta(hours=1)
+    ).match_events(batches)
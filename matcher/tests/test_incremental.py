@@ -0,0 +1,160 @@
+from uuid import uuid4
+
+import pytest
+from src.enums import Bookmaker
+from src.services.matching.strategy.batch.blocking import \
+    BlockingMatchingStrategy
+from src.services.matching.strategy.batch.incremental import \
+    IncrementalMatchingStrategy
+from src.services.matching.strategy.entity.exact import \
+    ExactEntityComparisonStrategy
+from src.services.matching.strategy.entity.levenshtein import \
+    LevenshteinDistanceEntityComparisonStrategy
+from src.services.snapshot import LatestBatchSnapshot
+from tests.factories import cluster_keys, make_match
+
+# fixtures listed by every bookmaker, the pivot (BETCLIC) lists the most of them
+FIXTURES = {
+    Bookmaker.BETCLIC: range(0, 40),
+    Bookmaker.LVBET: range(5, 40),
+    Bookmaker.FORTUNA: range(0, 30),
+}
+
+
+def scrape(
+    snapshot: LatestBatchSnapshot,
+    source: Bookmaker,
+    fixtures: range,
+    odds: float = 2.0,
+) -> str:
+    scrape_id = str(uuid4())
+    snapshot.add_matches(
+        [make_match(source, fixture, scrape_id, odds=odds) for fixture in fixtures]
+    )
+    snapshot.complete(source, scrape_id)
+    return scrape_id
+
+
+@pytest.fixture(
+    params=[ExactEntityComparisonStrategy, LevenshteinDistanceEntityComparisonStrategy]
+)
+def strategy(request):
+    return BlockingMatchingStrategy(request.param())
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = LatestBatchSnapshot()
+    for source, fixtures in FIXTURES.items():
+        scrape(snapshot, source, fixtures)
+    return snapshot
+
+
+def assert_equals_full_recompute(
+    incremental: IncrementalMatchingStrategy,
+    strategy: BlockingMatchingStrategy,
+    snapshot: LatestBatchSnapshot,
+) -> None:
+    batches = snapshot.get_newest_batches()
+    clusters = incremental.match_events(batches)
+
+    assert cluster_keys(clusters) == cluster_keys(strategy.match_events(batches))
+    for cluster in clusters:
+        assert len({(match.team_a, match.team_b) for match in cluster}) == 1
+
+
+def test_initial_run(strategy, snapshot):
+    incremental = IncrementalMatchingStrategy(strategy)
+
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+def test_new_scrape_of_other_bookmaker(strategy, snapshot):
+    incremental = IncrementalMatchingStrategy(strategy)
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+    scrape(snapshot, Bookmaker.LVBET, range(10, 35), odds=2.5)
+
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+def test_replaced_pivot_scrape(strategy, snapshot):
+    incremental = IncrementalMatchingStrategy(strategy)
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+    scrape(snapshot, Bookmaker.BETCLIC, range(3, 45), odds=2.5)
+
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+def test_pivot_bookmaker_change(strategy, snapshot):
+    incremental = IncrementalMatchingStrategy(strategy)
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+    scrape(snapshot, Bookmaker.FORTUNA, range(0, 50))
+
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+@pytest.mark.parametrize("source", [Bookmaker.LVBET, Bookmaker.BETCLIC])
+def test_redelivered_chunk_of_promoted_scrape(strategy, snapshot, source):
+    incremental = IncrementalMatchingStrategy(strategy)
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+    batch = snapshot.get_newest_batches()[source.value]
+
+    # same scrape id and batch length, the redelivered fixture moves to the end of the batch
+    snapshot.add_matches([make_match(source, FIXTURES[source][0], batch.scrape_id)])
+
+    redelivered = snapshot.get_newest_batches()[source.value]
+    assert redelivered.scrape_id == batch.scrape_id
+    assert redelivered.count == batch.count
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+def test_late_chunk_of_promoted_scrape(strategy, snapshot):
+    incremental = IncrementalMatchingStrategy(strategy)
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+    scrape_id = snapshot.get_newest_batches()[Bookmaker.FORTUNA.value].scrape_id
+
+    snapshot.add_matches(
+        [make_match(Bookmaker.FORTUNA, fixture, scrape_id) for fixture in range(30, 35)]
+    )
+
+    assert_equals_full_recompute(incremental, strategy, snapshot)
+
+
+def test_only_changed_rows_are_rematched(snapshot):
+    calls = []
+
+    class RecordingStrategy(BlockingMatchingStrategy):
+        def match_batches(self, pivot, other):
+            calls.append((other.source, pivot.count, other.count))
+            return super().match_batches(pivot, other)
+
+    incremental = IncrementalMatchingStrategy(
+        RecordingStrategy(ExactEntityComparisonStrategy())
+    )
+    full_recompute = BlockingMatchingStrategy(ExactEntityComparisonStrategy())
+
+    def rematched() -> list[tuple[str, int, int]]:
+        calls.clear()
+        assert_equals_full_recompute(incremental, full_recompute, snapshot)
+        return list(calls)
+
+    assert rematched() == [
+        (Bookmaker.LVBET, 40, 35),
+        (Bookmaker.FORTUNA, 40, 30),
+    ]
+    assert rematched() == []
+
+    # removed fixtures only unpair pivot rows, nothing is left to pair them with
+    scrape(snapshot, Bookmaker.LVBET, range(10, 35))
+    assert rematched() == []
+
+    # added fixtures are compared with unpaired pivot rows only
+    scrape(snapshot, Bookmaker.LVBET, range(10, 45))
+    assert rematched() == [(Bookmaker.LVBET, 15, 10)]
+
+    # added pivot fixtures are compared with unpaired rows of other bookmakers only
+    scrape(snapshot, Bookmaker.BETCLIC, range(0, 45))
+    assert rematched() == [(Bookmaker.LVBET, 5, 5)]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+from dataclasses import asdict
+
+from src import rabbit
+from src.enums import Bookmaker
+from src.rabbit import RabbitMQClient
+from src.services.name_standardization import \
+    FootballClubNameStandardizationService
+from src.services.snapshot import LatestBatchSnapshot
+from tests.factories import make_match
+
+
+class Message:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.headers = {}
+        self.content_type = "application/json"
+        self.content_encoding = None
+        self.redelivered = False
+        self.settled: list[str] = []
+
+    async def ack(self, multiple: bool = False) -> None:
+        self.settled.append("ack")
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        self.settled.append("nack")
+
+    async def reject(self, requeue: bool = False) -> None:
+        self.settled.append("reject")
+
+
+class FailingSnapshot(LatestBatchSnapshot):
+    def add_matches(self, matches, chunk_index=None) -> None:
+        raise RuntimeError("snapshot failure")
+
+
+def message(fixture: int) -> Message:
+    match = asdict(make_match(Bookmaker.BETCLIC, fixture, "scrape"))
+    return Message(json.dumps(match, default=str).encode())
+
+
+def test_stored_batch_is_acked_when_snapshot_update_fails(monkeypatch):
+    stored = []
+
+    async def assign_team_ids(team_registry, matches) -> None:
+        pass
+
+    async def store_matches(matches, manifests) -> None:
+        stored.extend(matches)
+
+    monkeypatch.setattr(rabbit, "assign_team_ids", assign_team_ids)
+    client = RabbitMQClient(connection=None, channel=None)
+    monkeypatch.setattr(client, "_store_matches", store_matches)
+    messages = [message(0), message(1)]
+
+    asyncio.run(
+        client._process_rabbitmq_messages(
+            messages,
+            standardization_service=FootballClubNameStandardizationService(),
+            snapshot=FailingSnapshot(),
+            team_registry=None,
+        )
+    )
+
+    assert len(stored) == 2
+    assert messages[-1].settled == ["ack"]
+
+
+def test_message_that_cannot_be_stored_does_not_hold_back_the_batch(monkeypatch):
+    stored = []
+
+    async def assign_team_ids(team_registry, matches) -> None:
+        pass
+
+    async def store_matches(matches, manifests) -> None:
+        if any(match.fixture_key == 1 for match in matches):
+            raise RuntimeError("poison message")
+        stored.extend(match.fixture_key for match in matches)
+
+    monkeypatch.setattr(rabbit, "assign_team_ids", assign_team_ids)
+    client = RabbitMQClient(connection=None, channel=None)
+    monkeypatch.setattr(client, "_store_matches", store_matches)
+    snapshot = LatestBatchSnapshot()
+    messages = [message(0), message(1), message(2)]
+
+    def process(batch: list[Message]) -> None:
+        asyncio.run(
+            client._process_rabbitmq_messages(
+                batch,
+                standardization_service=FootballClubNameStandardizationService(),
+                snapshot=snapshot,
+                team_registry=None,
+            )
+        )
+
+    process(messages)
+    poison = messages[1]
+    poison.redelivered = True
+    process([poison, message(3)])
+
+    assert stored == [0, 2, 3]
+    assert [m.settled for m in messages] == [["ack"], ["nack", "reject"], ["ack"]]
@@ -0,0 +1,40 @@
+from dataclasses import replace
+
+from src.enums import Bookmaker
+from src.services.snapshot import LatestBatchSnapshot
+from tests.factories import make_match
+
+
+def chunk(fixtures: range) -> list:
+    # matches of legacy scrapers carry no fixture keys
+    return [
+        replace(make_match(Bookmaker.BETCLIC, fixture, "scrape"), fixture_key=None)
+        for fixture in fixtures
+    ]
+
+
+def add_chunk(snapshot: LatestBatchSnapshot, chunk_index: int, fixtures: range) -> None:
+    snapshot.add_matches(chunk(fixtures), chunk_index)
+    snapshot.register_chunk(Bookmaker.BETCLIC, "scrape", chunk_index, total_chunks=2)
+
+
+def test_redelivered_chunk_of_pending_scrape_is_added_once():
+    snapshot = LatestBatchSnapshot()
+
+    add_chunk(snapshot, 0, range(0, 10))
+    add_chunk(snapshot, 0, range(0, 10))
+    add_chunk(snapshot, 1, range(10, 15))
+
+    assert snapshot.get_newest_batches()[Bookmaker.BETCLIC].count == 15
+
+
+def test_redelivered_chunk_of_promoted_scrape_is_added_once():
+    snapshot = LatestBatchSnapshot()
+    add_chunk(snapshot, 0, range(0, 10))
+    snapshot.promote_idle(idle_seconds=0)
+    add_chunk(snapshot, 1, range(10, 15))
+
+    add_chunk(snapshot, 0, range(0, 10))
+    add_chunk(snapshot, 1, range(10, 15))
+
+    assert snapshot.get_newest_batches()[Bookmaker.BETCLIC].count == 15
@@ -0,0 +1,230 @@
+"""
+Stand-in BetClic and LvBet APIs for load tests. Both serve the same generated offer (so the matcher can match it) with
+kickoffs spread over the next days and odds of every fixture changing every odds_change_seconds, or payloads recorded
+from the real APIs. Every response takes base latency plus latency per served fixture. BetClic is paginated by
+offset/limit, LvBet serves fixtures of the requested date_from/date_to window (both inclusive).
+
+    python -m benchmarks.fake_bookmakers --port 8080 --fixtures 2000
+
+Scrapers are pointed at it through settings:
+
+    BETCLIC_API_URL=http://127.0.0.1:8080/betclic LV_BET_API_URL=http://127.0.0.1:8080/lvbet
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+
+REQUEST_TIME_FORMAT = "%Y-%m-%d %H:%M"
+SYLLABLES = ["ba", "ro", "ki", "ne", "to", "la", "mi", "sa", "do", "ve", "gu", "ra"]
+SUFFIXES = ["United", "City", "Rovers", "Athletic", "Town", "Sporting", "Dynamo"]
+
+
+@dataclass
+class FakeOfferConfig:
+    fixtures: int = 2000
+    days: int = 7
+    base_latency_seconds: float = 0.05
+    latency_per_fixture_seconds: float = 0.00002
+    odds_change_seconds: float = 60.0
+    seed: int = 0
+    # recorded responses served instead of the generated offer
+    betclic_payload: Path | None = None
+    lvbet_payload: Path | None = None
+
+
+@dataclass
+class _Fixture:
+    number: int
+    team_a: str
+    team_b: str
+    event_time: datetime
+    # spreads odds changes of fixtures in time
+    phase: float
+
+
+class FakeOffer:
+    def __init__(self, config: FakeOfferConfig) -> None:
+        self.config = config
+        rng = random.Random(config.seed)
+        names: set[str] = set()
+        while len(names) < 2 * config.fixtures:
+            word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            names.add(f"{word.title()} {rng.choice(SUFFIXES)}")
+        teams = sorted(names)
+        rng.shuffle(teams)
+
+        start = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        slots = config.days * 24 * 12
+        self.fixtures = sorted(
+            (
+                _Fixture(
+                    number=number,
+                    team_a=teams[2 * number],
+                    team_b=teams[2 * number + 1],
+                    event_time=start + timedelta(minutes=60 + 5 * rng.randrange(slots)),
+                    phase=rng.uniform(0, config.odds_change_seconds),
+                )
+                for number in range(config.fixtures)
+            ),
+            key=lambda fixture: fixture.event_time,
+        )
+
+        self._betclic_payload = self._load(config.betclic_payload)
+        self._lvbet_payload = self._load(config.lvbet_payload)
+
+    @staticmethod
+    def _load(path: Path | None) -> Any:
+        if path is None:
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _odds(self, fixture: _Fixture) -> tuple[float, float, float]:
+        version = int((time.time() + fixture.phase) / self.config.odds_change_seconds)
+        rng = random.Random(f"{self.config.seed}-{fixture.number}-{version}")
+        return (round(rng.uniform(1.2, 5), 2), round(rng.uniform(2.8, 4.5), 2), round(rng.uniform(1.2, 5), 2))
+
+    def betclic_page(self, offset: int, limit: int) -> dict:
+        if self._betclic_payload is not None:
+            return {"matches": self._betclic_payload["matches"][offset : offset + limit]}
+
+        matches = []
+        for fixture in self.fixtures[offset : offset + limit]:
+            team_a_odds, draw_odds, team_b_odds = self._odds(fixture)
+            matches.append(
+                {
+                    "id": fixture.number,
+                    "date": fixture.event_time.isoformat(),
+                    "contestants": [{"name": fixture.team_a}, {"name": fixture.team_b}],
+                    "grouped_markets": [
+                        {
+                            "markets": [
+                                {
+                                    "name": "Match Result",
+                                    "selections": [
+                                        [{"name": fixture.team_a, "odds": team_a_odds}],
+                                        [{"name": "Draw", "odds": draw_odds}],
+                                        [{"name": fixture.team_b, "odds": team_b_odds}],
+                                    ],
+                                }
+                            ]
+                        }
+                    ],
+                }
+            )
+        return {"matches": matches}
+
+    def lvbet_document(self, date_from: datetime, date_to: datetime) -> dict:
+        if self._lvbet_payload is not None:
+            return self._lvbet_payload
+
+        matches, markets = [], []
+        for fixture in self.fixtures:
+            if not date_from <= fixture.event_time <= date_to:
+                continue
+            team_a_odds, draw_odds, team_b_odds = self._odds(fixture)
+            matches.append({"match_id": fixture.number, "date": fixture.event_time.isoformat()})
+            markets.append(
+                {
+                    "match_id": fixture.number,
+                    "name": "Match Result",
+                    "selections": [
+                        {"label": fixture.team_a, "rate": {"decimal": team_a_odds}},
+                        {"label": "Draw", "rate": {"decimal": draw_odds}},
+                        {"label": fixture.team_b, "rate": {"decimal": team_b_odds}},
+                    ],
+                }
+            )
+        return {"matches": matches, "primary_column_markets": markets}
+
+
+def create_app(config: FakeOfferConfig) -> web.Application:
+    offer = FakeOffer(config)
+    requests: dict[str, int] = {"betclic": 0, "lvbet": 0}
+
+    async def respond(body: dict, fixtures: int) -> web.Response:
+        await asyncio.sleep(config.base_latency_seconds + config.latency_per_fixture_seconds * fixtures)
+        return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+
+    async def handle_betclic(request: web.Request) -> web.Response:
+        requests["betclic"] += 1
+        body = offer.betclic_page(int(request.query.get("offset", 0)), int(request.query.get("limit", 250)))
+        return await respond(body, len(body["matches"]))
+
+    async def handle_lvbet(request: web.Request) -> web.Response:
+        requests["lvbet"] += 1
+        body = offer.lvbet_document(
+            datetime.strptime(request.query["date_from"], REQUEST_TIME_FORMAT),
+            datetime.strptime(request.query["date_to"], REQUEST_TIME_FORMAT),
+        )
+        return await respond(body, len(body["matches"]))
+
+    async def handle_stats(request: web.Request) -> web.Response:
+        return web.json_response(requests)
+
+    app = web.Application()
+    app.router.add_get("/betclic", handle_betclic)
+    app.router.add_get("/lvbet", handle_lvbet)
+    app.router.add_get("/stats", handle_stats)
+    return app
+
+
+def serve(config: FakeOfferConfig, port: int = 0, port_sender=None) -> None:
+    """Serves until killed, the bound port is sent through port_sender (a pipe end) when given."""
+
+    async def run() -> None:
+        runner = web.AppRunner(create_app(config))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        bound_port = runner.addresses[0][1]
+        if port_sender is not None:
+            port_sender.send(bound_port)
+        print(f"Serving fake bookmakers on http://127.0.0.1:{bound_port}")
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def run(config: dict[str, Any], port_sender) -> None:
+    """Entry of the load harness process, the offer is configured by FakeOfferConfig fields."""
+    serve(FakeOfferConfig(**config), 0, port_sender)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", type=int, default=FakeOfferConfig.fixtures)
+    parser.add_argument("--days", type=int, default=FakeOfferConfig.days)
+    parser.add_argument("--base-latency", type=float, default=FakeOfferConfig.base_latency_seconds)
+    parser.add_argument("--latency-per-fixture", type=float, default=FakeOfferConfig.latency_per_fixture_seconds)
+    parser.add_argument("--odds-change-seconds", type=float, default=FakeOfferConfig.odds_change_seconds)
+    parser.add_argument("--betclic-payload", type=Path)
+    parser.add_argument("--lvbet-payload", type=Path)
+    args = parser.parse_args()
+
+    serve(
+        FakeOfferConfig(
+            fixtures=args.fixtures,
+            days=args.days,
+            base_latency_seconds=args.base_latency,
+            latency_per_fixture_seconds=args.latency_per_fixture,
+            odds_change_seconds=args.odds_change_seconds,
+            betclic_payload=args.betclic_payload,
+            lvbet_payload=args.lvbet_payload,
+        ),
+        args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
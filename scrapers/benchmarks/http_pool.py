@@ -0,0 +1,123 @@
+"""
+Scrape latency with a session created per job vs the application scoped pooled session. BetClic pages are served by
+a local stand-in server behind a TCP proxy which delays every new connection to emulate DNS/TCP/TLS setup round trips
+of a remote host, requests on kept-alive connections are not delayed.
+
+    python -m benchmarks.http_pool
+"""
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+from src.services.betclic import BetClicScrapingService
+from src.utils.http import create_client_session
+
+
+SCRAPES = 20
+PAGES = 5
+LIMIT = 250
+CONNECTION_SETUP_SECONDS = 0.03
+
+
+def betclic_page(offset: int, limit: int) -> dict:
+    event_time = datetime(2024, 1, 1, 12)
+    return {
+        "matches": [
+            {
+                "date": (event_time + timedelta(minutes=15 * number)).isoformat(),
+                "contestants": [{"name": f"Home {number}"}, {"name": f"Away {number}"}],
+                "grouped_markets": [
+                    {"markets": [{"selections": [[{"odds": 2.1}], [{"odds": 3.4}], [{"odds": 3.2}]]}]}
+                ],
+            }
+            for number in range(offset, offset + limit)
+        ]
+    }
+
+
+async def handle_betclic(request: web.Request) -> web.Response:
+    offset = int(request.query["offset"])
+    limit = int(request.query["limit"])
+    response = web.json_response(betclic_page(offset, limit))
+    response.enable_compression()
+    return response
+
+
+async def start_server() -> tuple[web.AppRunner, int]:
+    app = web.Application()
+    app.router.add_get("/api/pub/v4/sports/1", handle_betclic)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+async def start_latency_proxy(upstream_port: int) -> asyncio.Server:
+    async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle(client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        await asyncio.sleep(CONNECTION_SETUP_SECONDS)
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", upstream_port)
+        await asyncio.gather(
+            pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer), return_exceptions=True
+        )
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run_scrapes(url: str, shared: bool) -> list[float]:
+    session = create_client_session() if shared else None
+    latencies = []
+    try:
+        for _ in range(SCRAPES):
+            service = BetClicScrapingService(session=session)
+            service.BASE_API_URL = url
+            start = time.perf_counter()
+            matches = await service.acquire_raw_data(limit=LIMIT, pages=PAGES)
+            latencies.append(time.perf_counter() - start)
+            assert len(matches) == LIMIT * PAGES
+    finally:
+        if session is not None:
+            await session.close()
+    return latencies
+
+
+async def main() -> None:
+    runner, port = await start_server()
+    proxy = await start_latency_proxy(port)
+    proxy_port = proxy.sockets[0].getsockname()[1]
+    url = f"http://localhost:{proxy_port}/api/pub/v4/sports/1"
+
+    try:
+        for shared in (False, True):
+            latencies = await run_scrapes(url, shared)
+            print(
+                json.dumps(
+                    {
+                        "session": "shared" if shared else "per_job",
+                        "scrapes": SCRAPES,
+                        "pages": PAGES,
+                        "first_scrape_seconds": round(latencies[0], 4),
+                        "median_scrape_seconds": round(statistics.median(latencies), 4),
+                        "mean_scrape_seconds": round(statistics.mean(latencies), 4),
+                    }
+                )
+            )
+    finally:
+        proxy.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Scrapers side of the end-to-end load harness (loadtest.py in the repository root starts it in its own process). Runs
+the scheduler with jobs of all bookmakers wired the way the service does it, publishing either to RabbitMQ or to an
+in-memory stand-in of the broker which hands messages over to the matcher process through a multiprocessing queue.
+Scraped fixtures and published messages are reported once the run is stopped.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+from typing import Any, AsyncIterator
+
+from aio_pika import Message
+from starlette.datastructures import State
+
+from main import configure_jobs, create_codec
+from src.settings.settings import settings
+from src.utils.http import create_client_session
+from src.utils.rabbit import RabbitMQClient
+
+
+class StandInExchange:
+    """Confirms every message as soon as it was handed over to the transport queue."""
+
+    def __init__(self, name: str, transport: Queue) -> None:
+        self.name = name
+        self._transport = transport
+        self.published_messages = 0
+        self.published_bytes = 0
+
+    async def publish(self, message: Message, routing_key: str) -> None:
+        self._transport.put(
+            (message.body, dict(message.headers or {}), message.content_type, message.content_encoding)
+        )
+        self.published_messages += 1
+        self.published_bytes += len(message.body)
+
+
+class StandInQueue:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def bind(self, exchange: StandInExchange) -> None:
+        pass
+
+
+class StandInChannel:
+    def __init__(self, transport: Queue) -> None:
+        self._transport = transport
+        self.is_closed = False
+        self.exchanges: list[StandInExchange] = []
+
+    async def declare_exchange(self, name: str, *args: Any) -> StandInExchange:
+        exchange = StandInExchange(name, self._transport)
+        self.exchanges.append(exchange)
+        return exchange
+
+    async def declare_queue(self, name: str) -> StandInQueue:
+        return StandInQueue(name)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        yield
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+class StandInConnection:
+    is_closed = False
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+async def connect(transport: Queue | None) -> RabbitMQClient:
+    if transport is None:
+        return await RabbitMQClient.connect(
+            settings.RABBIT_HOST,
+            settings.RABBIT_PORT,
+            settings.RABBIT_LOGIN,
+            settings.RABBIT_PASSWORD,
+            settings.RABBIT_PUBLISHING_MODE,
+            settings.RABBIT_CHUNK_SIZE,
+            settings.RABBIT_MAX_IN_FLIGHT,
+            create_codec(),
+        )
+
+    return RabbitMQClient(
+        StandInConnection(),
+        StandInChannel(transport),
+        settings.RABBIT_PUBLISHING_MODE,
+        settings.RABBIT_CHUNK_SIZE,
+        settings.RABBIT_MAX_IN_FLIGHT,
+        create_codec(),
+    )
+
+
+async def run_scrapers(transport: Queue | None, stop_event: Event) -> dict:
+    state = State()
+    state.http_session = create_client_session()
+    state.mq = await connect(transport)
+    await configure_jobs(state)
+
+    started = time.monotonic()
+    state.scheduler.start()
+    try:
+        await asyncio.to_thread(stop_event.wait)
+    finally:
+        await state.scheduler.stop()
+        await state.http_session.close()
+        await state.mq.disconnect()
+    seconds = time.monotonic() - started
+
+    jobs = [asdict(job) for job in state.scheduler.get_state()]
+    scraped = sum(job["scraped_matches"] for job in jobs)
+    result: dict[str, Any] = {
+        "seconds": round(seconds, 3),
+        "scraped_fixtures": scraped,
+        "scraped_fixtures_per_second": round(scraped / seconds, 1),
+        "jobs": jobs,
+    }
+    if isinstance(state.mq.channel, StandInChannel):
+        exchange = state.mq.channel.exchanges[0]
+        result["published_messages"] = exchange.published_messages
+        result["published_bytes"] = exchange.published_bytes
+    return result
+
+
+def run(transport: Queue | None, stop_event: Event, result_sender) -> None:
+    result_sender.send(asyncio.run(run_scrapers(transport, stop_event)))
@@ -0,0 +1,115 @@
+"""
+Completeness and duration of BetClic scrapes against a stand-in API which only serves OFFER_SIZE matches, answers 429
+when more than CAPACITY requests are in flight, fails SERVER_ERROR_RATE of requests with 503 and slows down with load.
+Fixed pagination (the previous behaviour: BETCLIC_PAGES pages requested at once, failed pages skipped) is compared with
+adaptive pagination, AIMD concurrency limit and retries, for an offer smaller and larger than the fixed page count.
+
+    python -m benchmarks.pagination
+"""
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+
+from aiohttp import web
+
+from benchmarks.streaming import betclic_page
+from src.services.betclic import BetClicScrapingService
+from src.utils.http import create_client_session
+from src.utils.pagination import AIMDLimiter
+
+
+PAGE_SIZE = 250
+FIXED_PAGES = 5
+OFFER_SIZES = [600, 4000]
+CAPACITY = 4
+SERVER_ERROR_RATE = 0.05
+BASE_LATENCY = 0.02
+
+
+def serve(port_sender) -> None:
+    in_flight = 0
+    rng = random.Random(0)
+
+    async def handle(request: web.Request) -> web.Response:
+        nonlocal in_flight
+        if in_flight >= CAPACITY:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        in_flight += 1
+        try:
+            await asyncio.sleep(BASE_LATENCY * in_flight)
+            if rng.random() < SERVER_ERROR_RATE:
+                return web.Response(status=503)
+            body = betclic_page(
+                int(request.query["offset"]), int(request.query["limit"]), int(request.match_info["offer_size"])
+            )
+            return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+        finally:
+            in_flight -= 1
+
+    async def run() -> None:
+        app = web.Application()
+        app.router.add_get("/betclic/{offer_size}", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_sender.send(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def fixed_pagination(session, url: str) -> int:
+    async def fetch(offset: int) -> list:
+        async with session.get(url, params={"offset": offset, "limit": PAGE_SIZE}) as response:
+            if response.status != 200:
+                return []
+            return (await response.json())["matches"]
+
+    pages = await asyncio.gather(*(fetch(page * PAGE_SIZE) for page in range(FIXED_PAGES)))
+    return sum(len(page) for page in pages)
+
+
+async def adaptive_pagination(session, url: str, limiter: AIMDLimiter) -> int:
+    service = BetClicScrapingService(session=session, limiter=limiter)
+    service.BASE_API_URL = url
+    return len(await service.acquire_raw_data(limit=PAGE_SIZE))
+
+
+async def main(port: int) -> None:
+    session = create_client_session()
+    limiter = AIMDLimiter(initial_limit=2, max_limit=16)
+    try:
+        for offer_size in OFFER_SIZES:
+            url = f"http://127.0.0.1:{port}/betclic/{offer_size}"
+            for mode in ("fixed", "adaptive"):
+                start = time.perf_counter()
+                if mode == "fixed":
+                    matches = await fixed_pagination(session, url)
+                else:
+                    matches = await adaptive_pagination(session, url, limiter)
+                print(
+                    json.dumps(
+                        {
+                            "offer_size": offer_size,
+                            "pagination": mode,
+                            "matches": matches,
+                            "seconds": round(time.perf_counter() - start, 3),
+                            "concurrency_limit": limiter.limit if mode == "adaptive" else FIXED_PAGES,
+                        }
+                    )
+                )
+    finally:
+        await session.close()
+
+
+if __name__ == "__main__":
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(sender,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(main(receiver.recv()))
+    finally:
+        server.terminate()
@@ -0,0 +1,133 @@
+"""
+Duration of LvBet scrapes of the whole timeframe requested at once vs in concurrent per-day (and shorter) shards, and of
+the near-term scrape. The stand-in API serves fixtures of the requested timeframe only, both bounds inclusive, so
+fixtures kicking off at shard boundaries are returned by two shards, and takes time proportional to the number of
+fixtures it serves, the way a large single request is slow to be built by the API. Every mode has to return the same
+fixtures.
+
+    python -m benchmarks.sharding
+"""
+import asyncio
+import json
+import multiprocessing
+import time
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+from benchmarks.streaming import LVBET_MARKETS
+from src.services.lvbet import LV_BET_DAYS_TO_SCRAPE, REQUEST_TIME_FORMAT, LvBetScrapingService
+from src.utils.http import create_client_session
+
+
+# one fixture every 10 minutes, on the hour ones fall on shard boundaries
+FIXTURE_SPACING_MINUTES = 10
+SERVER_SECONDS_PER_FIXTURE = 0.0002
+SHARD_HOURS = [(LV_BET_DAYS_TO_SCRAPE + 1) * 24, 24, 6]
+NEAR_TERM_HOURS = 6
+
+
+def fixtures() -> list[dict]:
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    count = (LV_BET_DAYS_TO_SCRAPE + 1) * 24 * 60 // FIXTURE_SPACING_MINUTES
+    return [
+        {
+            "match_id": number,
+            "date": (start + timedelta(minutes=FIXTURE_SPACING_MINUTES * number)).isoformat(),
+            "league": {"name": "League", "country": "Country"},
+            "participants": {"home": f"Home {number}", "away": f"Away {number}"},
+        }
+        for number in range(count)
+    ]
+
+
+def serve(port_sender) -> None:
+    matches = fixtures()
+
+    async def handle(request: web.Request) -> web.Response:
+        date_from = datetime.strptime(request.query["date_from"], REQUEST_TIME_FORMAT)
+        date_to = datetime.strptime(request.query["date_to"], REQUEST_TIME_FORMAT)
+        served = [match for match in matches if date_from <= datetime.fromisoformat(match["date"]) <= date_to]
+        await asyncio.sleep(SERVER_SECONDS_PER_FIXTURE * len(served))
+        body = {
+            "matches": served,
+            "primary_column_markets": [
+                {
+                    "match_id": match["match_id"],
+                    "name": market,
+                    "selections": [
+                        {"label": f"Home {match['match_id']}", "rate": {"decimal": 2.1}},
+                        {"label": "Draw", "rate": {"decimal": 3.4}},
+                        {"label": f"Away {match['match_id']}", "rate": {"decimal": 3.2}},
+                    ],
+                }
+                for match in served
+                for market in LVBET_MARKETS
+            ],
+        }
+        return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+
+    async def run() -> None:
+        app = web.Application()
+        app.router.add_get("/lvbet", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_sender.send(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def measure(service: LvBetScrapingService) -> dict:
+    start = time.perf_counter()
+    matches = await service.scrape()
+    seconds = time.perf_counter() - start
+    keys = {(match.team_a, match.event_time) for match in matches}
+    return {
+        "requests": len(service._get_request_shards()),
+        "matches": len(matches),
+        "duplicates": len(matches) - len(keys),
+        "seconds": round(seconds, 3),
+    }
+
+
+async def main(port: int) -> None:
+    session = create_client_session()
+    url = f"http://127.0.0.1:{port}/lvbet"
+
+    def service(**kwargs) -> LvBetScrapingService:
+        lvbet = LvBetScrapingService(session=session, shard_concurrency=16, **kwargs)
+        lvbet.BASE_API_URL = url
+        return lvbet
+
+    try:
+        # warm up connections and lazy imports outside of measurements
+        await service(near_term_hours=1).scrape()
+        for streaming in (False, True):
+            for shard_hours in SHARD_HOURS:
+                result = await measure(service(streaming=streaming, shard_hours=shard_hours))
+                print(
+                    json.dumps(
+                        {"parsing": "streaming" if streaming else "document", "shard_hours": shard_hours, **result}
+                    )
+                )
+            result = await measure(service(streaming=streaming, near_term_hours=NEAR_TERM_HOURS))
+            print(
+                json.dumps(
+                    {"parsing": "streaming" if streaming else "document", "near_term_hours": NEAR_TERM_HOURS, **result}
+                )
+            )
+    finally:
+        await session.close()
+
+
+if __name__ == "__main__":
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(sender,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(main(receiver.recv()))
+    finally:
+        server.terminate()
@@ -0,0 +1,176 @@
+"""
+Peak memory of a scrape parsed from the whole response document vs incrementally from the response stream. Stand-in
+BetClic and LvBet APIs run in a separate process, so tracemalloc sees allocations of the scraping side only. Retained
+bytes are the returned DTOs, the rest of the peak is transient parsing overhead. Every LvBet array is read by its own
+incremental parser, so its streaming scrape spends more CPU time in exchange for the lower peak.
+
+    python -m benchmarks.streaming
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable
+
+from aiohttp import web
+
+
+# read by settings on import
+os.environ.setdefault("BETCLIC_API_LIMIT", "1000")
+
+from src.services.base import BaseScrapingService
+from src.services.betclic import BetClicScrapingService
+from src.services.lvbet import LV_BET_DAYS_TO_SCRAPE, LvBetScrapingService
+from src.utils.http import create_client_session
+
+
+BETCLIC_MATCHES = 5000
+LVBET_MATCHES = 5000
+LVBET_MARKETS = ["Match Result", "Double Chance", "Both Teams To Score", "Total Goals"]
+
+
+def betclic_page(offset: int, limit: int, total: int | None = None) -> dict:
+    event_time = datetime(2024, 1, 1, 12)
+    return {
+        "matches": [
+            {
+                "id": number,
+                "date": (event_time + timedelta(minutes=15 * number)).isoformat(),
+                "contestants": [
+                    {"name": f"Home {number}", "short_name": f"H{number}"},
+                    {"name": f"Away {number}", "short_name": f"A{number}"},
+                ],
+                "competition": {"name": "League", "country": "Country"},
+                "grouped_markets": [
+                    {
+                        "markets": [
+                            {
+                                "name": "Match Result",
+                                "selections": [
+                                    [{"name": f"Home {number}", "odds": 2.1}],
+                                    [{"name": "Draw", "odds": 3.4}],
+                                    [{"name": f"Away {number}", "odds": 3.2}],
+                                ],
+                            }
+                        ]
+                    }
+                ],
+            }
+            for number in range(offset, min(offset + limit, total or offset + limit))
+        ]
+    }
+
+
+def lvbet_document(matches: int) -> dict:
+    event_time = datetime(2024, 1, 1, 12)
+    return {
+        "matches": [
+            {
+                "match_id": number,
+                "date": (event_time + timedelta(minutes=15 * number)).isoformat(),
+                "league": {"name": "League", "country": "Country"},
+                "participants": {"home": f"Home {number}", "away": f"Away {number}"},
+            }
+            for number in range(matches)
+        ],
+        "primary_column_markets": [
+            {
+                "match_id": number,
+                "name": market,
+                "selections": [
+                    {"label": f"Home {number}", "rate": {"decimal": 2.1}},
+                    {"label": "Draw", "rate": {"decimal": 3.4}},
+                    {"label": f"Away {number}", "rate": {"decimal": 3.2}},
+                ],
+            }
+            for number in range(matches)
+            for market in LVBET_MARKETS
+        ],
+    }
+
+
+def serve(port_sender) -> None:
+    lvbet_body = json.dumps(lvbet_document(LVBET_MATCHES)).encode()
+
+    async def handle_betclic(request: web.Request) -> web.Response:
+        body = json.dumps(betclic_page(int(request.query["offset"]), int(request.query["limit"]), BETCLIC_MATCHES))
+        return web.Response(body=body.encode(), content_type="application/json")
+
+    async def handle_lvbet(request: web.Request) -> web.Response:
+        return web.Response(body=lvbet_body, content_type="application/json")
+
+    async def run() -> None:
+        app = web.Application()
+        app.router.add_get("/betclic", handle_betclic)
+        app.router.add_get("/lvbet", handle_lvbet)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_sender.send(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def measure(service_factory: Callable[[], BaseScrapingService]) -> dict:
+    # tracing slows Python code down several times, duration is measured by a separate untraced scrape
+    start = time.perf_counter()
+    await service_factory().scrape()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    matches = await service_factory().scrape()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "matches": len(matches),
+        "seconds": round(seconds, 3),
+        "peak_mib": round(peak_bytes / 2**20, 1),
+        "retained_mib": round(retained_bytes / 2**20, 1),
+    }
+
+
+async def main(port: int) -> None:
+    session = create_client_session()
+    try:
+        # warm up connections and lazy imports outside of measurements
+        for streaming in (False, True):
+            await _betclic(session, port, streaming).scrape()
+            await _lvbet(session, port, streaming).scrape()
+
+        for bookmaker, service_factory in (("BETCLIC", _betclic), ("LVBET", _lvbet)):
+            for streaming in (False, True):
+                result = await measure(partial(service_factory, session, port, streaming))
+                print(
+                    json.dumps({"bookmaker": bookmaker, "parsing": "streaming" if streaming else "document", **result})
+                )
+    finally:
+        await session.close()
+
+
+def _betclic(session, port: int, streaming: bool) -> BetClicScrapingService:
+    service = BetClicScrapingService(session=session, streaming=streaming)
+    service.BASE_API_URL = f"http://127.0.0.1:{port}/betclic"
+    return service
+
+
+def _lvbet(session, port: int, streaming: bool) -> LvBetScrapingService:
+    # the stand-in API ignores the timeframe, the whole document is served to a single request
+    service = LvBetScrapingService(session=session, streaming=streaming, shard_hours=(LV_BET_DAYS_TO_SCRAPE + 1) * 24)
+    service.BASE_API_URL = f"http://127.0.0.1:{port}/lvbet"
+    return service
+
+
+if __name__ == "__main__":
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(sender,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(main(receiver.recv()))
+    finally:
+        server.terminate()
@@ -0,0 +1,105 @@
+"""
+Per fixture cost of turning raw bookmaker datapoints into models: pydantic validation with a formatted traceback per
+malformed datapoint (previous behaviour), pydantic validation with errors counted by category (strict mode) and plain
+typed extraction with models constructed without validation (fast mode). Payloads mimic BetClic and LvBet API
+responses, a share of datapoints is corrupted the way real payloads break: missing sections, unparsable kickoff
+times and missing or non-positive odds.
+
+    python -m benchmarks.validation
+"""
+import json
+import random
+import time
+import traceback
+from typing import Any, Callable
+
+from benchmarks.streaming import betclic_page, lvbet_document
+from src.services.base import DATAPOINT_ERRORS, BaseScrapingService
+from src.services.betclic import BetClicScrapingService
+from src.services.lvbet import LvBetScrapingService
+
+
+FIXTURES = 5000
+REPEATS = 5
+MALFORMED_SHARES = [0.0, 0.3]
+
+
+def corrupt_betclic(match: dict[str, Any], rng: random.Random) -> None:
+    damage = rng.randrange(4)
+    if damage == 0:
+        del match["contestants"][1]
+    elif damage == 1:
+        match["date"] = "soon"
+    elif damage == 2:
+        match["grouped_markets"][0]["markets"][0]["selections"][1][0]["odds"] = -1.0
+    else:
+        match["grouped_markets"] = []
+
+
+def corrupt_lvbet(market: dict[str, Any], rng: random.Random) -> None:
+    damage = rng.randrange(4)
+    if damage == 0:
+        del market["selections"][2]
+    elif damage == 1:
+        market["event_time"] = None
+    elif damage == 2:
+        market["selections"][0]["rate"]["decimal"] = "N/A"
+    else:
+        del market["event_time"]
+
+
+def datapoints(bookmaker: str, malformed_share: float) -> list[dict[str, Any]]:
+    rng = random.Random(0)
+    if bookmaker == "BETCLIC":
+        raw_datapoints, corrupt = betclic_page(0, FIXTURES)["matches"], corrupt_betclic
+    else:
+        service = LvBetScrapingService()
+        raw_datapoints = service.preprocess_raw_data([lvbet_document(FIXTURES)])
+        corrupt = corrupt_lvbet
+
+    for raw_datapoint in raw_datapoints:
+        if rng.random() < malformed_share:
+            corrupt(raw_datapoint, rng)
+    return raw_datapoints
+
+
+def serialize_with_tracebacks(service: BaseScrapingService, raw_datapoints: list) -> list:
+    serialized, exceptions = [], []
+    for raw_datapoint in raw_datapoints:
+        try:
+            serialized.append(service.serialize_datapoint(raw_datapoint))
+        except DATAPOINT_ERRORS:
+            exceptions.append(traceback.format_exc())
+    return serialized
+
+
+def measure(serialize: Callable[[list], list], raw_datapoints: list) -> dict:
+    # warm up
+    serialize(raw_datapoints)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        parsed = serialize(raw_datapoints)
+        best = min(best, time.perf_counter() - start)
+    return {"parsed": len(parsed), "us_per_fixture": round(best / len(raw_datapoints) * 1e6, 2)}
+
+
+def main() -> None:
+    services = {"BETCLIC": BetClicScrapingService, "LVBET": LvBetScrapingService}
+    for bookmaker, service_class in services.items():
+        strict = service_class(strict_validation=True)
+        fast = service_class(strict_validation=False)
+        modes = {
+            "strict_tracebacks": lambda data: serialize_with_tracebacks(strict, data),
+            "strict": strict._serialize_data,
+            "fast": fast._serialize_data,
+        }
+        for malformed_share in MALFORMED_SHARES:
+            raw_datapoints = datapoints(bookmaker, malformed_share)
+            for mode, serialize in modes.items():
+                result = measure(serialize, raw_datapoints)
+                print(json.dumps({"bookmaker": bookmaker, "malformed_share": malformed_share, "mode": mode, **result}))
+
+
+if __name__ == "__main__":
+    main()
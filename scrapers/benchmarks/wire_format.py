@@ -0,0 +1,130 @@
+"""
+Encode/decode throughput and bytes on the wire of chunk bodies in every supported wire format, compared with stdlib
+JSON encoder used previously. Decoding mirrors what the matcher consumer does: body to dicts with datetimes parsed.
+
+    python -m benchmarks.wire_format
+"""
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import msgpack
+import orjson
+import zstandard
+
+from src.enums import Bookmaker, FootballOutcome, WireFormat
+from src.schemas.base import FootballMatchDataDTO
+from src.utils.codecs import NAIVE_DATETIME_EXT_TYPE, MessageCodec
+from src.utils.utils import FootballMatchDTOJSONEncoder
+
+
+CHUNK_SIZE = 100
+CHUNKS = 50
+DATETIME_KEYS = ("event_time", "scrape_start_timestamp", "scrape_end_timestamp")
+
+
+def generate_chunks(seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    scrape_id = uuid.uuid4()
+    start = datetime.utcnow()
+    chunks = []
+    for chunk_index in range(CHUNKS):
+        matches = [
+            FootballMatchDataDTO(
+                event_time=start + timedelta(minutes=rng.randrange(60 * 24 * 7)),
+                team_a=f"Team {rng.randrange(10_000)} F.C.",
+                team_b=f"Team {rng.randrange(10_000)}",
+                bet_options={outcome: round(rng.uniform(1.01, 10.0), 2) for outcome in FootballOutcome},
+                scrape_id=scrape_id,
+                source=Bookmaker.BETCLIC,
+                scrape_start_timestamp=start,
+                scrape_end_timestamp=start + timedelta(seconds=5),
+            )
+            for _ in range(CHUNK_SIZE)
+        ]
+        chunks.append(
+            {
+                "scrape_id": str(scrape_id),
+                "source": Bookmaker.BETCLIC.value,
+                "chunk_index": chunk_index,
+                "total_chunks": CHUNKS,
+                "matches": matches,
+            }
+        )
+    return chunks
+
+
+def parse_datetimes(payload: dict[str, Any]) -> dict[str, Any]:
+    for match in payload["matches"]:
+        for key in DATETIME_KEYS:
+            if isinstance(match[key], str):
+                match[key] = datetime.fromisoformat(match[key])
+    return payload
+
+
+def msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == NAIVE_DATETIME_EXT_TYPE:
+        return msgpack.Timestamp.from_bytes(data).to_datetime().replace(tzinfo=None)
+    return msgpack.ExtType(code, data)
+
+
+def build_cases() -> dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    decompressor = zstandard.ZstdDecompressor()
+
+    def loads_msgpack(body: bytes) -> Any:
+        return msgpack.unpackb(body, timestamp=3, ext_hook=msgpack_ext_hook)
+
+    cases = {
+        "stdlib-json": (
+            lambda payload: json.dumps(payload, cls=FootballMatchDTOJSONEncoder).encode(),
+            lambda body: parse_datetimes(json.loads(body.decode("utf-8"))),
+        )
+    }
+    loads = {WireFormat.JSON: orjson.loads, WireFormat.MSGPACK: loads_msgpack}
+    for wire_format in WireFormat:
+        for compression in (False, True):
+            codec = MessageCodec(wire_format, compression, compression_min_size=0)
+            decode = loads[wire_format]
+            name = wire_format.value.split("/")[1] + ("+zstd" if compression else "")
+            if compression:
+                cases[name] = (
+                    lambda payload, codec=codec: codec.encode_compressed(payload)[0],
+                    lambda body, decode=decode: parse_datetimes(decode(decompressor.decompress(body))),
+                )
+            else:
+                cases[name] = (codec.encode, lambda body, decode=decode: parse_datetimes(decode(body)))
+    return cases
+
+
+def main() -> None:
+    chunks = generate_chunks()
+    matches_count = CHUNKS * CHUNK_SIZE
+
+    for name, (encode, decode) in build_cases().items():
+        start = time.perf_counter()
+        bodies = [encode(chunk) for chunk in chunks]
+        encode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for body in bodies:
+            decode(body)
+        decode_seconds = time.perf_counter() - start
+
+        print(
+            json.dumps(
+                {
+                    "codec": name,
+                    "matches": matches_count,
+                    "bytes_per_match": round(sum(map(len, bodies)) / matches_count, 1),
+                    "encode_matches_per_second": round(matches_count / encode_seconds),
+                    "decode_matches_per_second": round(matches_count / decode_seconds),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,17 @@
 from aio_pika import ExchangeType
 from fastapi import FastAPI
+from starlette.datastructures import State
+
+from src.enums import PublishingMode
+from src.jobs import build_jobs
 from src.routes import router
 from src.settings.settings import settings
+from src.utils.codecs import MessageCodec
+from src.utils.delta import OddsDeltaTracker
+from src.utils.http import create_client_session
 from src.utils.rabbit import RabbitMQClient
+from src.utils.scheduler import AdaptiveInterval, ScrapeScheduler
+
 
 EXCHANGE_NAME = settings.RABBIT_PUBLISHING_EXCHANGE_NAME
 QUEUE_NAME = settings.RABBIT_PUBLISHING_QUEUE_NAME
@@ -13,23 +22,70 @@ app.include_router(router=router)
 
 @app.on_event("startup")
 async def startup_event() -> None:
+    app.state.http_session = create_client_session()
+
     app.state.mq = await RabbitMQClient.connect(
         settings.RABBIT_HOST,
         settings.RABBIT_PORT,
         settings.RABBIT_LOGIN,
         settings.RABBIT_PASSWORD,
+        settings.RABBIT_PUBLISHING_MODE,
+        settings.RABBIT_CHUNK_SIZE,
+        settings.RABBIT_MAX_IN_FLIGHT,
+        create_codec(),
     )
+    await configure_jobs(app.state)
+    if settings.SCHEDULER_ENABLED:
+        app.state.scheduler.start()
+
 
-    exchange = await app.state.mq.channel.declare_exchange(
-        EXCHANGE_NAME, ExchangeType.FANOUT
+def create_codec() -> MessageCodec:
+    return MessageCodec(
+        settings.RABBIT_WIRE_FORMAT,
+        settings.RABBIT_COMPRESSION,
+        settings.RABBIT_COMPRESSION_LEVEL,
+        settings.RABBIT_COMPRESSION_MIN_SIZE,
     )
-    queue = await app.state.mq.channel.declare_queue(QUEUE_NAME)
+
+
+async def configure_jobs(state: State) -> None:
+    """Declares exchange and queue on the connected broker client (state.mq) and sets up the scheduler."""
+    exchange = await state.mq.channel.declare_exchange(EXCHANGE_NAME, ExchangeType.FANOUT)
+    queue = await state.mq.channel.declare_queue(QUEUE_NAME)
     await queue.bind(exchange=exchange)
 
-    app.state.exchange = exchange
-    app.state.sub_queue = queue
+    state.exchange = exchange
+    state.sub_queue = queue
+
+    # deltas travel in chunk envelopes, transaction mode always publishes whole scrapes
+    state.delta_tracker = (
+        OddsDeltaTracker(settings.RABBIT_FULL_SNAPSHOT_EVERY)
+        if settings.RABBIT_DELTA_PUBLISHING and state.mq.publishing_mode == PublishingMode.CHUNKED
+        else None
+    )
+
+    state.scheduler = ScrapeScheduler(
+        build_jobs(state),
+        interval_factory,
+        settings.SCHEDULER_ALIGNMENT_SECONDS,
+        settings.SCHEDULER_RUN_TIMEOUT_SECONDS,
+    )
+
+
+def interval_factory(name: str) -> AdaptiveInterval:
+    return AdaptiveInterval(
+        base_seconds=settings.SCHEDULER_BASE_INTERVALS.get(name, settings.SCHEDULER_BASE_INTERVAL_SECONDS),
+        min_seconds=settings.SCHEDULER_MIN_INTERVAL_SECONDS,
+        max_seconds=settings.SCHEDULER_MAX_INTERVAL_SECONDS,
+        near_kickoff_seconds=settings.SCHEDULER_NEAR_KICKOFF_SECONDS,
+        kickoff_weight=settings.SCHEDULER_KICKOFF_WEIGHT,
+        volatility_weight=settings.SCHEDULER_VOLATILITY_WEIGHT,
+        volatility_smoothing=settings.SCHEDULER_VOLATILITY_SMOOTHING,
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
+    await app.state.scheduler.stop()
+    await app.state.http_session.close()
     await app.state.mq.disconnect()
@@ -11,3 +11,26 @@ class FootballOutcome(str, Enum):
     TEAM_A_WINS = "TEAM_A_WINS"
     DRAW = "DRAW"
     TEAM_B_WINS = "TEAM_B_WINS"
+
+
+class PublishingMode(str, Enum):
+    TRANSACTION = "TRANSACTION"
+    CHUNKED = "CHUNKED"
+
+
+class WireFormat(str, Enum):
+    JSON = "application/json"
+    MSGPACK = "application/msgpack"
+
+
+class ScrapeKind(str, Enum):
+    FULL = "full"
+    DELTA = "delta"
+
+
+class ValidationErrorCategory(str, Enum):
+    MISSING_FIELD = "missing_field"
+    INVALID_EVENT_TIME = "invalid_event_time"
+    INVALID_TEAM = "invalid_team"
+    INVALID_ODDS = "invalid_odds"
+    OTHER = "other"
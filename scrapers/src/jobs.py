@@ -0,0 +1,158 @@
+import logging
+import random
+from typing import AsyncIterator
+
+from starlette.datastructures import State
+
+from src.enums import Bookmaker, PublishingMode
+from src.schemas.base import FootballMatchDataDTO
+from src.services.betclic import BetClicScrapingService, create_limiter
+from src.services.lvbet import LvBetScrapingService
+from src.settings.settings import settings
+from src.utils.delta import OddsDeltaTracker
+from src.utils.scheduler import OddsObserver, ScrapeJob
+
+
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
+
+LVBET_NEAR_TERM_JOB = "LVBET_NEAR_TERM"
+
+
+async def publish_scrape(
+    state: State,
+    matches: AsyncIterator[FootballMatchDataDTO],
+    routing_key: str,
+    scrape_id: str,
+    bookmaker: Bookmaker,
+    partial: bool = False,
+) -> None:
+    """Partial scrapes (a part of the offer only) are published as deltas, so they need the delta tracker."""
+    delta_tracker = state.delta_tracker
+    if delta_tracker is None:
+        if partial:
+            raise ValueError("Partial scrapes can only be published as deltas.")
+        await _publish(state, matches, routing_key, scrape_id, bookmaker, None, False)
+        return
+
+    # scrapes of the same bookmaker overlapping in time are published one after another, deltas are chained
+    async with delta_tracker.lock(bookmaker):
+        await _publish(state, matches, routing_key, scrape_id, bookmaker, delta_tracker, partial)
+
+
+async def _publish(
+    state: State,
+    matches: AsyncIterator[FootballMatchDataDTO],
+    routing_key: str,
+    scrape_id: str,
+    bookmaker: Bookmaker,
+    delta_tracker: OddsDeltaTracker | None,
+    partial: bool,
+) -> None:
+    queue = state.mq
+    exchange = state.exchange
+
+    if settings.RABBIT_STREAM_PUBLISHING and queue.publishing_mode == PublishingMode.CHUNKED:
+        delta_builder = (
+            delta_tracker.start(bookmaker, scrape_id, collect_upserts=False, partial=partial)
+            if delta_tracker
+            else None
+        )
+        delta = await queue.send_stream(
+            matches,
+            exchange=exchange,
+            routing_key=routing_key,
+            scrape_id=scrape_id,
+            bookmaker=bookmaker,
+            delta_builder=delta_builder,
+        )
+    else:
+        scraped_data = [match async for match in matches]
+        delta = None
+        if delta_tracker is not None:
+            delta = delta_tracker.compute(bookmaker, scrape_id, scraped_data, partial=partial)
+            scraped_data = delta.upserts
+
+        await queue.send_messages(
+            messages=scraped_data,
+            exchange=exchange,
+            routing_key=routing_key,
+            scrape_id=scrape_id,
+            bookmaker=bookmaker,
+            delta=delta,
+        )
+
+    # fingerprints move forward only once the broker confirmed the whole scrape
+    if delta_tracker is not None and delta is not None:
+        delta_tracker.commit(delta)
+
+
+async def sample_as_fortuna(
+    matches: AsyncIterator[FootballMatchDataDTO], sample_ratio: float = 0.7
+) -> AsyncIterator[FootballMatchDataDTO]:
+    async for match in matches:
+        if random.random() < sample_ratio:
+            match.source = Bookmaker.FORTUNA
+            yield match
+
+
+def build_jobs(state: State) -> dict[str, ScrapeJob]:
+    """
+    Scrape and publish job of every bookmaker named after it, run by the scheduler or on demand through the routes.
+    LvBet fixtures starting soon are refreshed by an extra near-term job, when deltas are published.
+    """
+    logger = logging.getLogger(build_jobs.__qualname__)
+    betclic_limiter = create_limiter()
+
+    async def betclic(observer: OddsObserver) -> None:
+        service = BetClicScrapingService(session=state.http_session, limiter=betclic_limiter)
+        await publish_scrape(
+            state,
+            observer.watch(service.iter_scrape()),
+            routing_key=service.bookmaker.value,
+            scrape_id=service.scrape_id,
+            bookmaker=service.bookmaker,
+        )
+
+    async def lvbet(observer: OddsObserver) -> None:
+        service = LvBetScrapingService(session=state.http_session)
+        await publish_scrape(
+            state,
+            observer.watch(service.iter_scrape()),
+            routing_key=service.bookmaker.value,
+            scrape_id=service.scrape_id,
+            bookmaker=service.bookmaker,
+        )
+
+    async def lvbet_near_term(observer: OddsObserver) -> None:
+        if not state.delta_tracker.has_published(Bookmaker.LVBET):
+            logger.info("Near-term LVBET scrape waits for the first full scrape.")
+            return
+
+        service = LvBetScrapingService(session=state.http_session, near_term_hours=settings.LV_BET_NEAR_TERM_HOURS)
+        await publish_scrape(
+            state,
+            observer.watch(service.iter_scrape()),
+            routing_key=service.bookmaker.value,
+            scrape_id=service.scrape_id,
+            bookmaker=service.bookmaker,
+            partial=service.partial,
+        )
+
+    async def fortuna(observer: OddsObserver) -> None:
+        service = LvBetScrapingService(session=state.http_session)
+        await publish_scrape(
+            state,
+            observer.watch(sample_as_fortuna(service.iter_scrape())),
+            routing_key=service.bookmaker.value,
+            scrape_id=service.scrape_id,
+            bookmaker=Bookmaker.FORTUNA,
+        )
+
+    jobs: dict[str, ScrapeJob] = {
+        Bookmaker.BETCLIC.value: betclic,
+        Bookmaker.LVBET.value: lvbet,
+        Bookmaker.FORTUNA.value: fortuna,
+    }
+    if state.delta_tracker is not None:
+        jobs[LVBET_NEAR_TERM_JOB] = lvbet_near_term
+    return jobs
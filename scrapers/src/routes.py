@@ -1,62 +1,56 @@
-import random
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, status
 
-from fastapi import APIRouter, Request
 from src.enums import Bookmaker
-from src.services.betclic import BetClicScrapingService
-from src.services.lvbet import LvBetScrapingService
+from src.jobs import LVBET_NEAR_TERM_JOB
+from src.utils.scheduler import JobState
+
 
 router = APIRouter()
 
 
+async def run_job(request: Request, name: str) -> None:
+    scheduler = request.app.state.scheduler
+    try:
+        task = scheduler.run_now(name)
+    except KeyError as exception:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"{name} job is not scheduled.") from exception
+    if task is None:
+        raise HTTPException(status.HTTP_409_CONFLICT, f"{name} scrape is already running.")
+
+    # scrape is not abandoned when the client disconnects
+    await asyncio.shield(task)
+    job_state = next(job for job in scheduler.get_state() if job.name == name)
+    if job_state.last_status != "ok":
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"{name} scrape {job_state.last_status}.")
+
+
 @router.post("/betlic", tags=["Jobs"])
 async def scrape_and_publish_betclic(request: Request) -> dict[str, str]:
-    service = BetClicScrapingService()
-    scraped_data = await service.scrape()
-
-    queue = request.app.state.mq
-    await queue.send_messages(
-        messages=scraped_data,
-        exchange=request.app.state.exchange,
-        routing_key=service.bookmaker.value,
-        scrape_id=service.scrape_id,
-        bookmaker=service.bookmaker,
-    )
+    await run_job(request, Bookmaker.BETCLIC.value)
     return {"detail": "Published Betclic data to rabbitmq."}
 
 
 @router.post("/lvbet", tags=["Jobs"])
 async def scrape_and_publish_lvbet(request: Request) -> dict[str, str]:
-    service = LvBetScrapingService()
-    scraped_data = await service.scrape()
-
-    queue = request.app.state.mq
-    await queue.send_messages(
-        messages=scraped_data,
-        exchange=request.app.state.exchange,
-        routing_key=service.bookmaker.value,
-        scrape_id=service.scrape_id,
-        bookmaker=service.bookmaker,
-    )
+    await run_job(request, Bookmaker.LVBET.value)
     return {"detail": "Published LVBet data to rabbitmq."}
 
 
+@router.post("/lvbet/near-term", tags=["Jobs"])
+async def scrape_and_publish_lvbet_near_term(request: Request) -> dict[str, str]:
+    await run_job(request, LVBET_NEAR_TERM_JOB)
+    return {"detail": "Published near-term LVBet data to rabbitmq."}
+
+
 @router.post("/fortuna", tags=["Jobs"])
 async def scrape_and_publish_dummy_fortuna(request: Request) -> dict[str, str]:
-    service = LvBetScrapingService()
-    scraped_data = await service.scrape()
-
-    sample_size = int(len(scraped_data) * 0.7)
-    scraped_data = random.sample(scraped_data, sample_size)
-
-    for data in scraped_data:
-        data.source = Bookmaker.FORTUNA
-
-    queue = request.app.state.mq
-    await queue.send_messages(
-        messages=scraped_data,
-        exchange=request.app.state.exchange,
-        routing_key=service.bookmaker.value,
-        scrape_id=service.scrape_id,
-        bookmaker=Bookmaker.FORTUNA,
-    )
+    await run_job(request, Bookmaker.FORTUNA.value)
     return {"detail": "Published Fortuna data to rabbitmq."}
+
+
+@router.get("/scheduler", tags=["Scheduler"])
+async def get_scheduler_state(request: Request) -> dict[str, bool | list[JobState]]:
+    scheduler = request.app.state.scheduler
+    return {"running": scheduler.running, "jobs": scheduler.get_state()}
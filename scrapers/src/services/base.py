@@ -1,23 +1,30 @@
 import logging
-import traceback
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pprint import pformat
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncIterator, Generic, TypeVar
 from uuid import UUID, uuid4
 
+from aiohttp import ClientSession
 from pydantic import ValidationError
+
 from src.enums import Bookmaker
 from src.schemas.base import FootballMatchData, FootballMatchDataDTO
+from src.settings.settings import settings
+from src.utils.http import create_client_session
+from src.utils.validation import DatapointError, ValidationReport, validate_match_fields
+
 
-logging.basicConfig(
-    format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
-    level=logging.INFO,
-)
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
 
 RD = TypeVar("RD", bound=Any)
+FM = TypeVar("FM", bound=FootballMatchData)
 Serializable = dict[str, Any]
 
+# raised by serialization of a malformed datapoint, the datapoint is skipped
+DATAPOINT_ERRORS = (ValidationError, DatapointError, KeyError, IndexError, TypeError)
+
 
 class BaseScrapingService(ABC, Generic[RD]):
     @property
@@ -27,21 +34,33 @@ class BaseScrapingService(ABC, Generic[RD]):
 
     def __init__(
         self,
+        session: ClientSession | None = None,
+        streaming: bool = settings.STREAMING_PARSING,
+        strict_validation: bool = settings.STRICT_VALIDATION,
     ):
         self._logger = logging.getLogger(self.__class__.__qualname__)
+        self._session = session
+        self._streaming = streaming
+        self._strict_validation = strict_validation
         self._scrape_id = uuid4()
         self._scrapping_start_timestamp = datetime.utcnow()
 
-        self._logger.info(
-            "Starting %s job with id: %s",
-            {self.__class__.__qualname__},
-            {self._scrape_id},
-        )
+        self._logger.info("Starting %s job with id: %s", {self.__class__.__qualname__}, {self._scrape_id})
 
     @property
     def scrape_id(self) -> UUID:
         return self._scrape_id
 
+    @asynccontextmanager
+    async def _client_session(self) -> AsyncIterator[ClientSession]:
+        """Application scoped session when one was injected, otherwise session living for this job only."""
+        if self._session is not None:
+            yield self._session
+            return
+
+        async with create_client_session() as session:
+            yield session
+
     @abstractmethod
     async def acquire_raw_data(self) -> RD:
         pass
@@ -50,16 +69,38 @@ class BaseScrapingService(ABC, Generic[RD]):
     def preprocess_raw_data(self, raw_data: RD) -> list[Serializable]:
         pass
 
+    async def iter_raw_datapoints(self) -> AsyncIterator[Serializable]:
+        """
+        Datapoints parsed incrementally from the response stream, services which support it override this. Falls back
+        to acquiring and preprocessing the whole response.
+        """
+        for raw_datapoint in self.preprocess_raw_data(await self.acquire_raw_data()):
+            yield raw_datapoint
+
     @abstractmethod
-    def serialize_datapoint(self, raw_datapoint: Serializable) -> FootballMatchData:
-        pass
+    def extract_datapoint(self, raw_datapoint: Serializable) -> Serializable:
+        """Raw values of FootballMatchData fields, bet options keyed by FootballOutcome."""
+
+    def serialize_datapoint(
+        self, raw_datapoint: Serializable, model: type[FM] = FootballMatchData, **metadata: Any
+    ) -> FM:
+        """
+        Builds model from raw datapoint, metadata are passed to it as they are. Fields are validated by pydantic in
+        strict mode, otherwise checked by plain typed extraction and the model is constructed without validation.
+        Raises one of DATAPOINT_ERRORS when the datapoint is malformed.
+        """
+        fields = self.extract_datapoint(raw_datapoint)
+        if self._strict_validation:
+            return model(**fields, **metadata)
+        return model.construct(**validate_match_fields(fields), **metadata)
 
     def _enrich_data_with_scrape_metadata(
         self, serialized_data: list[FootballMatchData]
     ) -> list[FootballMatchDataDTO]:
         scrape_end_timestamp = datetime.utcnow()
+        # fields were validated by serialization already
         enriched_db_ready_data = [
-            FootballMatchDataDTO(
+            FootballMatchDataDTO.construct(
                 event_time=scrape_result.event_time,
                 team_a=scrape_result.team_a,
                 team_b=scrape_result.team_b,
@@ -73,43 +114,81 @@ class BaseScrapingService(ABC, Generic[RD]):
         ]
         return enriched_db_ready_data
 
-    def _serialize_data(
-        self, serializable_data: list[Serializable]
-    ) -> list[FootballMatchData]:
+    def _serialize_data(self, serializable_data: list[Serializable]) -> list[FootballMatchData]:
         standardized_data = []
-        exceptions = []
+        report = ValidationReport(settings.VALIDATION_ERROR_SAMPLE_SIZE)
 
         for match_data in serializable_data:
             try:
-                standardized_data.append(
-                    self.serialize_datapoint(
-                        raw_datapoint=match_data,
-                    )
-                )
-            except (ValidationError, IndexError, KeyError):
-                exceptions.append(traceback.format_exc())
+                standardized_data.append(self.serialize_datapoint(raw_datapoint=match_data))
+            except DATAPOINT_ERRORS as exception:
+                report.record(exception)
+
+        self._log_serialization_summary(report, len(serializable_data), len(standardized_data))
+        return standardized_data
 
-        exceptions_count = len(exceptions)
-        self._logger.warning("Validation errors count: %s\n", {exceptions_count})
-        self._logger.info(
-            "Successfully parsed: %s matches.\n", {len(standardized_data)}
+    def _log_serialization_summary(self, report: ValidationReport, datapoints_count: int, parsed_count: int) -> None:
+        self._logger.warning(
+            "Validation errors count: %s %s\n",
+            report.errors_count,
+            {category.value: count for category, count in report.counts.items()},
         )
+        self._logger.info("Successfully parsed: %s matches.\n", {parsed_count})
+
+        if report.errors_count > (0.5 * datapoints_count):
+            self._logger.error("More than 50% of raw data could not be parsed properly check logs.")
+            self._logger.error({pformat(report.samples)})
+
+    async def iter_scrape(self) -> AsyncIterator[FootballMatchDataDTO]:
+        """
+        Yields every match as soon as it was validated, so it can be published while the remaining pages are still
+        being fetched. Single pass over the response stream, datapoints are validated straight into DTOs carrying
+        scrape metadata, scrape end timestamp of a match is the time it was parsed. Without streaming parsing the whole
+        scrape is collected first.
+        """
+        if not self._streaming:
+            for match in await self.scrape():
+                yield match
+            return
+
+        report = ValidationReport(settings.VALIDATION_ERROR_SAMPLE_SIZE)
+        datapoints_count = 0
+        parsed_count = 0
+        async for raw_datapoint in self.iter_raw_datapoints():
+            datapoints_count += 1
+            try:
+                match = self.serialize_datapoint(
+                    raw_datapoint,
+                    FootballMatchDataDTO,
+                    scrape_id=self._scrape_id,
+                    source=self.bookmaker,
+                    scrape_start_timestamp=self._scrapping_start_timestamp,
+                    scrape_end_timestamp=datetime.utcnow(),
+                )
+            except DATAPOINT_ERRORS as exception:
+                report.record(exception)
+                continue
 
-        if exceptions_count > (0.5 * len(serializable_data)):
-            self._logger.error(
-                "More than 50% of raw data could not be parsed properly check logs."
-            )
-            self._logger.error({pformat(exceptions)})
+            parsed_count += 1
+            yield match
 
-        return standardized_data
+        self._log_serialization_summary(report, datapoints_count, parsed_count)
+
+    async def _scrape_streaming(self) -> list[FootballMatchDataDTO]:
+        """Neither the response document nor intermediate lists of raw or serialized datapoints are kept."""
+        matches = [match async for match in self.iter_scrape()]
+
+        scrape_end_timestamp = datetime.utcnow()
+        for match in matches:
+            match.scrape_end_timestamp = scrape_end_timestamp
+        return matches
 
     async def scrape(self) -> list[FootballMatchDataDTO]:
+        if self._streaming:
+            return await self._scrape_streaming()
+
         raw_data: RD = await self.acquire_raw_data()
         serializable_data: list[Serializable] = self.preprocess_raw_data(raw_data)
-        serialized_data: list[FootballMatchData] = self._serialize_data(
-            serializable_data
-        )
-        enriched_serialized_data: list[
-            FootballMatchDataDTO
-        ] = self._enrich_data_with_scrape_metadata(serialized_data)
+        serialized_data: list[FootballMatchData] = self._serialize_data(serializable_data)
+        enriched_serialized_data: list[FootballMatchDataDTO] = self._enrich_data_with_scrape_metadata(serialized_data)
         return enriched_serialized_data
@@ -1,58 +1,52 @@
-import asyncio
-from typing import Any, Final
-from uuid import UUID
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Final
+
+from aiohttp import ClientResponse, ClientSession
 
-from aiohttp import ClientSession
 from src.enums import Bookmaker, FootballOutcome
-from src.schemas.base import FootballMatchData
-from src.services.base import RD, BaseScrapingService
+from src.services.base import BaseScrapingService
 from src.settings.settings import settings
+from src.utils.pagination import AdaptivePaginator, AIMDLimiter
+from src.utils.streaming import iter_json_items
+
 
 BETCLIC_API_LIMIT: Final[int] = settings.BETCLIC_API_LIMIT
-BETCLIC_PAGES: Final[int] = settings.BETCLIC_PAGES
+BETCLIC_MAX_PAGES: Final[int] = settings.BETCLIC_MAX_PAGES
 
 Serializable = dict[str, Any]
 
 
 class BetClicScrapingService(BaseScrapingService[list[Serializable]]):
-    # language pl = pa
-    BASE_API_URL = (
-        "https://offer.cdn.begmedia.com/api/pub/v4/sports/1?application=2048&countrycode=pl"
-        "&hasSwitchMtc=true&language=en&markettypeId=1365&sitecode=plpa&sortBy=ByLiveRankingPreliveDate"
-    )
+    BASE_API_URL = settings.BETCLIC_API_URL
+
+    def __init__(self, *args: Any, limiter: AIMDLimiter | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # shared by consecutive scrapes when given, so they start from the concurrency the API tolerated
+        self._limiter = limiter or create_limiter()
 
     @property
     def bookmaker(self):
         return Bookmaker.BETCLIC
 
     async def acquire_raw_data(
-        self, limit: int = BETCLIC_API_LIMIT, pages: int = BETCLIC_PAGES
+        self, limit: int = BETCLIC_API_LIMIT, max_pages: int = BETCLIC_MAX_PAGES
     ) -> list[Serializable]:
-        tasks = []
-        offsets = [page * limit for page in range(pages)]
-
-        matches: list[Any] = []
-
-        async with ClientSession() as session:
-            for offset in offsets:
-                params = {"offset": offset, "limit": limit}
-                task = asyncio.create_task(
-                    self._fetch_page(
-                        matches, params, session, self.BASE_API_URL, self._scrape_id
-                    )
-                )
-                tasks.append(task)
+        async with self._client_session() as session:
+            return [match async for match in self._iter_pages(session, self._parse_page, limit, max_pages)]
 
-            await asyncio.gather(*tasks)
-        return matches
+    async def iter_raw_datapoints(
+        self, limit: int = BETCLIC_API_LIMIT, max_pages: int = BETCLIC_MAX_PAGES
+    ) -> AsyncIterator[Serializable]:
+        async with self._client_session() as session:
+            async for match in self._iter_pages(session, self._stream_page, limit, max_pages):
+                yield match
 
     def preprocess_raw_data(self, raw_data: list[Serializable]) -> list[Serializable]:
         return raw_data
 
-    def serialize_datapoint(self, raw_datapoint: Serializable) -> FootballMatchData:
+    def extract_datapoint(self, raw_datapoint: Serializable) -> Serializable:
         odds_section = raw_datapoint["grouped_markets"][0]["markets"][0]["selections"]
 
-        return FootballMatchData(
+        return dict(
             event_time=raw_datapoint["date"],
             team_a=raw_datapoint["contestants"][0]["name"],
             team_b=raw_datapoint["contestants"][1]["name"],
@@ -63,21 +57,29 @@ class BetClicScrapingService(BaseScrapingService[list[Serializable]]):
             },
         )
 
-    async def _fetch_page(
+    def _iter_pages(
         self,
-        matches: RD,
-        params: dict[str, Any],
         session: ClientSession,
-        url: str,
-        scrape_id: UUID,
-    ) -> None:
-        async with session.get(url, params=params) as response:
-            json_response = await response.json()
-
-            if response.status == 200:
-                matches.extend(json_response["matches"])
-                return
-
-            self._logger.warning(
-                f"ID: {scrape_id} - {url}:{response.status} - {json_response}\n"
-            )
+        parse_page: Callable[[ClientResponse], AsyncIterator[Serializable]],
+        limit: int,
+        max_pages: int,
+    ) -> AsyncIterator[Serializable]:
+        def request_page(page: int) -> AsyncContextManager[ClientResponse]:
+            return session.get(self.BASE_API_URL, params={"offset": page * limit, "limit": limit})
+
+        paginator = AdaptivePaginator(limit, self._limiter, max_pages)
+        return paginator.iter_items(request_page, parse_page)
+
+    @staticmethod
+    async def _parse_page(response: ClientResponse) -> AsyncIterator[Serializable]:
+        for match in (await response.json())["matches"]:
+            yield match
+
+    @staticmethod
+    async def _stream_page(response: ClientResponse) -> AsyncIterator[Serializable]:
+        async for _, match in iter_json_items(response.content, ["matches.item"]):
+            yield match
+
+
+def create_limiter() -> AIMDLimiter:
+    return AIMDLimiter(initial_limit=settings.BETCLIC_INITIAL_CONCURRENCY, max_limit=settings.BETCLIC_MAX_CONCURRENCY)
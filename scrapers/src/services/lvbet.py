@@ -1,27 +1,56 @@
+import asyncio
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, DefaultDict, Final
+from typing import Any, AsyncIterator, DefaultDict, Final
+
+from aiohttp import ClientSession
 
-import aiohttp
 from src.enums import Bookmaker, FootballOutcome
-from src.schemas.base import FootballMatchData
-from src.services.base import RD, BaseScrapingService, Serializable
+from src.services.base import BaseScrapingService, Serializable
 from src.settings.settings import settings
-
-LV_BET_DAYS_TO_SCRAPE: Final[int] = settings.LV_BET_DAYS_TO_SCRAPE
+from src.utils.streaming import iter_json_items, merge_async_iterators
 
 
-class LvBetScrapingService(BaseScrapingService[dict[Any, Any]]):
-    BASE_API_URL = "https://offer.lvbet.pl/client-api/v4/matches/competition-view/?lang=en&sports_groups_ids=1&sports_groups_ids=36530&sports_groups_ids=37609"  # noqa #pylint: disable=line-too-long
+LV_BET_DAYS_TO_SCRAPE: Final[int] = settings.LV_BET_DAYS_TO_SCRAPE
+LV_BET_SHARD_HOURS: Final[int] = settings.LV_BET_SHARD_HOURS
+LV_BET_SHARD_CONCURRENCY: Final[int] = settings.LV_BET_SHARD_CONCURRENCY
+
+REQUEST_TIME_FORMAT: Final[str] = "%Y-%m-%d %H:%M"
+
+
+class LvBetScrapingService(BaseScrapingService[list[dict[Any, Any]]]):
+    """
+    Offer of the whole timeframe is requested in shards of shard_hours, fetched concurrently over a single session and
+    merged by match_id, matches at the boundaries of two shards are returned by both. With near_term_hours only the
+    next few hours are scraped in a single request, e.g. to refresh odds of fixtures about to start more often.
+    """
+
+    BASE_API_URL = settings.LV_BET_API_URL
+
+    def __init__(
+        self,
+        *args: Any,
+        shard_hours: int = LV_BET_SHARD_HOURS,
+        shard_concurrency: int = LV_BET_SHARD_CONCURRENCY,
+        near_term_hours: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._shard_hours = shard_hours
+        self._shard_concurrency = shard_concurrency
+        self._near_term_hours = near_term_hours
 
     @property
     def bookmaker(self) -> Bookmaker:
         return Bookmaker.LVBET
 
+    @property
+    def partial(self) -> bool:
+        """Near-term scrape covers only a part of the offer, fixtures missing from it were not removed."""
+        return self._near_term_hours is not None
+
     @staticmethod
-    def _get_request_timeframe(
-        days_to_scrape: int = LV_BET_DAYS_TO_SCRAPE,
-    ) -> dict[str, str]:
+    def _get_request_timeframe(days_to_scrape: int = LV_BET_DAYS_TO_SCRAPE) -> dict[str, str]:
         now = datetime.utcnow()
         date_from = now - timedelta(hours=12)
         date_to = now + timedelta(days=days_to_scrape)
@@ -31,46 +60,129 @@ class LvBetScrapingService(BaseScrapingService[dict[Any, Any]]):
         parameters = {"date_from": s_date_from, "date_to": s_date_to}
         return parameters
 
-    async def acquire_raw_data(self) -> dict[Any, Any]:
-        date_parameters = self._get_request_timeframe()
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.BASE_API_URL, params=date_parameters
-            ) as response:
-                data: dict[Any, Any] = await response.json()
-                return data
+    @staticmethod
+    def _get_near_term_timeframe(hours: int) -> dict[str, str]:
+        date_from = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        date_to = date_from + timedelta(hours=hours + 1)
+        return {"date_from": date_from.strftime(REQUEST_TIME_FORMAT), "date_to": date_to.strftime(REQUEST_TIME_FORMAT)}
 
-    def preprocess_raw_data(self, raw_data: RD) -> list[Serializable]:
+    @staticmethod
+    def _split_timeframe(timeframe: dict[str, str], shard_hours: int) -> list[dict[str, str]]:
+        date_from = datetime.strptime(timeframe["date_from"], REQUEST_TIME_FORMAT)
+        date_to = datetime.strptime(timeframe["date_to"], REQUEST_TIME_FORMAT)
+        shard = timedelta(hours=shard_hours)
+
+        shards = []
+        while date_from < date_to:
+            shard_to = min(date_from + shard, date_to)
+            shards.append(
+                {
+                    "date_from": date_from.strftime(REQUEST_TIME_FORMAT),
+                    "date_to": shard_to.strftime(REQUEST_TIME_FORMAT),
+                }
+            )
+            date_from = shard_to
+        return shards
+
+    def _get_request_shards(self) -> list[dict[str, str]]:
+        if self._near_term_hours is not None:
+            return [self._get_near_term_timeframe(self._near_term_hours)]
+        return self._split_timeframe(self._get_request_timeframe(), self._shard_hours)
+
+    async def acquire_raw_data(self) -> list[dict[Any, Any]]:
+        semaphore = asyncio.Semaphore(self._shard_concurrency)
+
+        async def fetch(session: ClientSession, parameters: dict[str, str]) -> Any:
+            async with semaphore:
+                async with session.get(self.BASE_API_URL, params=parameters) as response:
+                    return await response.json()
+
+        async with self._client_session() as session:
+            return list(await asyncio.gather(*(fetch(session, shard) for shard in self._get_request_shards())))
+
+    async def iter_raw_datapoints(self) -> AsyncIterator[Serializable]:
+        """
+        Markets of all shards as they are parsed, a match returned by two neighbouring shards is yielded once. Markets
+        of matches without kickoff time in any shard are yielded at the end.
+        """
+        semaphore = asyncio.Semaphore(self._shard_concurrency)
+        yielded: set[Any] = set()
+        orphans: dict[Any, list[Serializable]] = {}
+
+        async with self._client_session() as session:
+            shards = [self._iter_shard(session, parameters, semaphore) for parameters in self._get_request_shards()]
+            async for market in merge_async_iterators(shards):
+                match_id = market["match_id"]
+                if "event_time" not in market:
+                    orphans.setdefault(match_id, []).append(market)
+                elif match_id not in yielded:
+                    yielded.add(match_id)
+                    yield market
+
+        for match_id, markets in orphans.items():
+            if match_id not in yielded:
+                # the same market of both shards
+                yield markets[0]
+
+    async def _iter_shard(
+        self, session: ClientSession, parameters: dict[str, str], semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[Serializable]:
+        """
+        Joins "Match Result" markets with kickoff times from the matches array while both are being parsed. Only the
+        kickoff time of every match and markets still waiting for theirs are kept, markets of matches which never show
+        up are yielded without kickoff time at the end.
+        """
+        event_times: dict[Any, str] = {}
+        waiting_markets: DefaultDict[Any, list[Serializable]] = defaultdict(list)
+
+        async with semaphore:
+            async with session.get(self.BASE_API_URL, params=parameters) as response:
+                async for prefix, item in iter_json_items(
+                    response.content, ["primary_column_markets.item", "matches.item"]
+                ):
+                    if prefix == "matches.item":
+                        event_times[item["match_id"]] = item["date"]
+                        for market in waiting_markets.pop(item["match_id"], []):
+                            market["event_time"] = item["date"]
+                            yield market
+                    elif item["name"] == "Match Result":
+                        if item["match_id"] in event_times:
+                            item["event_time"] = event_times[item["match_id"]]
+                            yield item
+                        else:
+                            waiting_markets[item["match_id"]].append(item)
+
+        for markets in waiting_markets.values():
+            for market in markets:
+                yield market
+
+    def preprocess_raw_data(self, raw_data: list[dict[Any, Any]]) -> list[Serializable]:
         data_points: list[dict[str, Any]] = [
-            entry
-            for entry in raw_data["primary_column_markets"]
-            if entry["name"] == "Match Result"
+            entry for shard in raw_data for entry in shard["primary_column_markets"] if entry["name"] == "Match Result"
         ]
 
         matches_event_datetimes: list[dict[str, str]] = [
             {"match_id": match["match_id"], "event_time": match["date"]}
-            for match in raw_data["matches"]
+            for shard in raw_data
+            for match in shard["matches"]
         ]
 
+        # matches at shard boundaries come twice, merged into a single datapoint
         bet_info_with_event_time: DefaultDict[str, Serializable] = defaultdict(dict)
         for match in data_points + matches_event_datetimes:
             bet_info_with_event_time[match["match_id"]].update(match)
 
         return list(bet_info_with_event_time.values())
 
-    def serialize_datapoint(self, raw_datapoint: dict[Any, Any]) -> FootballMatchData:
-        return FootballMatchData(
+    def extract_datapoint(self, raw_datapoint: dict[Any, Any]) -> Serializable:
+        return dict(
             event_time=raw_datapoint["event_time"],
             team_a=raw_datapoint["selections"][0]["label"],
             team_b=raw_datapoint["selections"][2]["label"],
             bet_options={
-                FootballOutcome.TEAM_A_WINS: raw_datapoint["selections"][0]["rate"][
-                    "decimal"
-                ],
+                FootballOutcome.TEAM_A_WINS: raw_datapoint["selections"][0]["rate"]["decimal"],
                 FootballOutcome.DRAW: raw_datapoint["selections"][1]["rate"]["decimal"],
-                FootballOutcome.TEAM_B_WINS: raw_datapoint["selections"][2]["rate"][
-                    "decimal"
-                ],
+                FootballOutcome.TEAM_B_WINS: raw_datapoint["selections"][2]["rate"]["decimal"],
             },
         )
 
@@ -0,0 +1,18 @@
+from pydantic import BaseSettings
+
+
+class HttpClientSettings(BaseSettings):
+    # shared by all scraping jobs, connections to bookmaker APIs are kept alive between scrapes
+    HTTP_LIMIT: int = 100
+    HTTP_LIMIT_PER_HOST: int = 10
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 15.0
+    HTTP_TOTAL_TIMEOUT: float = 60.0
+
+    # 429, 5xx and connection errors are retried with jittered exponential backoff
+    HTTP_MAX_ATTEMPTS: int = 4
+    HTTP_BACKOFF_BASE_SECONDS: float = 0.5
+    HTTP_BACKOFF_CAP_SECONDS: float = 10.0
@@ -1,5 +1,7 @@
 from pydantic import BaseSettings
 
+from src.enums import PublishingMode, WireFormat
+
 
 class RabbitMQSettings(BaseSettings):
     RABBIT_HOST: str = "localhost"
@@ -9,3 +11,25 @@ class RabbitMQSettings(BaseSettings):
 
     RABBIT_PUBLISHING_EXCHANGE_NAME: str = "scraper-pub"
     RABBIT_PUBLISHING_QUEUE_NAME: str = "scraper_queue"
+
+    # CHUNKED publishes RABBIT_CHUNK_SIZE matches per message with publisher confirms and up to
+    # RABBIT_MAX_IN_FLIGHT unconfirmed messages, TRANSACTION publishes one match per message in AMQP transaction
+    RABBIT_PUBLISHING_MODE: PublishingMode = PublishingMode.CHUNKED
+    RABBIT_CHUNK_SIZE: int = 100
+    RABBIT_MAX_IN_FLIGHT: int = 16
+
+    # content type of published messages, chunk bodies of at least RABBIT_COMPRESSION_MIN_SIZE bytes are
+    # compressed with zstd when RABBIT_COMPRESSION is enabled
+    RABBIT_WIRE_FORMAT: WireFormat = WireFormat.JSON
+    RABBIT_COMPRESSION: bool = False
+    RABBIT_COMPRESSION_LEVEL: int = 3
+    RABBIT_COMPRESSION_MIN_SIZE: int = 1024
+
+    # CHUNKED mode only: publish just fixtures whose odds changed since the previous scrape of the bookmaker and
+    # keys of removed ones, every RABBIT_FULL_SNAPSHOT_EVERY-th scrape is published in full
+    RABBIT_DELTA_PUBLISHING: bool = True
+    RABBIT_FULL_SNAPSHOT_EVERY: int = 12
+
+    # CHUNKED mode only: publish chunks while the scrape is still running instead of after it finished, the last
+    # chunk marks the end of the scrape
+    RABBIT_STREAM_PUBLISHING: bool = True
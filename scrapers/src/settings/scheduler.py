@@ -0,0 +1,20 @@
+from pydantic import BaseSettings
+
+
+class SchedulerSettings(BaseSettings):
+    # scrape all bookmakers in the background, jobs can still be started on demand through the routes
+    SCHEDULER_ENABLED: bool = True
+    # jobs due within SCHEDULER_ALIGNMENT_SECONDS start together and have to finish within SCHEDULER_RUN_TIMEOUT_SECONDS
+    SCHEDULER_ALIGNMENT_SECONDS: float = 10.0
+    SCHEDULER_RUN_TIMEOUT_SECONDS: float = 240.0
+
+    # interval of a job (SCHEDULER_BASE_INTERVALS overrides the base per job name, e.g. LVBET) shrinks when the nearest
+    # kickoff is within SCHEDULER_NEAR_KICKOFF_SECONDS and when odds were changing, within min and max seconds
+    SCHEDULER_BASE_INTERVAL_SECONDS: float = 300.0
+    SCHEDULER_BASE_INTERVALS: dict[str, float] = {"LVBET_NEAR_TERM": 60.0}
+    SCHEDULER_MIN_INTERVAL_SECONDS: float = 30.0
+    SCHEDULER_MAX_INTERVAL_SECONDS: float = 900.0
+    SCHEDULER_NEAR_KICKOFF_SECONDS: float = 2 * 60 * 60
+    SCHEDULER_KICKOFF_WEIGHT: float = 4.0
+    SCHEDULER_VOLATILITY_WEIGHT: float = 4.0
+    SCHEDULER_VOLATILITY_SMOOTHING: float = 0.5
@@ -2,6 +2,31 @@ from pydantic import BaseSettings
 
 
 class ScrapersSettings(BaseSettings):
+    # bookmaker APIs, e.g. pointed at local stand-ins by the load harness
+    # language pl = pa
+    BETCLIC_API_URL: str = (
+        "https://offer.cdn.begmedia.com/api/pub/v4/sports/1?application=2048&countrycode=pl"
+        "&hasSwitchMtc=true&language=en&markettypeId=1365&sitecode=plpa&sortBy=ByLiveRankingPreliveDate"
+    )
+    LV_BET_API_URL: str = "https://offer.lvbet.pl/client-api/v4/matches/competition-view/?lang=en&sports_groups_ids=1&sports_groups_ids=36530&sports_groups_ids=37609"  # noqa #pylint: disable=line-too-long
     BETCLIC_API_LIMIT: int = 250
-    BETCLIC_PAGES: int = 5
+    # pages are fetched until the offer is exhausted, BETCLIC_MAX_PAGES is only a safety cap
+    BETCLIC_MAX_PAGES: int = 40
+    # concurrent page requests, adapted to responses of the API between these bounds
+    BETCLIC_INITIAL_CONCURRENCY: int = 4
+    BETCLIC_MAX_CONCURRENCY: int = 10
     LV_BET_DAYS_TO_SCRAPE: int = 10
+    # the timeframe is requested in windows of LV_BET_SHARD_HOURS, at most LV_BET_SHARD_CONCURRENCY at once
+    LV_BET_SHARD_HOURS: int = 24
+    LV_BET_SHARD_CONCURRENCY: int = 4
+    # near-term job refreshes only fixtures starting within the next LV_BET_NEAR_TERM_HOURS, needs delta publishing
+    LV_BET_NEAR_TERM_HOURS: int = 6
+
+    # parse bookmaker responses incrementally while they are read, straight into DTOs
+    STREAMING_PARSING: bool = True
+
+    # pydantic validation of every scraped match, otherwise fields are checked with plain typed extraction and models
+    # are constructed without validation
+    STRICT_VALIDATION: bool = False
+    # errors are counted by category, only this many are kept as samples for logs
+    VALIDATION_ERROR_SAMPLE_SIZE: int = 10
@@ -1,8 +1,10 @@
+from src.settings.http import HttpClientSettings
 from src.settings.rabbit import RabbitMQSettings
+from src.settings.scheduler import SchedulerSettings
 from src.settings.scrapers import ScrapersSettings
 
 
-class Settings(RabbitMQSettings, ScrapersSettings):
+class Settings(RabbitMQSettings, ScrapersSettings, HttpClientSettings, SchedulerSettings):
     pass
 
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import msgpack
+import orjson
+import zstandard
+from pydantic import BaseModel
+
+from src.enums import WireFormat
+
+
+ZSTD_CONTENT_ENCODING = "zstd"
+
+# msgpack Timestamp extension (-1) is reserved for timezone aware datetimes, naive ones are sent with own type
+# to come back naive on the consumer side
+NAIVE_DATETIME_EXT_TYPE = 1
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, BaseModel):
+        return o.dict()
+
+    raise TypeError(f"Object of type {o.__class__.__name__} is not serializable")
+
+
+def _msgpack_default(o: Any) -> Any:
+    if isinstance(o, datetime):
+        if o.tzinfo is None:
+            timestamp = msgpack.Timestamp.from_datetime(o.replace(tzinfo=timezone.utc))
+            return msgpack.ExtType(NAIVE_DATETIME_EXT_TYPE, timestamp.to_bytes())
+        return msgpack.Timestamp.from_datetime(o)
+
+    if isinstance(o, UUID):
+        return str(o)
+
+    if isinstance(o, Enum):
+        return o.value
+
+    return _default(o)
+
+
+class MessageCodec:
+    """
+    Encodes message payloads in the configured wire format. UUIDs, enums and datetimes are handled natively by the
+    encoders, only pydantic models go through Python level hook. Compression is applied to bodies of at least
+    compression_min_size bytes, consumers recognise it by the content encoding.
+    """
+
+    def __init__(
+        self,
+        wire_format: WireFormat = WireFormat.JSON,
+        compression: bool = False,
+        compression_level: int = 3,
+        compression_min_size: int = 1024,
+    ) -> None:
+        self.wire_format = wire_format
+        self.compression = compression
+        self.compression_min_size = compression_min_size
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._packer = msgpack.Packer(default=_msgpack_default)
+
+    @property
+    def content_type(self) -> str:
+        return self.wire_format.value
+
+    def encode(self, payload: Any) -> bytes:
+        if self.wire_format == WireFormat.MSGPACK:
+            return self._packer.pack(payload)
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def encode_compressed(self, payload: Any) -> tuple[bytes, str | None]:
+        """Returns body and its content encoding, None if it was left uncompressed."""
+        body = self.encode(payload)
+        if not self.compression or len(body) < self.compression_min_size:
+            return body, None
+        return self._compressor.compress(body), ZSTD_CONTENT_ENCODING
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from hashlib import blake2b
+
+from src.enums import Bookmaker, ScrapeKind
+from src.schemas.base import FootballMatchDataDTO
+
+
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
+
+
+def fixture_key(match: FootballMatchDataDTO) -> int:
+    # stable across processes, shifted to fit signed 64 bit integer columns on the consumer side
+    digest = blake2b(
+        f"{match.team_a}\x1f{match.team_b}\x1f{match.event_time.isoformat()}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def odds_fingerprint(match: FootballMatchDataDTO) -> int:
+    # compared only within this process, builtin hash is enough
+    return hash(tuple(sorted((outcome.value, odds) for outcome, odds in match.bet_options.items())))
+
+
+@dataclass
+class ScrapeDelta:
+    kind: ScrapeKind
+    bookmaker: Bookmaker
+    scrape_id: str
+    base_scrape_id: str | None
+    upserts: list[FootballMatchDataDTO]
+    fixture_keys: list[int]
+    removed: list[int]
+    scrape_start_timestamp: datetime | None
+    scrape_end_timestamp: datetime | None
+    fingerprints: dict[int, int] = field(repr=False)
+    # covers only a part of the offer, nothing is removed and fingerprints are merged into the published ones
+    partial: bool = False
+
+
+@dataclass
+class _PublishedScrape:
+    scrape_id: str
+    fingerprints: dict[int, int]
+    deltas_since_full: int
+
+
+class DeltaBuilder:
+    """
+    Builds delta of a single scrape match by match, so matches can be published while the scrape is still running.
+    Kind of the delta is decided up front, removed keys are known once all matches were added. Matches published
+    right away do not have to be kept, upserts of the finished delta are then empty. Partial delta never removes.
+    """
+
+    def __init__(
+        self,
+        bookmaker: Bookmaker,
+        scrape_id: str,
+        kind: ScrapeKind,
+        base_scrape_id: str | None,
+        previous_fingerprints: dict[int, int],
+        collect_upserts: bool = True,
+        partial: bool = False,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self.bookmaker = bookmaker
+        self.scrape_id = scrape_id
+        self.kind = kind
+        self.base_scrape_id = base_scrape_id
+        self._previous_fingerprints = previous_fingerprints
+        self._collect_upserts = collect_upserts
+        self.partial = partial
+        self._fingerprints: dict[int, int] = {}
+        self._upserts: list[FootballMatchDataDTO] = []
+        self._fixture_keys: list[int] = []
+        self._matches_count = 0
+        self._upserts_count = 0
+        self._scrape_start_timestamp: datetime | None = None
+        self._scrape_end_timestamp: datetime | None = None
+
+    def add(self, match: FootballMatchDataDTO) -> int | None:
+        """Returns fixture key of the match when it has to be published, None when its odds did not change."""
+        key = fixture_key(match)
+        fingerprint = self._fingerprints[key] = odds_fingerprint(match)
+        self._matches_count += 1
+        if self._scrape_start_timestamp is None:
+            self._scrape_start_timestamp = match.scrape_start_timestamp
+        self._scrape_end_timestamp = match.scrape_end_timestamp
+
+        if self.kind == ScrapeKind.DELTA and self._previous_fingerprints.get(key) == fingerprint:
+            return None
+
+        self._upserts_count += 1
+        if self._collect_upserts:
+            self._upserts.append(match)
+            self._fixture_keys.append(key)
+        return key
+
+    def finish(self, scrape_end_timestamp: datetime | None = None) -> ScrapeDelta:
+        delta = ScrapeDelta(
+            kind=self.kind,
+            bookmaker=self.bookmaker,
+            scrape_id=self.scrape_id,
+            base_scrape_id=self.base_scrape_id,
+            upserts=self._upserts,
+            fixture_keys=self._fixture_keys,
+            removed=[]
+            if self.partial
+            else [key for key in self._previous_fingerprints if key not in self._fingerprints],
+            scrape_start_timestamp=self._scrape_start_timestamp,
+            scrape_end_timestamp=scrape_end_timestamp or self._scrape_end_timestamp,
+            fingerprints=self._fingerprints,
+            partial=self.partial,
+        )
+        if delta.kind == ScrapeKind.DELTA:
+            self._logger.info(
+                f"{self.bookmaker.value} delta: {self._upserts_count} upserted, {len(delta.removed)} removed, "
+                f"{self._matches_count - self._upserts_count} unchanged [scrape_id: {self.scrape_id}]"
+            )
+        return delta
+
+
+class OddsDeltaTracker:
+    """
+    Remembers fingerprints of the odds last published for every bookmaker and turns a scrape into a delta against
+    them: fixtures that are new or whose odds changed are published again, fixtures that disappeared are published
+    as removed keys, unchanged ones are skipped. Every full_snapshot_every-th scrape is published in full so consumers
+    which missed a delta resync. State moves forward only when commit is called after successful publishing.
+    Partial scrapes (a part of the offer refreshed more often) are always deltas against the last published scrape,
+    publishing of a bookmaker has to hold its lock, so deltas of overlapping scrapes are based on each other.
+    """
+
+    def __init__(self, full_snapshot_every: int = 12) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self.full_snapshot_every = full_snapshot_every
+        self._published: dict[Bookmaker, _PublishedScrape] = {}
+        self._locks: dict[Bookmaker, asyncio.Lock] = {}
+
+    def lock(self, bookmaker: Bookmaker) -> asyncio.Lock:
+        return self._locks.setdefault(bookmaker, asyncio.Lock())
+
+    def has_published(self, bookmaker: Bookmaker) -> bool:
+        return bookmaker in self._published
+
+    def start(
+        self, bookmaker: Bookmaker, scrape_id: str, collect_upserts: bool = True, partial: bool = False
+    ) -> DeltaBuilder:
+        published = self._published.get(bookmaker)
+        if partial:
+            if published is None:
+                raise ValueError(f"Partial {bookmaker.value} scrape needs a published scrape to be based on.")
+            return DeltaBuilder(
+                bookmaker,
+                str(scrape_id),
+                ScrapeKind.DELTA,
+                published.scrape_id,
+                published.fingerprints,
+                collect_upserts,
+                partial=True,
+            )
+
+        if published is None or published.deltas_since_full + 1 >= self.full_snapshot_every:
+            return DeltaBuilder(bookmaker, str(scrape_id), ScrapeKind.FULL, None, {}, collect_upserts)
+
+        return DeltaBuilder(
+            bookmaker, str(scrape_id), ScrapeKind.DELTA, published.scrape_id, published.fingerprints, collect_upserts
+        )
+
+    def compute(
+        self, bookmaker: Bookmaker, scrape_id: str, matches: list[FootballMatchDataDTO], partial: bool = False
+    ) -> ScrapeDelta:
+        builder = self.start(bookmaker, scrape_id, partial=partial)
+        for match in matches:
+            builder.add(match)
+        return builder.finish()
+
+    def commit(self, delta: ScrapeDelta) -> None:
+        fingerprints = delta.fingerprints
+        deltas_since_full = 0
+        if delta.kind == ScrapeKind.DELTA:
+            published = self._published[delta.bookmaker]
+            deltas_since_full = published.deltas_since_full + 1
+            if delta.partial:
+                fingerprints = {**published.fingerprints, **delta.fingerprints}
+
+        self._published[delta.bookmaker] = _PublishedScrape(
+            scrape_id=delta.scrape_id, fingerprints=fingerprints, deltas_since_full=deltas_since_full
+        )
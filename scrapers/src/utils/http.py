@@ -0,0 +1,41 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from src.settings.settings import settings
+
+
+try:
+    import brotli  # noqa: F401
+
+    # aiohttp decodes brotli responses only when the package is installed
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_client_session(
+    limit: int = settings.HTTP_LIMIT,
+    limit_per_host: int = settings.HTTP_LIMIT_PER_HOST,
+    dns_cache_ttl: int = settings.HTTP_DNS_CACHE_TTL,
+    keepalive_timeout: float = settings.HTTP_KEEPALIVE_TIMEOUT,
+    connect_timeout: float = settings.HTTP_CONNECT_TIMEOUT,
+    read_timeout: float = settings.HTTP_READ_TIMEOUT,
+    total_timeout: float = settings.HTTP_TOTAL_TIMEOUT,
+) -> ClientSession:
+    """
+    Client session with pooled keep-alive connections and cached DNS lookups. Created once per application, every
+    scraping job reuses its connections instead of paying DNS, TCP and TLS setup again. Has to be created within
+    running event loop and closed on shutdown.
+    """
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+        keepalive_timeout=keepalive_timeout,
+    )
+    return ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        auto_decompress=True,
+    )
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, TypeVar
+
+from aiohttp import ClientConnectionError, ClientResponse
+
+from src.settings.settings import settings
+
+
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
+
+T = TypeVar("T")
+
+_PAGE_DONE = object()
+
+
+class PageFetchError(Exception):
+    def __init__(self, page: int, reason: str) -> None:
+        super().__init__(f"Page {page} could not be fetched: {reason}")
+        self.page = page
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit of requests to a single API driven by additive increase / multiplicative decrease. Every
+    successful response raises the limit by increase / limit (about +increase per round of requests), 429 and 5xx
+    responses, timeouts and latency above latency_tolerance times the baseline cut it by decrease_factor, at most once
+    per baseline latency. Baseline is the lowest latency seen, drifting slowly towards recent latencies.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._baseline_latency: float | None = None
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        baseline = self._baseline_latency
+        if baseline is None or latency < baseline:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency = baseline + 0.05 * (latency - baseline)
+
+        if baseline is not None and latency > self.latency_tolerance * baseline:
+            self.on_overload()
+            return
+        self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._baseline_latency or 0.0):
+            # responses of requests sent before the previous decrease
+            return
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_decrease = now
+
+
+def _retry_after(response: ClientResponse) -> float:
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        # HTTP date form is not worth parsing for a few seconds of waiting
+        return 0.0
+
+
+class AdaptivePaginator:
+    """
+    Fetches pages of page_size items until the offer is exhausted, the first page shorter than page_size is the last
+    one. Pages are requested ahead as far as the limiter allows, so at most a few requests past the end are wasted and
+    their failures are ignored. 429, 5xx, timeouts and connection errors before the first item of a page are retried up
+    to max_attempts times with jittered exponential backoff (Retry-After is respected), other statuses fail the page.
+    A failed page within the offer fails the whole scrape instead of truncating it. Items of pages are yielded as they
+    are parsed. Stops with a warning after max_pages pages, the offer might be truncated then.
+    """
+
+    def __init__(
+        self,
+        page_size: int,
+        limiter: AIMDLimiter,
+        max_pages: int,
+        max_attempts: int = settings.HTTP_MAX_ATTEMPTS,
+        backoff_base_seconds: float = settings.HTTP_BACKOFF_BASE_SECONDS,
+        backoff_cap_seconds: float = settings.HTTP_BACKOFF_CAP_SECONDS,
+        max_buffered: int = 100,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self.page_size = page_size
+        self.limiter = limiter
+        self.max_pages = max_pages
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_cap_seconds = backoff_cap_seconds
+        self.max_buffered = max_buffered
+
+    def _backoff(self, attempt: int, retry_after: float = 0.0) -> float:
+        # full jitter, concurrent retries of different pages do not hit the API at once
+        backoff = random.uniform(0, min(self.backoff_cap_seconds, self.backoff_base_seconds * 2**attempt))
+        return max(backoff, retry_after)
+
+    async def iter_items(
+        self,
+        request_page: Callable[[int], AsyncContextManager[ClientResponse]],
+        parse_page: Callable[[ClientResponse], AsyncIterator[T]],
+    ) -> AsyncIterator[T]:
+        queue: asyncio.Queue[tuple[Any, Any]] = asyncio.Queue(self.max_buffered)
+
+        async def fetch(page: int) -> None:
+            try:
+                count = await self._fetch_page(page, request_page, parse_page, queue)
+            except Exception as exception:
+                await queue.put((_PAGE_DONE, (page, exception)))
+                return
+            await queue.put((_PAGE_DONE, (page, count)))
+
+        tasks: dict[int, asyncio.Task] = {}
+        failures: dict[int, Exception] = {}
+        last_page: int | None = None
+        next_page = 0
+        try:
+            while True:
+                while (
+                    not failures
+                    and len(tasks) < self.limiter.limit
+                    and next_page < self.max_pages
+                    and (last_page is None or next_page <= last_page)
+                ):
+                    tasks[next_page] = asyncio.create_task(fetch(next_page))
+                    next_page += 1
+                if not tasks:
+                    break
+
+                item, result = await queue.get()
+                if item is not _PAGE_DONE:
+                    yield item
+                    continue
+                page, count = result
+                del tasks[page]
+                if isinstance(count, Exception):
+                    failures[page] = count
+                elif count < self.page_size and (last_page is None or page < last_page):
+                    last_page = page
+
+                if last_page is not None:
+                    # pages requested ahead past the end of the offer may fail
+                    failures = {failed: exception for failed, exception in failures.items() if failed <= last_page}
+                if failures:
+                    # raised once no earlier page can still turn out to be the last one
+                    first_failed = min(failures)
+                    if all(pending > first_failed for pending in tasks):
+                        raise failures[first_failed]
+
+            if last_page is None:
+                self._logger.warning(f"Stopped after {self.max_pages} full pages, offer might be truncated.")
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    async def _fetch_page(
+        self,
+        page: int,
+        request_page: Callable[[int], AsyncContextManager[ClientResponse]],
+        parse_page: Callable[[ClientResponse], AsyncIterator[T]],
+        queue: asyncio.Queue,
+    ) -> int:
+        reason = ""
+        for attempt in range(self.max_attempts):
+            retry_after = 0.0
+            count = 0
+            async with self.limiter.slot():
+                started = time.monotonic()
+                try:
+                    async with request_page(page) as response:
+                        if response.status == 429 or response.status >= 500:
+                            self.limiter.on_overload()
+                            retry_after = _retry_after(response)
+                            reason = f"status {response.status}"
+                        elif response.status != 200:
+                            # not worth retrying, fails the scrape unless the page is past the end of the offer
+                            raise PageFetchError(page, f"status {response.status} - {await response.text()}")
+                        else:
+                            self.limiter.on_success(time.monotonic() - started)
+                            async for item in parse_page(response):
+                                count += 1
+                                await queue.put((item, None))
+                            return count
+                except (ClientConnectionError, asyncio.TimeoutError) as exception:
+                    if count:
+                        # items already yielded would be duplicated by a retry
+                        raise PageFetchError(page, repr(exception)) from exception
+                    self.limiter.on_overload()
+                    reason = repr(exception)
+
+            if attempt + 1 < self.max_attempts:
+                delay = self._backoff(attempt, retry_after)
+                self._logger.warning(f"Page {page} failed ({reason}), retrying in {delay:.2f}s.")
+                await asyncio.sleep(delay)
+
+        raise PageFetchError(page, reason)
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
 
 from aio_pika import Message, RobustExchange, connect_robust
 from aio_pika.abc import AbstractChannel, AbstractRobustConnection
-from src.enums import Bookmaker
-from src.utils.utils import FootballMatchDTOJSONEncoder
 
-logging.basicConfig(
-    format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s",
-    level=logging.INFO,
-)
+from src.enums import Bookmaker, PublishingMode
+from src.utils.codecs import MessageCodec
+from src.utils.delta import DeltaBuilder, ScrapeDelta
+
+
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
 
 
 class RabbitMQClient:
@@ -23,21 +24,32 @@ class RabbitMQClient:
         port: int,
         login: str,
         password: str,
+        publishing_mode: PublishingMode = PublishingMode.TRANSACTION,
+        chunk_size: int = 100,
+        max_in_flight: int = 16,
+        codec: MessageCodec | None = None,
     ) -> RabbitMQClient:
-        connection = await connect_robust(
-            host=host, port=port, login=login, password=password
-        )
+        connection = await connect_robust(host=host, port=port, login=login, password=password)
 
-        channel = await connection.channel(publisher_confirms=False)
-        return cls(connection, channel)
+        # transactions and publisher confirms are mutually exclusive on a single channel
+        channel = await connection.channel(publisher_confirms=publishing_mode == PublishingMode.CHUNKED)
+        return cls(connection, channel, publishing_mode, chunk_size, max_in_flight, codec)
 
     def __init__(
         self,
         connection: AbstractRobustConnection,
         channel: AbstractChannel,
+        publishing_mode: PublishingMode = PublishingMode.TRANSACTION,
+        chunk_size: int = 100,
+        max_in_flight: int = 16,
+        codec: MessageCodec | None = None,
     ) -> None:
         self.connection: AbstractRobustConnection = connection
         self.channel: AbstractChannel = channel
+        self.publishing_mode = publishing_mode
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.codec = codec or MessageCodec()
         self._logger = logging.getLogger(self.__class__.__qualname__)
 
     async def disconnect(self) -> None:
@@ -53,27 +65,220 @@ class RabbitMQClient:
         routing_key: str,
         scrape_id: str,
         bookmaker: Bookmaker,
+        delta: ScrapeDelta | None = None,
     ) -> None:
-        messages_count = len(messages)
-
+        """
+        Publishes scraped matches. Delta describes how messages relate to the previously published scrape and is only
+        supported in CHUNKED mode, where it travels in chunk envelopes.
+        """
         if isinstance(messages, dict):
             messages = [messages]
 
+        if self.publishing_mode == PublishingMode.CHUNKED:
+            await self._send_chunks(messages, exchange, routing_key, scrape_id, bookmaker, delta)
+        elif delta is not None:
+            raise ValueError("Delta publishing requires CHUNKED publishing mode.")
+        else:
+            await self._send_in_transaction(messages, exchange, routing_key, scrape_id, bookmaker)
+
+    async def _send_in_transaction(
+        self,
+        messages: list[dict[str, Any]],
+        exchange: RobustExchange,
+        routing_key: str,
+        scrape_id: str,
+        bookmaker: Bookmaker,
+    ) -> None:
+        messages_count = len(messages)
+
         async with self.channel.transaction():
             self._logger.info(
                 f"Starting publishing {messages_count} messages [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
             )
             for raw_message in messages:
-                message = Message(
-                    body=json.dumps(
-                        raw_message, cls=FootballMatchDTOJSONEncoder
-                    ).encode()
-                )
+                message = Message(body=self.codec.encode(raw_message), content_type=self.codec.content_type)
 
-                await exchange.publish(
-                    message,
-                    routing_key=routing_key,
-                )
+                await exchange.publish(message, routing_key=routing_key)
             self._logger.info(
                 f"Finished publishing {messages_count} messages [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
             )
+
+    def _chunk_message(
+        self,
+        scrape_id: str,
+        bookmaker: Bookmaker,
+        chunk_index: int,
+        total_chunks: int | None,
+        matches: Sequence[Any],
+        delta_envelope: dict[str, Any] | None = None,
+    ) -> Message:
+        body = {
+            "scrape_id": str(scrape_id),
+            "source": bookmaker.value,
+            "chunk_index": chunk_index,
+            "total_chunks": total_chunks,
+            "matches": matches,
+        }
+        if delta_envelope is not None:
+            body |= delta_envelope
+
+        headers = {"x-message-format": "chunk", "x-scrape-id": str(scrape_id), "x-chunk-index": chunk_index}
+        if total_chunks is not None:
+            headers["x-total-chunks"] = total_chunks
+
+        encoded_body, content_encoding = self.codec.encode_compressed(body)
+        return Message(
+            body=encoded_body, content_type=self.codec.content_type, content_encoding=content_encoding, headers=headers
+        )
+
+    def _build_chunks(
+        self, messages: Sequence[Any], scrape_id: str, bookmaker: Bookmaker, delta: ScrapeDelta | None = None
+    ) -> list[Message]:
+        """
+        Groups matches into messages of at most chunk_size matches. Every chunk carries scrape_id and its position
+        within the scrape, so consumer knows when whole scrape arrived no matter in which order chunks are delivered.
+        Empty scrape is still published as a single empty chunk to let consumer mark it as complete. With delta every
+        chunk also carries kind of the scrape, its base scrape and fixture keys of its matches, removed keys are sent
+        in the last chunk only.
+        """
+        total_chunks = max(1, -(-len(messages) // self.chunk_size))
+        chunks = []
+        for chunk_index in range(total_chunks):
+            start = chunk_index * self.chunk_size
+            delta_envelope = None
+            if delta is not None:
+                delta_envelope = {
+                    "kind": delta.kind.value,
+                    "base_scrape_id": delta.base_scrape_id,
+                    "fixture_keys": delta.fixture_keys[start : start + self.chunk_size],
+                    "removed": delta.removed if chunk_index == total_chunks - 1 else [],
+                    "scrape_start_timestamp": delta.scrape_start_timestamp,
+                    "scrape_end_timestamp": delta.scrape_end_timestamp,
+                }
+            chunks.append(
+                self._chunk_message(
+                    scrape_id,
+                    bookmaker,
+                    chunk_index,
+                    total_chunks,
+                    messages[start : start + self.chunk_size],
+                    delta_envelope,
+                )
+            )
+        return chunks
+
+    @staticmethod
+    async def _publish_in_window(
+        message: Message, exchange: RobustExchange, routing_key: str, window: asyncio.Semaphore
+    ) -> asyncio.Task:
+        """Starts publishing once fewer than window size messages are waiting for confirms."""
+        await window.acquire()
+        task = asyncio.create_task(exchange.publish(message, routing_key=routing_key))
+        task.add_done_callback(lambda _: window.release())
+        return task
+
+    async def _wait_for_confirms(self, tasks: list[asyncio.Task], scrape_id: str, bookmaker: Bookmaker) -> None:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            self._logger.error(
+                f"{len(failures)}/{len(tasks)} chunks were not confirmed [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
+            )
+            raise failures[0]
+
+    async def _send_chunks(
+        self,
+        messages: list[dict[str, Any]],
+        exchange: RobustExchange,
+        routing_key: str,
+        scrape_id: str,
+        bookmaker: Bookmaker,
+        delta: ScrapeDelta | None = None,
+    ) -> None:
+        """
+        Publishes chunks without waiting for each confirm separately, at most max_in_flight messages stay
+        unconfirmed at any time. Raises the first failure once all chunks were either confirmed or rejected.
+        """
+        chunks = self._build_chunks(messages, scrape_id, bookmaker, delta)
+        window = asyncio.Semaphore(self.max_in_flight)
+
+        self._logger.info(
+            f"Starting publishing {len(messages)} messages in {len(chunks)} chunks [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
+        )
+        tasks = [await self._publish_in_window(message, exchange, routing_key, window) for message in chunks]
+        await self._wait_for_confirms(tasks, scrape_id, bookmaker)
+
+        self._logger.info(
+            f"Finished publishing {len(messages)} messages in {len(chunks)} chunks [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
+        )
+
+    async def send_stream(
+        self,
+        matches: AsyncIterator[Any],
+        exchange: RobustExchange,
+        routing_key: str,
+        scrape_id: str,
+        bookmaker: Bookmaker,
+        delta_builder: DeltaBuilder | None = None,
+    ) -> ScrapeDelta | None:
+        """
+        Publishes matches while they are still being scraped, a chunk goes out as soon as chunk_size matches were
+        collected, so publishing overlaps with fetching of the remaining pages. Number of chunks is unknown until the
+        scrape ends, the last chunk (end of scrape marker, possibly empty) carries it together with removed keys of
+        the delta. Waits for confirms and raises the first failure like send_messages, only supported in CHUNKED mode.
+        """
+        if self.publishing_mode != PublishingMode.CHUNKED:
+            raise ValueError("Stream publishing requires CHUNKED publishing mode.")
+
+        def delta_envelope(fixture_keys: list[int], delta: ScrapeDelta | None = None) -> dict[str, Any] | None:
+            if delta_builder is None:
+                return None
+            return {
+                "kind": delta_builder.kind.value,
+                "base_scrape_id": delta_builder.base_scrape_id,
+                "fixture_keys": fixture_keys,
+                "removed": delta.removed if delta else [],
+                "scrape_start_timestamp": delta.scrape_start_timestamp if delta else None,
+                "scrape_end_timestamp": delta.scrape_end_timestamp if delta else None,
+            }
+
+        window = asyncio.Semaphore(self.max_in_flight)
+        tasks: list[asyncio.Task] = []
+        chunk: list[Any] = []
+        fixture_keys: list[int] = []
+        published_count = 0
+
+        self._logger.info(f"Starting streamed publishing [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]")
+        try:
+            async for match in matches:
+                if delta_builder is not None:
+                    key = delta_builder.add(match)
+                    if key is None:
+                        continue
+                    fixture_keys.append(key)
+
+                chunk.append(match)
+                if len(chunk) == self.chunk_size:
+                    message = self._chunk_message(
+                        scrape_id, bookmaker, len(tasks), None, chunk, delta_envelope(fixture_keys)
+                    )
+                    tasks.append(await self._publish_in_window(message, exchange, routing_key, window))
+                    published_count += len(chunk)
+                    chunk, fixture_keys = [], []
+        except BaseException:
+            # end of scrape marker is never sent, the consumer drops published chunks of the failed scrape
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        delta = delta_builder.finish(datetime.utcnow()) if delta_builder else None
+        message = self._chunk_message(
+            scrape_id, bookmaker, len(tasks), len(tasks) + 1, chunk, delta_envelope(fixture_keys, delta)
+        )
+        tasks.append(await self._publish_in_window(message, exchange, routing_key, window))
+        published_count += len(chunk)
+        await self._wait_for_confirms(tasks, scrape_id, bookmaker)
+
+        self._logger.info(
+            f"Finished streamed publishing {published_count} messages in {len(tasks)} chunks [scrape_id: {scrape_id}, bookmaker: {bookmaker.value}]"
+        )
+        return delta
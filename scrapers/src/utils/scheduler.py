@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from calendar import timegm
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable
+
+from src.schemas.base import FootballMatchDataDTO
+from src.utils.delta import fixture_key, odds_fingerprint
+
+
+logging.basicConfig(format="%(asctime)s | %(name)s | %(funcName)s | %(levelname)s: %(message)s", level=logging.INFO)
+
+
+def _epoch_seconds(value: datetime) -> int:
+    # bookmakers send both naive (UTC) and offset aware datetimes
+    return timegm(value.utctimetuple())
+
+
+@dataclass
+class ScrapeObservation:
+    matches: int
+    # matches seen in the previous run too and their odds changed since
+    compared: int
+    changed: int
+    seconds_to_kickoff: float | None
+
+    @property
+    def volatility(self) -> float:
+        return self.changed / self.compared if self.compared else 0.0
+
+
+class OddsObserver:
+    """
+    Watches matches of a bookmaker flowing from the scraper to the publisher without holding them. Remembers odds
+    fingerprints of the previous run, so every run reports how many fixtures changed odds and how close is the nearest
+    kickoff.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprints: dict[int, int] = {}
+        self.last: ScrapeObservation | None = None
+
+    async def watch(self, matches: AsyncIterator[FootballMatchDataDTO]) -> AsyncIterator[FootballMatchDataDTO]:
+        now = _epoch_seconds(datetime.utcnow())
+        fingerprints: dict[int, int] = {}
+        compared = changed = 0
+        nearest_kickoff: int | None = None
+
+        async for match in matches:
+            key = fixture_key(match)
+            fingerprint = fingerprints[key] = odds_fingerprint(match)
+            previous = self._fingerprints.get(key)
+            if previous is not None:
+                compared += 1
+                changed += previous != fingerprint
+
+            kickoff = _epoch_seconds(match.event_time)
+            if kickoff >= now and (nearest_kickoff is None or kickoff < nearest_kickoff):
+                nearest_kickoff = kickoff
+            yield match
+
+        # only a run which was consumed completely replaces the reference fingerprints
+        self._fingerprints = fingerprints
+        self.last = ScrapeObservation(
+            matches=len(fingerprints),
+            compared=compared,
+            changed=changed,
+            seconds_to_kickoff=None if nearest_kickoff is None else nearest_kickoff - now,
+        )
+
+
+@dataclass
+class AdaptiveInterval:
+    """
+    Interval between runs of a single job. Starts at base_seconds and shrinks the closer the nearest kickoff is
+    (within near_kickoff_seconds) and the more volatile the odds were recently, volatility is a moving average of the
+    share of fixtures whose odds changed between consecutive runs. Job without upcoming fixtures runs every max_seconds.
+    """
+
+    base_seconds: float
+    min_seconds: float
+    max_seconds: float
+    near_kickoff_seconds: float
+    kickoff_weight: float
+    volatility_weight: float
+    volatility_smoothing: float
+    volatility: float = 0.0
+
+    def update(self, observation: ScrapeObservation) -> float:
+        self.volatility += self.volatility_smoothing * (observation.volatility - self.volatility)
+        if observation.seconds_to_kickoff is None:
+            return self.max_seconds
+
+        urgency = max(0.0, 1 - observation.seconds_to_kickoff / self.near_kickoff_seconds)
+        seconds = self.base_seconds / (1 + self.kickoff_weight * urgency + self.volatility_weight * self.volatility)
+        return min(self.max_seconds, max(self.min_seconds, seconds))
+
+
+@dataclass
+class JobState:
+    name: str
+    interval_seconds: float
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    # matches of all successful runs
+    scraped_matches: int = 0
+    last_status: str | None = None
+    last_started_at: datetime | None = None
+    last_duration_seconds: float | None = None
+    next_run_at: datetime | None = None
+    volatility: float = 0.0
+    last_observation: ScrapeObservation | None = None
+
+
+ScrapeJob = Callable[[OddsObserver], Awaitable[None]]
+
+
+@dataclass
+class _ScheduledJob:
+    job: ScrapeJob
+    interval: AdaptiveInterval
+    state: JobState
+    observer: OddsObserver = field(default_factory=OddsObserver)
+    # event loop time
+    next_run: float = 0.0
+    task: asyncio.Task | None = None
+
+
+class ScrapeScheduler:
+    """
+    Runs scraping jobs of all bookmakers in the background. Jobs due within alignment_seconds of each other start
+    together in one round and share its deadline (round start + run_timeout_seconds), so batches of different
+    bookmakers are scraped at about the same time. Every job has its own adaptive interval, a run which is due while
+    the previous one of the same job is still running is skipped. Jobs may also be started on demand by their names.
+    """
+
+    def __init__(
+        self,
+        jobs: dict[str, ScrapeJob],
+        interval_factory: Callable[[str], AdaptiveInterval],
+        alignment_seconds: float = 10.0,
+        run_timeout_seconds: float = 240.0,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__qualname__)
+        self.alignment_seconds = alignment_seconds
+        self.run_timeout_seconds = run_timeout_seconds
+        self._jobs: dict[str, _ScheduledJob] = {}
+        for name, job in jobs.items():
+            interval = interval_factory(name)
+            self._jobs[name] = _ScheduledJob(job, interval, JobState(name, interval.base_seconds))
+        self._loop_task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._loop_task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run_now(self, name: str) -> asyncio.Task | None:
+        """Starts the job right away, None when it is already running."""
+        scheduled = self._jobs[name]
+        if scheduled.task is not None and not scheduled.task.done():
+            return None
+
+        loop_time = asyncio.get_running_loop().time()
+        return self._start(scheduled, deadline=loop_time + self.run_timeout_seconds)
+
+    def get_state(self) -> list[JobState]:
+        loop_time = asyncio.get_running_loop().time()
+        now = datetime.utcnow()
+        for scheduled in self._jobs.values():
+            scheduled.state.next_run_at = (
+                now + timedelta(seconds=max(0.0, scheduled.next_run - loop_time)) if self.running else None
+            )
+        return [scheduled.state for scheduled in self._jobs.values()]
+
+    async def _run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        for scheduled in self._jobs.values():
+            scheduled.next_run = loop.time()
+
+        while True:
+            now = loop.time()
+            next_run = min(scheduled.next_run for scheduled in self._jobs.values())
+            if next_run > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), next_run - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._start_round(now)
+
+    def _start_round(self, now: float) -> None:
+        deadline = now + self.run_timeout_seconds
+        started, skipped = [], []
+        for name, scheduled in self._jobs.items():
+            if scheduled.next_run > now + self.alignment_seconds:
+                continue
+
+            if scheduled.task is not None and not scheduled.task.done():
+                scheduled.state.skipped += 1
+                scheduled.next_run = now + scheduled.state.interval_seconds
+                skipped.append(name)
+                continue
+
+            self._start(scheduled, deadline)
+            started.append(name)
+
+        self._logger.info(f"Started round of {started}, skipped still running {skipped}.")
+
+    def _start(self, scheduled: _ScheduledJob, deadline: float) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        # replanned with adapted interval once the run finished, due while still running means the run is skipped
+        scheduled.next_run = loop.time() + scheduled.state.interval_seconds
+        scheduled.task = asyncio.create_task(self._run(scheduled, deadline - loop.time()))
+        return scheduled.task
+
+    async def _run(self, scheduled: _ScheduledJob, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        state = scheduled.state
+        state.running = True
+        state.last_started_at = datetime.utcnow()
+        started = loop.time()
+        scheduled.observer.last = None
+        try:
+            await asyncio.wait_for(scheduled.job(scheduled.observer), timeout)
+        except asyncio.TimeoutError:
+            state.failures += 1
+            state.last_status = "timeout"
+            self._logger.error(f"{state.name} scrape did not finish before the deadline of its round.")
+        except asyncio.CancelledError:
+            state.last_status = "cancelled"
+            raise
+        except Exception:
+            state.failures += 1
+            state.last_status = "failed"
+            self._logger.exception(f"{state.name} scrape failed.")
+        else:
+            state.last_status = "ok"
+            observation = scheduled.observer.last
+            if observation is not None:
+                state.interval_seconds = scheduled.interval.update(observation)
+                state.volatility = scheduled.interval.volatility
+                state.last_observation = observation
+                state.scraped_matches += observation.matches
+        finally:
+            state.running = False
+            state.runs += 1
+            state.last_duration_seconds = round(loop.time() - started, 3)
+            scheduled.next_run = started + state.interval_seconds
+            self._wakeup.set()
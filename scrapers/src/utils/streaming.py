@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, TypeVar
+
+import ijson
+from aiohttp import StreamReader
+
+
+T = TypeVar("T")
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_DONE = object()
+
+
+async def iter_json_items(
+    stream: StreamReader, prefixes: list[str], chunk_size: int = READ_CHUNK_SIZE
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Yields (prefix, item) for every item found under given ijson prefixes (e.g. "matches.item") while the response
+    body is still being read. Only the item being built and the current chunk are held in memory, never the whole
+    document. Every prefix has its own incremental parser, items of a prefix come in document order.
+    """
+    items = {prefix: ijson.sendable_list() for prefix in prefixes}
+    parsers = [ijson.items_coro(items[prefix], prefix, use_float=True) for prefix in prefixes]
+
+    async for data in stream.iter_chunked(chunk_size):
+        for parser in parsers:
+            parser.send(data)
+        for prefix, parsed in items.items():
+            for item in parsed:
+                yield prefix, item
+            del parsed[:]
+
+    for parser in parsers:
+        parser.close()
+    for prefix, parsed in items.items():
+        for item in parsed:
+            yield prefix, item
+
+
+async def merge_async_iterators(iterators: list[AsyncIterator[T]], max_buffered: int = 100) -> AsyncIterator[T]:
+    """
+    Consumes iterators concurrently and yields their items as they come. At most max_buffered items wait for the
+    consumer, producers are paused otherwise. The first failure of any iterator is raised, the rest are cancelled.
+    """
+    queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue(max_buffered)
+
+    async def forward(iterator: AsyncIterator[T]) -> None:
+        try:
+            async for item in iterator:
+                await queue.put((item, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            await queue.put((_DONE, exception))
+            return
+        await queue.put((_DONE, None))
+
+    tasks = [asyncio.create_task(forward(iterator)) for iterator in iterators]
+    try:
+        running = len(tasks)
+        while running:
+            item, exception = await queue.get()
+            if exception is not None:
+                raise exception
+            if item is _DONE:
+                running -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
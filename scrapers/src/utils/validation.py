@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+from typing import Any
+
+from pydantic import ValidationError
+from pydantic.datetime_parse import parse_datetime
+from pydantic.validators import str_validator
+
+from src.enums import FootballOutcome, ValidationErrorCategory
+
+
+FIELD_CATEGORIES = {
+    "event_time": ValidationErrorCategory.INVALID_EVENT_TIME,
+    "team_a": ValidationErrorCategory.INVALID_TEAM,
+    "team_b": ValidationErrorCategory.INVALID_TEAM,
+    "bet_options": ValidationErrorCategory.INVALID_ODDS,
+}
+
+
+class DatapointError(ValueError):
+    def __init__(self, category: ValidationErrorCategory, message: str) -> None:
+        super().__init__(message)
+        self.category = category
+
+
+def _event_time(value: Any) -> datetime:
+    # same parsing as the model (Z suffixed and offset ISO strings, epoch numbers), datetime.fromisoformat of the
+    # target Python rejects both
+    try:
+        return parse_datetime(value)
+    except (ValueError, TypeError):
+        raise DatapointError(ValidationErrorCategory.INVALID_EVENT_TIME, f"event_time: {value!r}") from None
+
+
+def _team(field_name: str, value: Any) -> str:
+    # same coercion as the model, numeric names become strings
+    try:
+        return str_validator(value)
+    except (ValueError, TypeError):
+        raise DatapointError(ValidationErrorCategory.INVALID_TEAM, f"{field_name}: {value!r}") from None
+
+
+def _odds(outcome: FootballOutcome, value: Any) -> float:
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            odds = float(value)
+        except ValueError:
+            pass
+        else:
+            # rejects NaN as well
+            if odds > 0:
+                return odds
+    raise DatapointError(ValidationErrorCategory.INVALID_ODDS, f"{outcome.value}: {value!r}")
+
+
+def validate_match_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """
+    Plain typed checks of FootballMatchData fields extracted from a trusted bookmaker payload, values are returned in
+    the types the model holds, so the model can be constructed without validation. Kickoff times are parsed the way
+    the model parses them (datetimes, ISO strings, epoch numbers), team names have to be strings and odds positive
+    numbers or numeric strings, anything else raises DatapointError with its category.
+    """
+    return {
+        "event_time": _event_time(fields["event_time"]),
+        "team_a": _team("team_a", fields["team_a"]),
+        "team_b": _team("team_b", fields["team_b"]),
+        "bet_options": {outcome: _odds(outcome, odds) for outcome, odds in fields["bet_options"].items()},
+    }
+
+
+def categorize(exception: Exception) -> ValidationErrorCategory:
+    if isinstance(exception, DatapointError):
+        return exception.category
+    if isinstance(exception, ValidationError):
+        field_name = exception.errors()[0]["loc"][0]
+        return FIELD_CATEGORIES.get(field_name, ValidationErrorCategory.OTHER)
+    if isinstance(exception, (KeyError, IndexError, TypeError)):
+        return ValidationErrorCategory.MISSING_FIELD
+    return ValidationErrorCategory.OTHER
+
+
+class ValidationReport:
+    """Counts datapoints which could not be parsed by category, only the first sample_size errors are kept."""
+
+    def __init__(self, sample_size: int = 10) -> None:
+        self.sample_size = sample_size
+        self.counts: Counter[ValidationErrorCategory] = Counter()
+        self.samples: list[str] = []
+
+    @property
+    def errors_count(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, exception: Exception) -> None:
+        category = categorize(exception)
+        self.counts[category] += 1
+        if len(self.samples) < self.sample_size:
+            self.samples.append(f"{category.value}: {exception!r}")
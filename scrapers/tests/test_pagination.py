@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.utils.pagination import AdaptivePaginator, AIMDLimiter, PageFetchError
+
+
+PAGE_SIZE = 10
+
+
+class FakeResponse:
+    def __init__(self, status: int, items: list[int]) -> None:
+        self.status = status
+        self.items = items
+        self.headers: dict[str, str] = {}
+
+    async def text(self) -> str:
+        return "error"
+
+
+def fake_api(total_items: int, statuses: dict[int, list[int]]):
+    """Serves total_items items, the n-th request of a page is answered with statuses[page][n] (200 once exhausted)."""
+    requests: dict[int, int] = {}
+
+    @asynccontextmanager
+    async def request_page(page: int):
+        attempt = requests.get(page, 0)
+        requests[page] = attempt + 1
+        page_statuses = statuses.get(page, [])
+        status = page_statuses[attempt] if attempt < len(page_statuses) else 200
+        await asyncio.sleep(0)
+        items = list(range(page * PAGE_SIZE, min(total_items, (page + 1) * PAGE_SIZE)))
+        yield FakeResponse(status, items if status == 200 else [])
+
+    return request_page
+
+
+async def parse_page(response: FakeResponse):
+    for item in response.items:
+        yield item
+
+
+def scrape(request_page) -> list[int]:
+    async def collect() -> list[int]:
+        paginator = AdaptivePaginator(
+            PAGE_SIZE, AIMDLimiter(initial_limit=4), max_pages=20, max_attempts=3, backoff_base_seconds=0
+        )
+        return [item async for item in paginator.iter_items(request_page, parse_page)]
+
+    return asyncio.run(collect())
+
+
+def test_all_items_are_fetched():
+    assert sorted(scrape(fake_api(95, {}))) == list(range(95))
+
+
+def test_rate_limited_page_is_retried():
+    assert sorted(scrape(fake_api(95, {3: [429, 503]}))) == list(range(95))
+
+
+@pytest.mark.parametrize("status", [403, 404])
+def test_client_error_within_the_offer_fails_the_scrape(status):
+    # instead of ending the offer early, which would publish the rest of it as removed
+    with pytest.raises(PageFetchError):
+        scrape(fake_api(95, {3: [status]}))
+
+
+def test_failures_past_the_end_of_the_offer_are_ignored():
+    statuses = {page: [404] for page in range(10, 20)}
+    assert sorted(scrape(fake_api(95, statuses))) == list(range(95))
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.services.base import DATAPOINT_ERRORS
+from src.services.betclic import BetClicScrapingService
+from src.utils.validation import categorize
+
+
+def betclic_datapoint(event_time, team_a="Lech Poznan", odds=2.1) -> dict:
+    return {
+        "date": event_time,
+        "contestants": [{"name": team_a}, {"name": "Legia Warszawa"}],
+        "grouped_markets": [{"markets": [{"selections": [[{"odds": odds}], [{"odds": 3.4}], [{"odds": 3.1}]]}]}],
+    }
+
+
+def serialize(raw_datapoint: dict, strict_validation: bool):
+    service = BetClicScrapingService(strict_validation=strict_validation)
+    try:
+        return service.serialize_datapoint(raw_datapoint)
+    except DATAPOINT_ERRORS as exception:
+        return categorize(exception)
+
+
+@pytest.mark.parametrize(
+    "event_time",
+    [
+        "2024-01-01T12:00:00",
+        "2024-01-01 12:00",
+        "2024-01-01T12:00:00.123456",
+        "2024-01-01T12:00:00Z",
+        "2024-01-01T12:00:00+02:00",
+        "2024-01-01T12:00:00-0130",
+        1704110400,
+        1704110400.5,
+        "1704110400",
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        "2024-01-01",
+        "01.01.2024 12:00",
+        "",
+        None,
+        [2024, 1, 1],
+    ],
+)
+def test_event_time_parity(event_time):
+    raw_datapoint = betclic_datapoint(event_time)
+
+    fast = serialize(raw_datapoint, strict_validation=False)
+    strict = serialize(raw_datapoint, strict_validation=True)
+
+    assert fast == strict
+
+
+@pytest.mark.parametrize(
+    "raw_datapoint",
+    [
+        betclic_datapoint("2024-01-01T12:00:00Z", odds="2.5"),
+        betclic_datapoint("2024-01-01T12:00:00Z", odds=0),
+        betclic_datapoint("2024-01-01T12:00:00Z", odds="evens"),
+        betclic_datapoint("2024-01-01T12:00:00Z", team_a=None),
+        betclic_datapoint("2024-01-01T12:00:00Z", team_a=1860),
+        betclic_datapoint("2024-01-01T12:00:00Z", team_a=4.5),
+        betclic_datapoint("2024-01-01T12:00:00Z", team_a=["Lech Poznan"]),
+        {"date": "2024-01-01T12:00:00Z", "contestants": []},
+    ],
+)
+def test_parity(raw_datapoint):
+    fast = serialize(raw_datapoint, strict_validation=False)
+    strict = serialize(raw_datapoint, strict_validation=True)
+
+    assert fast == strict